@@ -14,8 +14,32 @@ from ariadne_codegen.plugins.base import Plugin
 
 PUBLIC_EXPORTS: dict[str, list[str]] = {
     "playerdata_api": ["PlayerDataAPI"],
+    "client_pool": ["ClientPool"],
+    "subscriptions": ["SubscriptionManager"],
+    "jobs": ["Job"],
+    "signed_urls": ["SignedUrlCache", "SignedUrlSource"],
 }
 
+# Exports whose modules import heavy optional dependencies (polars), imported on
+# first access through a module ``__getattr__`` so ``import playerdatapy`` stays
+# light.
+LAZY_EXPORTS: dict[str, list[str]] = {
+    "live": ["LiveSquad"],
+}
+
+_LAZY_GETATTR = """
+_LAZY_EXPORTS = {lazy!r}
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        import importlib
+
+        module = importlib.import_module(_LAZY_EXPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {{__name__!r}} has no attribute {{name!r}}")
+"""
+
 
 class PublicApiExportsPlugin(Plugin):
     def generate_init_module(self, module: ast.Module) -> ast.Module:
@@ -34,6 +58,12 @@ class PublicApiExportsPlugin(Plugin):
             default=-1,
         )
         module.body[last_import_index + 1 : last_import_index + 1] = imports
+        lazy = {
+            name: f".{source}"
+            for source, names in LAZY_EXPORTS.items()
+            for name in names
+        }
+        module.body.extend(ast.parse(_LAZY_GETATTR.format(lazy=lazy)).body)
 
         for stmt in module.body:
             if (
@@ -45,7 +75,8 @@ class PublicApiExportsPlugin(Plugin):
             ):
                 stmt.value.elts.extend(
                     ast.Constant(value=name)
-                    for names in PUBLIC_EXPORTS.values()
+                    for exports in (PUBLIC_EXPORTS, LAZY_EXPORTS)
+                    for names in exports.values()
                     for name in names
                 )
                 stmt.value.elts.sort(key=lambda elt: ast.literal_eval(elt))
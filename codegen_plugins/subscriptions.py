@@ -0,0 +1,297 @@
+"""ariadne-codegen plugin: typed builders for ``RootSubscription``.
+
+ariadne-codegen only emits custom operation builders for the query and mutation
+types (``custom_queries.Query``, ``custom_mutations.Mutation``), and skips Fields
+classes for types only reachable from the subscription type. This plugin writes
+``custom_subscriptions.py`` with a ``Subscription`` builder and the missing
+payload Fields classes, in the same shape as the generated modules, and adds
+``Client.subscribe`` to compile them like ``execute_custom_operation``.
+"""
+
+from __future__ import annotations
+
+import ast
+import json
+import keyword
+import re
+from pathlib import Path
+
+from ariadne_codegen.plugins.base import Plugin
+from graphql import (
+    GraphQLEnumType,
+    GraphQLField,
+    GraphQLInputObjectType,
+    GraphQLInterfaceType,
+    GraphQLList,
+    GraphQLNonNull,
+    GraphQLObjectType,
+    GraphQLScalarType,
+    GraphQLSchema,
+    GraphQLUnionType,
+    get_named_type,
+)
+
+MODULE_NAME = "custom_subscriptions"
+
+_SCALARS = {
+    "ID": "str",
+    "String": "str",
+    "Int": "int",
+    "Float": "float",
+    "Boolean": "bool",
+}
+
+# Mirrors the names ariadne-codegen renames to avoid shadowing builtins.
+_RESERVED = {"type", "filter", "input", "format", "from"}
+
+CLIENT_METHODS = """
+def build_custom_operation(
+    self, *fields: GraphQLField, operation_type: OperationType, operation_name: str
+) -> tuple[str, dict[str, Any]]:
+    selections = self._build_selection_set(fields)
+    combined_variables = self._combine_variables(fields)
+    variable_definitions = self._build_variable_definitions(
+        combined_variables["types"]
+    )
+    operation_ast = self._build_operation_ast(
+        selections, operation_type, operation_name, variable_definitions
+    )
+    return print_ast(operation_ast), combined_variables["values"]
+
+async def subscribe(
+    self, *fields: GraphQLField, operation_name: str
+) -> AsyncIterator[dict[str, Any]]:
+    query, variables = self.build_custom_operation(
+        *fields,
+        operation_type=OperationType.SUBSCRIPTION,
+        operation_name=operation_name,
+    )
+    async for data in self.execute_ws(
+        query, operation_name=operation_name, variables=variables
+    ):
+        yield data
+"""
+
+
+def snake_case(name: str) -> str:
+    snake = re.sub(
+        r"(?<=[a-z])(?=[A-Z0-9])|(?<=[A-Z])(?=[A-Z][a-z])|(?<=[0-9])(?=[A-Za-z])",
+        "_",
+        name,
+    ).lower()
+    if keyword.iskeyword(snake) or snake in _RESERVED:
+        return f"{snake}_"
+    return snake
+
+
+def _python_type(type_, imports: dict[str, set[str]]) -> str:
+    if isinstance(type_, GraphQLNonNull):
+        return _python_type(type_.of_type, imports)
+    if isinstance(type_, GraphQLList):
+        return f"list[{_python_type(type_.of_type, imports)}]"
+    if isinstance(type_, GraphQLEnumType):
+        imports["enums"].add(type_.name)
+        return type_.name
+    if isinstance(type_, GraphQLInputObjectType):
+        imports["input_types"].add(type_.name)
+        return type_.name
+    if isinstance(type_, GraphQLScalarType):
+        return _SCALARS.get(type_.name, "Any")
+    raise TypeError(f"Unsupported argument type {type_}")
+
+
+def _fields_class_name(type_) -> str:
+    if isinstance(type_, GraphQLInterfaceType):
+        return f"{type_.name}Interface"
+    if isinstance(type_, GraphQLUnionType):
+        return f"{type_.name}Union"
+    if isinstance(type_, GraphQLObjectType):
+        return f"{type_.name}Fields"
+    return ""
+
+
+def _method(
+    name: str,
+    field: GraphQLField,
+    returns: str,
+    constructor: str,
+    imports: dict[str, set[str]],
+    keyword_field_name: bool,
+) -> list[str]:
+    """A classmethod building ``field`` with its arguments, ariadne style."""
+    required, optional, arguments = [], [], []
+    for arg_name, arg in sorted(field.args.items()):
+        python_name = snake_case(arg_name)
+        python_type = _python_type(arg.type, imports)
+        if isinstance(arg.type, GraphQLNonNull):
+            required.append(f"{python_name}: {python_type}")
+        else:
+            optional.append(f"{python_name}: Optional[{python_type}] = None")
+        arguments.append(
+            f'"{arg_name}": {{"type": "{arg.type}", "value": {python_name}}}'
+        )
+
+    params = ["cls", *required]
+    if optional:
+        params += ["*", *optional]
+
+    field_name = f'field_name="{name}"' if keyword_field_name else f'"{name}"'
+    lines = [
+        "    @classmethod",
+        f"    def {snake_case(name)}({', '.join(params)}) -> {returns}:",
+    ]
+    if field.description:
+        lines.append(f"        {_docstring(field.description)}")
+    if arguments:
+        lines += [
+            f"        arguments: dict[str, dict[str, Any]] = {{{', '.join(arguments)}}}",
+            "        cleared_arguments = {",
+            '            key: value for key, value in arguments.items() if value["value"] is not None',
+            "        }",
+            f"        return {constructor}({field_name}, arguments=cleared_arguments)",
+        ]
+    else:
+        lines.append(f"        return {constructor}({field_name})")
+    return lines + [""]
+
+
+def _docstring(text: str) -> str:
+    return '"""' + text.strip().replace('"""', '\\"\\"\\"') + '"""'
+
+
+def _fields_class(
+    type_: GraphQLObjectType, imports: dict[str, set[str]], local: set[str]
+) -> list[str]:
+    class_name = f"{type_.name}Fields"
+    typing_field = f"{type_.name}GraphQLField"
+    imports["custom_typing_fields"].add(typing_field)
+
+    lines = [f"class {class_name}(GraphQLField):"]
+    if type_.description:
+        lines += [f"    {_docstring(type_.description)}", ""]
+
+    subfield_types = {typing_field}
+    for name, field in type_.fields.items():
+        named = get_named_type(field.type)
+        nested = _fields_class_name(named)
+        if nested:
+            subfield_types.add(f'"{nested}"')
+            if isinstance(named, GraphQLUnionType):
+                imports["custom_typing_fields"].add(nested)
+            elif nested not in local:
+                imports["custom_fields"].add(nested)
+
+        if (nested and not isinstance(named, GraphQLUnionType)) or field.args:
+            returns = f'"{nested or typing_field}"'
+            lines += _method(
+                name, field, returns, nested or typing_field, imports, False
+            )
+            continue
+
+        attribute_type = nested or typing_field
+        lines.append(
+            f'    {snake_case(name)}: "{attribute_type}" = {attribute_type}("{name}")'
+        )
+        if field.description:
+            lines.append(
+                f"    {json.dumps(field.description.strip(), ensure_ascii=False)}"
+            )
+
+    subfields = sorted(subfield_types, key=lambda name: (name != typing_field, name))
+    annotation = (
+        subfields[0] if len(subfields) == 1 else f"Union[{', '.join(subfields)}]"
+    )
+    lines += [
+        "",
+        f'    def fields(self, *subfields: {annotation}) -> "{class_name}":',
+        f'        """Subfields should come from the {class_name} class"""',
+        "        self._subfields.extend(subfields)",
+        "        return self",
+        "",
+        f'    def alias(self, alias: str) -> "{class_name}":',
+        "        self._alias = alias",
+        "        return self",
+    ]
+    return lines
+
+
+def generate_subscriptions_module(
+    schema: GraphQLSchema, existing_fields: set[str]
+) -> str:
+    """Source of ``custom_subscriptions.py`` for ``schema``.
+
+    Args:
+        schema: The GraphQL schema.
+        existing_fields: Fields/Interface class names ariadne-codegen already
+            generated in ``custom_fields``.
+    """
+    subscription_type = schema.subscription_type
+    if subscription_type is None:
+        return ""
+
+    imports: dict[str, set[str]] = {
+        "custom_fields": set(),
+        "custom_typing_fields": set(),
+        "enums": set(),
+        "input_types": set(),
+    }
+    missing = {
+        get_named_type(field.type)
+        for field in subscription_type.fields.values()
+        if isinstance(get_named_type(field.type), GraphQLObjectType)
+        and _fields_class_name(get_named_type(field.type)) not in existing_fields
+    }
+    local = {_fields_class_name(type_) for type_ in missing}
+
+    body: list[str] = []
+    for type_ in sorted(missing, key=lambda type_: type_.name):
+        body += _fields_class(type_, imports, local) + ["", ""]
+
+    body.append("class Subscription:")
+    for name, field in subscription_type.fields.items():
+        named = get_named_type(field.type)
+        returns = _fields_class_name(named) or "GraphQLField"
+        if returns not in local and returns != "GraphQLField":
+            imports["custom_fields"].add(returns)
+        body += _method(name, field, returns, returns, imports, True)
+
+    header = [
+        "# Generated by ariadne-codegen",
+        "",
+        "from typing import Any, Optional, Union",
+        "",
+        "from .base_operation import GraphQLField",
+    ]
+    for module, names in imports.items():
+        if names:
+            header.append(f"from .{module} import {', '.join(sorted(names))}")
+    return "\n".join(header + ["", ""] + body).rstrip() + "\n"
+
+
+class SubscriptionOperationsPlugin(Plugin):
+    def generate_client_class(
+        self, class_def: ast.ClassDef, *args, **kwargs
+    ) -> ast.ClassDef:
+        class_def.body.extend(ast.parse(CLIENT_METHODS).body)
+        return class_def
+
+    def generate_client_module(self, module: ast.Module) -> ast.Module:
+        module.body[0:0] = ast.parse("from collections.abc import AsyncIterator\n").body
+        return module
+
+    def generate_init_module(self, module: ast.Module) -> ast.Module:
+        settings = self.config_dict.get("tool", {}).get("ariadne-codegen", {})
+        package = Path(settings.get("target_package_path", ".")) / settings.get(
+            "target_package_name", "graphql_client"
+        )
+        existing = set(
+            re.findall(
+                r"^class (\w+)\(GraphQLField\)",
+                (package / "custom_fields.py").read_text(),
+                flags=re.MULTILINE,
+            )
+        )
+        (package / f"{MODULE_NAME}.py").write_text(
+            generate_subscriptions_module(self.schema, existing)
+        )
+        return module
@@ -23,8 +23,41 @@ except Exception as _exc:
 
 
 SECTIONS: list[tuple[str, list[str]]] = [
-    ("PlayerDataAPI", ["playerdatapy.playerdata_api"]),
+    ("PlayerDataAPI", ["playerdatapy.playerdata_api", "playerdatapy.jobs"]),
     ("Authentication", ["playerdatapy.gqlauth"]),
+    ("Rate Limiting", ["playerdatapy.client_pool", "playerdatapy.rate_limit"]),
+    (
+        "Subscriptions",
+        [
+            "playerdatapy.subscriptions",
+            "playerdatapy.custom_subscriptions",
+            "playerdatapy.live",
+        ],
+    ),
+    (
+        "Raw Data",
+        [
+            "playerdatapy.raw.parse",
+            "playerdatapy.raw.incremental",
+            "playerdatapy.raw.export",
+            "playerdatapy.raw.lake",
+            "playerdatapy.raw.align",
+            "playerdatapy.raw.pool",
+            "playerdatapy.backfill",
+        ],
+    ),
+    (
+        "Downloads",
+        [
+            "playerdatapy.downloads.stream",
+            "playerdatapy.downloads.ranged",
+            "playerdatapy.downloads.manager",
+            "playerdatapy.downloads.records",
+            "playerdatapy.downloads.cache",
+            "playerdatapy.downloads.targets",
+            "playerdatapy.signed_urls",
+        ],
+    ),
     ("GraphQL Client", ["playerdatapy.gqlclient"]),
     ("Queries", ["playerdatapy.custom_queries"]),
     ("Mutations", ["playerdatapy.custom_mutations"]),
@@ -37,6 +70,10 @@ SECTIONS: list[tuple[str, list[str]]] = [
 SECTION_INTROS: dict[str, str] = {
     "PlayerDataAPI": "Recommended entry point. Wraps authentication and runs typed queries/mutations.",
     "Authentication": "OAuth2 flows and token persistence. Used internally by `PlayerDataAPI`.",
+    "Rate Limiting": "Multi-tenant client pool and limiters that pace requests against the API rate limits.",
+    "Subscriptions": "Live GraphQL subscriptions multiplexed over one websocket.",
+    "Raw Data": "Parsing raw sensor datafiles into typed polars frames, and writing them as Parquet or Arrow IPC, or into a local partitioned dataset.",
+    "Downloads": "Streaming datafiles and media from the URLs the API returns to disk, and caching them locally.",
     "GraphQL Client": "Low-level async HTTP client. Use for raw GraphQL strings.",
     "Queries": "Typed query builders generated from the schema. Pass to `PlayerDataAPI.run_queries`.",
     "Mutations": "Typed mutation builders. Require Authorisation Code Grant — Client Credentials is read-only.",
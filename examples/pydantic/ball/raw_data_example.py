@@ -7,12 +7,18 @@ session/recording metadata and HTTP GET for the raw data files.
 from __future__ import annotations
 
 import asyncio
-import json
 import os
 import sys
 import httpx
 
 from playerdatapy.constants import API_BASE_URL
+from playerdatapy.downloads import (
+    DownloadEvent,
+    DownloadManager,
+    DownloadManifest,
+    DownloadStatus,
+    DownloadTask,
+)
 from playerdatapy.gqlauth import AuthenticationType
 from playerdatapy.playerdata_api import PlayerDataAPI
 
@@ -26,12 +32,6 @@ CLIENT_ID = os.environ.get("CLIENT_ID")
 CLUB_ID = os.environ.get("CLUB_ID")
 
 
-def _record_count(data: list | dict) -> int:
-    if isinstance(data, list):
-        return len(data)
-    return len(data.get("records", []))
-
-
 def _format_session_line(i: int, s: dict) -> str:
     """One line for a session: number, start–end, id."""
     start = (s.get("startTime") or "")[:19].replace("T", " ")
@@ -71,45 +71,39 @@ def _choose_session(sessions: list[dict]) -> dict | None:
     return sessions[0]
 
 
-async def download_recording(
-    http_client: httpx.AsyncClient,
-    recording: dict,
-    out_dir: str,
-) -> bool:
-    """Download one recording's raw JSON to out_dir. Returns True if saved, False if skipped."""
-    url = recording.get("url")
-    if not url:
-        ball = recording.get("ball") or {}
-        serial = ball.get("serialNumber", "?")
-        print(f"  Skip {recording['id']} (Ball {serial}): no URL")
-        return False
+def recording_task(recording: dict, out_dir: str) -> DownloadTask:
+    """The download of one recording's raw JSON to out_dir."""
+    url = recording["url"]
     if url.startswith("/"):
         url = f"{API_BASE_URL.rstrip('/')}{url}"
-
-    ball = recording.get("ball") or {}
-    serial = ball.get("serialNumber", "?")
-
-    try:
-        r = await http_client.get(url)
-        r.raise_for_status()
-        raw = r.json()
-    except httpx.HTTPStatusError as e:
-        print(f"  Skip {recording['id']} (Ball {serial}): {e.response.status_code}")
-        return False
-    except httpx.RequestError as e:
-        reason = str(e).strip() or type(e).__name__
-        print(f"  Skip {recording['id']} (Ball {serial}): {reason}")
-        return False
-
-    if _record_count(raw) == 0:
-        print(f"  Skip {recording['id']} (Ball {serial}): empty data")
-        return False
-
     path = os.path.join(out_dir, f"{recording['id']}.json")
-    with open(path, "w") as f:
-        json.dump(raw, f, indent=2)
-    print(f"  Ball {serial}: {_record_count(raw)} records -> {path}")
-    return True
+    return DownloadTask(url, path, id=recording["id"])
+
+
+def progress_printer(serials: dict[str, str]):
+    """Progress callback printing each download as it finishes, by ball serial."""
+
+    async def on_progress(event: DownloadEvent) -> None:
+        serial = serials.get(event.task.key, "?")
+        if event.status == DownloadStatus.COMPLETED:
+            if event.result.records == 0:
+                os.remove(event.result.path)
+                print(f"  Skip {event.task.key} (Ball {serial}): empty data")
+            else:
+                records = event.result.records
+                print(f"  Ball {serial}: {records} records -> {event.result.path}")
+        elif event.status == DownloadStatus.RETRYING:
+            print(f"  Retrying {event.task.key} (Ball {serial}): {event.error}")
+        elif event.status == DownloadStatus.FAILED:
+            if isinstance(event.error, httpx.HTTPStatusError):
+                reason = str(event.error.response.status_code)
+            elif isinstance(event.error, ValueError):
+                reason = "malformed data"
+            else:
+                reason = str(event.error).strip() or type(event.error).__name__
+            print(f"  Skip {event.task.key} (Ball {serial}): {reason}")
+
+    return on_progress
 
 
 async def main() -> None:
@@ -157,16 +151,22 @@ async def main() -> None:
     print(f"Downloading {len(recordings_with_url)} recording(s) to {out_dir}/")
 
     headers = {"Authorization": f"Bearer {api._get_authentication_token()}"}
+    tasks = [recording_task(r, out_dir) for r in recordings_with_url]
+    serials = {
+        r["id"]: (r.get("ball") or {}).get("serialNumber", "?")
+        for r in recordings_with_url
+    }
     async with httpx.AsyncClient(headers=headers, timeout=60.0) as http_client:
-        ok = sum(
-            await asyncio.gather(
-                *[
-                    download_recording(http_client, r, out_dir)
-                    for r in recordings_with_url
-                ]
-            )
+        # The manifest lets an interrupted run pick up where it stopped
+        manager = DownloadManager(
+            http_client,
+            count_records=True,
+            manifest=DownloadManifest(os.path.join(out_dir, "manifest.jsonl")),
         )
-    print(f"Done: {ok}/{len(recordings_with_url)} saved.")
+        report = await manager.run(tasks, on_progress=progress_printer(serials))
+    ok = sum(1 for result in report.results.values() if result.records)
+    rate = report.stats.bytes_per_second / 1e6
+    print(f"Done: {ok}/{len(recordings_with_url)} saved ({rate:.1f} MB/s).")
 
 
 if __name__ == "__main__":
@@ -202,6 +202,11 @@ from .input_types import (
     VideoRecordingAttributes,
 )
 from .playerdata_api import PlayerDataAPI
+from .client_pool import ClientPool
+from .subscriptions import SubscriptionManager
+from .jobs import Job
+from .signed_urls import SignedUrlCache
+from .signed_urls import SignedUrlSource
 
 __all__ = [
     "AccelzoneLowerBoundsInput",
@@ -234,6 +239,7 @@ __all__ = [
     "ChartTypeEnum",
     "ClaimPersonAttributes",
     "Client",
+    "ClientPool",
     "ClipTeam",
     "ClubBaseFilter",
     "ClubContextAttributes",
@@ -284,9 +290,11 @@ __all__ = [
     "ImageSizeEnum",
     "Intensity",
     "IntervalInput",
+    "Job",
     "LabelPositionEnum",
     "LiveDataGatewayOwnershipAvailableGatewaysFilter",
     "LiveDataGatewayOwnershipGatewaysCurrentlyOwnedFilter",
+    "LiveSquad",
     "MatchEventAttributes",
     "MatchEventClassEnum",
     "MatchEventTeam",
@@ -350,6 +358,8 @@ __all__ = [
     "SessionsSessionBaseFilter",
     "SessionsSessionFilter",
     "SessionsSessionParticipationBaseFilter",
+    "SignedUrlCache",
+    "SignedUrlSource",
     "SignupFlow",
     "SortField",
     "SpeedzoneLowerBoundsInput",
@@ -358,6 +368,7 @@ __all__ = [
     "StepEnum",
     "StepStatusEnum",
     "StripeSubscriptionStatus",
+    "SubscriptionManager",
     "SurveyAnswerAttributes",
     "SurveyAttributes",
     "SurveyDistributionAttributes",
@@ -402,3 +413,14 @@ __all__ = [
     "VideoClipOverlayInput",
     "VideoRecordingAttributes",
 ]
+
+_LAZY_EXPORTS = {"LiveSquad": ".live"}
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        import importlib
+
+        module = importlib.import_module(_LAZY_EXPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,7 +1,6 @@
 import webbrowser
 from pathlib import Path
 from typing import Optional, Union
-from requests_oauthlib import OAuth2Session
 
 from .base_flow import BaseAuthFlow
 from .server import Server
@@ -21,6 +20,8 @@ class AuthorisationCodeFlowBase(BaseAuthFlow):
         self.server = Server(port)
 
     def authenticate(self, redirect_uri):
+        from requests_oauthlib import OAuth2Session
+
         print("Logging you into the GraphQL API")
 
         self.oauth_session = OAuth2Session(self.client_id, redirect_uri=redirect_uri)
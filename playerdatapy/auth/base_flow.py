@@ -1,10 +1,16 @@
 import json
 import time
+from contextlib import asynccontextmanager, contextmanager
 from pathlib import Path
-from typing import Optional, Union
+from typing import AsyncIterator, Iterator, Optional, Union
 from oauthlib.oauth2 import TokenExpiredError
 from playerdatapy.constants import API_BASE_URL
-from .token_storage import default_token_path
+from .token_storage import (
+    async_file_lock,
+    atomic_write_text,
+    default_token_path,
+    file_lock,
+)
 
 
 class BaseAuthFlow:
@@ -20,25 +26,57 @@ class BaseAuthFlow:
         self.token_file: Path = Path(token_file) if token_file else default_token_path()
         self.api_base_url = base_url or API_BASE_URL
         self.oauth_session = None
+        self._cached_token: Optional[dict] = None
+        self._cached_token_stamp: Optional[tuple[int, int, int]] = None
 
-    def get_token(self) -> dict:
-        """Load token from file and check if it's expired."""
-        if not self.token_file.exists():
+    @property
+    def lock_file(self) -> Path:
+        """Path of the advisory lock file guarding token refreshes."""
+        return self.token_file.with_name(f"{self.token_file.name}.lock")
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        """Hold the cross-process token lock so only one process refreshes at a time."""
+        with file_lock(self.lock_file):
+            yield
+
+    @asynccontextmanager
+    async def alock(self) -> AsyncIterator[None]:
+        """Async variant of ``lock`` that waits for the lock without blocking."""
+        async with async_file_lock(self.lock_file):
+            yield
+
+    def get_token(self, leeway: float = 0) -> dict:
+        """Load token from file and check if it's expired.
+
+        The parsed token is cached in memory and only re-read when the file is
+        replaced, so repeated calls don't touch the disk beyond a ``stat``.
+
+        Args:
+            leeway: Treat the token as expired this many seconds early.
+        """
+        try:
+            stat = self.token_file.stat()
+        except FileNotFoundError:
             raise TokenExpiredError("No token file found")
 
-        tokens = self.token_file.read_text()
-        if not tokens:
-            raise TokenExpiredError("Token file is empty")
-        token = json.loads(tokens)
+        stamp = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if self._cached_token is None or stamp != self._cached_token_stamp:
+            tokens = self.token_file.read_text()
+            if not tokens:
+                raise TokenExpiredError("Token file is empty")
+            self._cached_token = json.loads(tokens)
+            self._cached_token_stamp = stamp
+
+        token = dict(self._cached_token)
 
         if "expires_at" in token:
             current_time = time.time()
-            if token["expires_at"] <= current_time:
+            if token["expires_at"] - leeway <= current_time:
                 raise TokenExpiredError("Token has expired")
 
         return token
 
     def save_token(self, token: dict):
-        """Save token to file."""
-        self.token_file.parent.mkdir(parents=True, exist_ok=True)
-        self.token_file.write_text(json.dumps(token))
+        """Save token to file, atomically replacing any previous token."""
+        atomic_write_text(self.token_file, json.dumps(token))
@@ -1,13 +1,23 @@
 from pathlib import Path
 from typing import Optional, Union
-from requests_oauthlib import OAuth2Session
+
+import httpx
 from oauthlib.oauth2 import BackendApplicationClient
 
 from .base_flow import BaseAuthFlow
 
+_TOKEN_REQUEST_HEADERS = {
+    "Accept": "application/json",
+    "Content-Type": "application/x-www-form-urlencoded",
+}
+
 
 class ClientCredentialsFlow(BaseAuthFlow):
-    """Handles oauth2 client credentials flow and token management."""
+    """Handles oauth2 client credentials flow and token management.
+
+    Tokens are fetched with httpx; oauthlib builds the request body and parses
+    the response, so saved tokens keep the same format (including ``expires_at``).
+    """
 
     def __init__(
         self,
@@ -18,31 +28,60 @@ class ClientCredentialsFlow(BaseAuthFlow):
     ):
         super().__init__(client_id, token_file, base_url)
         self.client_secret = client_secret
+        self.oauth_client = BackendApplicationClient(client_id=client_id)
+
+    @property
+    def token_url(self) -> str:
+        return f"{self.api_base_url}/oauth/token"
 
     def authenticate(self, save_token: bool = True) -> dict:
-        client = BackendApplicationClient(client_id=self.client_id)
+        with httpx.Client() as http_client:
+            response = http_client.post(
+                self.token_url,
+                content=self._token_request_body(),
+                headers=_TOKEN_REQUEST_HEADERS,
+            )
+        return self._handle_token_response(response, save_token)
 
-        self.oauth_session = OAuth2Session(
-            client=client,
-        )
+    async def aauthenticate(
+        self,
+        http_client: Optional[httpx.AsyncClient] = None,
+        save_token: bool = True,
+    ) -> dict:
+        """Fetch a token without blocking the event loop.
 
-        try:
-            token = self._fetch_token()
+        Args:
+            http_client: Client to send the token request with, so it can share a
+                connection pool with the GraphQL client. A short-lived client is
+                used when omitted.
+            save_token: Whether to persist the token to ``token_file``.
+        """
+        if http_client is None:
+            async with httpx.AsyncClient() as owned_client:
+                return await self.aauthenticate(owned_client, save_token)
 
-            if save_token:
-                self.save_token(token)
-                print("Login successful, token saved to file!")
+        response = await http_client.post(
+            self.token_url,
+            content=self._token_request_body(),
+            headers=_TOKEN_REQUEST_HEADERS,
+            # The token request must never go through auth that needs a token.
+            auth=None,
+        )
+        return self._handle_token_response(response, save_token)
 
-            return token
+    def _token_request_body(self) -> str:
+        return self.oauth_client.prepare_request_body(
+            include_client_id=True, client_secret=self.client_secret
+        )
 
-        finally:
-            if self.oauth_session:
-                self.oauth_session.close()
+    def _handle_token_response(
+        self, response: httpx.Response, save_token: bool
+    ) -> dict:
+        """Parse the token response, raising oauthlib errors for error responses."""
+        token = dict(self.oauth_client.parse_request_body_response(response.text))
 
-    def _fetch_token(self) -> dict:
-        """Exchange authorization code for access token."""
-        return self.oauth_session.fetch_token(
-            token_url=f"{self.api_base_url}/oauth/token",
-            client_id=self.client_id,
-            client_secret=self.client_secret,
-        )
+        if save_token:
+            self.save_token(token)
+            print("Login successful, token saved to file!")
+
+        return token
@@ -0,0 +1,469 @@
+"""
+Backfilling a club's raw data into a local ``RawLake``.
+
+A backfill pages through the club's sessions in a date range, lists each
+session's participations and their datafiles, downloads the datafiles and writes
+them into the lake. The stages run at once, joined by bounded queues, so
+sessions are listed while earlier participations download and convert.
+
+Progress is kept in a SQLite ``BackfillCheckpoint`` as each participation is
+written. Running the same backfill again skips sessions and participations
+already written, so a backfill that stopped part way resumes where it was.
+"""
+
+import asyncio
+import shutil
+import sqlite3
+import time
+from collections.abc import Awaitable, Iterable
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+import httpx
+
+from .custom_fields import (
+    EdgeDataFileFields,
+    SessionInterface,
+    SessionParticipationInterface,
+)
+from .custom_queries import Query
+from .downloads.manager import DownloadManager, DownloadTask
+from .downloads.targets import download_target
+from .enums import DatafileFormat
+from .input_types import SessionsSessionFilter
+from .playerdata_api import PlayerDataAPI
+from .raw.lake import RawLake
+from .raw.pool import ParsePool
+
+# Default and maximum page size of the API.
+_PAGE_SIZE = 30
+
+
+class ParticipationStatus(str, Enum):
+    """Where a participation is in a backfill, as kept in the checkpoint."""
+
+    PENDING = "pending"
+    DONE = "done"
+    "Written to the lake."
+    FAILED = "failed"
+    "Failed in the last run; retried by the next."
+
+
+class BackfillCheckpoint:
+    """
+    Record of a backfill's progress, in a SQLite database.
+
+    Each change is committed as it is made, so the checkpoint is only ever as
+    far behind as the participation being written when a run stopped.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, isolation_level=None)
+        self._db.executescript(
+            """
+            PRAGMA journal_mode = WAL;
+            CREATE TABLE IF NOT EXISTS sessions (
+                id TEXT PRIMARY KEY,
+                start_time TEXT,
+                listed INTEGER NOT NULL DEFAULT 0,
+                done INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS participations (
+                id TEXT PRIMARY KEY,
+                session_id TEXT NOT NULL,
+                status TEXT NOT NULL,
+                files INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                updated_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS participations_session
+                ON participations (session_id);
+            """
+        )
+
+    def add_session(self, session_id: str, start_time: Optional[str] = None) -> bool:
+        """Record a session found, returning whether it is still to be done.
+
+        A session still to be done is listed again, so ``finish_listing`` must
+        be called again before it can be marked done.
+        """
+        self._db.execute(
+            "INSERT OR IGNORE INTO sessions (id, start_time) VALUES (?, ?)",
+            (session_id, start_time),
+        )
+        self._db.execute(
+            "UPDATE sessions SET listed = 0 WHERE id = ? AND done = 0", (session_id,)
+        )
+        (done,) = self._db.execute(
+            "SELECT done FROM sessions WHERE id = ?", (session_id,)
+        ).fetchone()
+        return not done
+
+    def add_participation(self, session_id: str, participation_id: str) -> bool:
+        """Record a participation found, returning whether it is still to be done."""
+        self._db.execute(
+            "INSERT OR IGNORE INTO participations (id, session_id, status)"
+            " VALUES (?, ?, ?)",
+            (participation_id, session_id, ParticipationStatus.PENDING.value),
+        )
+        return self.status(participation_id) != ParticipationStatus.DONE
+
+    def status(self, participation_id: str) -> Optional[ParticipationStatus]:
+        """The participation's status, or ``None`` if it hasn't been found yet."""
+        row = self._db.execute(
+            "SELECT status FROM participations WHERE id = ?", (participation_id,)
+        ).fetchone()
+        return ParticipationStatus(row[0]) if row else None
+
+    def finish(
+        self,
+        participation_id: str,
+        status: ParticipationStatus,
+        files: int = 0,
+        error: Optional[str] = None,
+    ) -> None:
+        """Record a participation written, or failed."""
+        self._db.execute(
+            "UPDATE participations SET status = ?, files = ?, error = ?,"
+            " updated_at = ? WHERE id = ?",
+            (status.value, files, error, time.time(), participation_id),
+        )
+
+    def finish_listing(self, session_id: str) -> None:
+        """Record that all of a session's participations have been found."""
+        self._db.execute("UPDATE sessions SET listed = 1 WHERE id = ?", (session_id,))
+        self.finish_session(session_id)
+
+    def finish_session(self, session_id: str) -> None:
+        """Mark a fully listed session done, if all its participations are."""
+        self._db.execute(
+            "UPDATE sessions SET done = 1 WHERE id = ? AND listed = 1 AND NOT EXISTS"
+            " (SELECT 1 FROM participations WHERE session_id = ? AND status != ?)",
+            (session_id, session_id, ParticipationStatus.DONE.value),
+        )
+
+    def counts(self) -> dict[ParticipationStatus, int]:
+        """The number of participations with each status."""
+        rows = self._db.execute(
+            "SELECT status, COUNT(*) FROM participations GROUP BY status"
+        )
+        counts = dict.fromkeys(ParticipationStatus, 0)
+        counts.update({ParticipationStatus(status): count for status, count in rows})
+        return counts
+
+    def failures(self) -> dict[str, str]:
+        """The error of each participation that failed, by id."""
+        rows = self._db.execute(
+            "SELECT id, error FROM participations WHERE status = ?",
+            (ParticipationStatus.FAILED.value,),
+        )
+        return dict(rows.fetchall())
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> "BackfillCheckpoint":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+@dataclass
+class BackfillStats:
+    """Totals across a ``Backfill.run``."""
+
+    sessions: int = 0
+    "Sessions found, including those already done."
+    participations: int = 0
+    "Participations found, including those already done."
+    skipped: int = 0
+    "Participations already done in the checkpoint."
+    written: int = 0
+    failed: int = 0
+    files: int = 0
+    "Datafiles downloaded."
+    bytes: int = 0
+
+
+@dataclass
+class BackfillEvent:
+    """A participation written or failed, passed to ``on_progress``."""
+
+    session_id: str
+    participation_id: str
+    status: ParticipationStatus
+    stats: BackfillStats
+    error: Optional[BaseException] = None
+
+
+ProgressCallback = Callable[[BackfillEvent], Awaitable[None]]
+
+
+def write_participation(
+    lake: RawLake, club_id: str, participation_id: str, paths: Iterable[Path]
+) -> int:
+    """Write a participation's downloaded datafiles into ``lake``.
+
+    The participation's samples already in the lake are replaced.
+
+    Returns:
+        The number of files written to the lake.
+    """
+    written = []
+    for i, path in enumerate(paths):
+        written += lake.write_datafile(club_id, participation_id, path, replace=i == 0)
+    return len(written)
+
+
+class Backfill:
+    """
+    Pulls a club's raw datafiles in a date range into a ``RawLake``.
+
+    Example:
+        with BackfillCheckpoint("backfill.sqlite") as checkpoint:
+            backfill = Backfill(
+                api,
+                club_id,
+                datetime(2025, 7, 1, tzinfo=timezone.utc),
+                datetime(2026, 6, 1, tzinfo=timezone.utc),
+                checkpoint,
+            )
+            stats = await backfill.run()
+    """
+
+    def __init__(
+        self,
+        api: PlayerDataAPI,
+        club_id: str,
+        start: datetime,
+        end: datetime,
+        checkpoint: BackfillCheckpoint,
+        lake: Optional[RawLake] = None,
+        pool: Optional[ParsePool] = None,
+        max_downloads: int = 8,
+        max_per_host: int = 4,
+        max_conversions: int = 2,
+        download_dir: Optional[Union[str, Path]] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+    ):
+        """
+        Args:
+            api: The API to list sessions and participations with.
+            club_id: The club to backfill.
+            start: Backfill sessions starting from this time.
+            end: Backfill sessions ending by this time.
+            checkpoint: Where progress is recorded and resumed from.
+            lake: Where samples are written. Defaults to ``RawLake()``.
+            pool: Worker processes to parse and write in. Without one, datafiles
+                are written in threads.
+            max_downloads: Most datafiles downloaded at once.
+            max_per_host: Most datafiles downloaded at once from one host.
+            max_conversions: Most participations written to the lake at once.
+            download_dir: Where datafiles are kept until written. Defaults to
+                ``.downloads`` in the lake's root.
+            http_client: Client for downloads from outside the API, e.g.
+                presigned storage URLs. Those are sent without the API token.
+        """
+        self.api = api
+        self.club_id = club_id
+        self.start = start
+        self.end = end
+        self.checkpoint = checkpoint
+        self.lake = lake or RawLake()
+        self.pool = pool
+        self.max_downloads = max_downloads
+        self.max_per_host = max_per_host
+        self.max_conversions = max_conversions
+        self.download_dir = (
+            Path(download_dir)
+            if download_dir is not None
+            else self.lake.root / ".downloads"
+        )
+        self.http_client = http_client
+
+    async def run(
+        self, on_progress: Optional[ProgressCallback] = None
+    ) -> BackfillStats:
+        """Run the backfill, carrying on past participations that fail.
+
+        Args:
+            on_progress: Awaited as each participation is written or fails.
+        """
+        stats = BackfillStats()
+        sessions: asyncio.Queue = asyncio.Queue(maxsize=_PAGE_SIZE)
+        participations: asyncio.Queue = asyncio.Queue(maxsize=2 * self.max_downloads)
+        conversions = asyncio.Semaphore(self.max_conversions)
+        listers = 2
+        workers = self.max_downloads + self.max_conversions
+
+        external = self.http_client or httpx.AsyncClient(timeout=60.0)
+        managers: dict[int, DownloadManager] = {}
+
+        def manager(client: httpx.AsyncClient) -> DownloadManager:
+            if id(client) not in managers:
+                managers[id(client)] = DownloadManager(
+                    client,
+                    max_concurrency=self.max_downloads,
+                    max_per_host=self.max_per_host,
+                )
+            return managers[id(client)]
+
+        async def list_sessions() -> None:
+            async for session in self._sessions():
+                stats.sessions += 1
+                if self.checkpoint.add_session(session["id"], session["startTime"]):
+                    await sessions.put(session["id"])
+            for _ in range(listers):
+                await sessions.put(None)
+
+        async def list_participations() -> None:
+            while (session_id := await sessions.get()) is not None:
+                async for participation in self._participations(session_id):
+                    stats.participations += 1
+                    if self.checkpoint.add_participation(
+                        session_id, participation["id"]
+                    ):
+                        await participations.put((session_id, participation))
+                    else:
+                        stats.skipped += 1
+                self.checkpoint.finish_listing(session_id)
+
+        async def process() -> None:
+            while (item := await participations.get()) is not None:
+                session_id, participation = item
+                participation_id = participation["id"]
+                try:
+                    files = await self._download_and_write(
+                        participation, manager, external, conversions, stats
+                    )
+                except Exception as e:
+                    stats.failed += 1
+                    self.checkpoint.finish(
+                        participation_id, ParticipationStatus.FAILED, error=repr(e)
+                    )
+                    event = BackfillEvent(
+                        session_id,
+                        participation_id,
+                        ParticipationStatus.FAILED,
+                        stats,
+                        e,
+                    )
+                else:
+                    stats.written += 1
+                    self.checkpoint.finish(
+                        participation_id, ParticipationStatus.DONE, files
+                    )
+                    self.checkpoint.finish_session(session_id)
+                    event = BackfillEvent(
+                        session_id, participation_id, ParticipationStatus.DONE, stats
+                    )
+                if on_progress is not None:
+                    await on_progress(event)
+
+        async def list_all() -> None:
+            async with asyncio.TaskGroup() as listing:
+                listing.create_task(list_sessions())
+                for _ in range(listers):
+                    listing.create_task(list_participations())
+            for _ in range(workers):
+                await participations.put(None)
+
+        try:
+            async with asyncio.TaskGroup() as group:
+                group.create_task(list_all())
+                for _ in range(workers):
+                    group.create_task(process())
+        finally:
+            if self.http_client is None:
+                await external.aclose()
+        return stats
+
+    async def _sessions(self):
+        offset = 0
+        while True:
+            response = await self.api.run_queries(
+                "backfillSessions",
+                Query.sessions(
+                    SessionsSessionFilter(
+                        clubIdEq=self.club_id,
+                        startTimeGteq=self.start.isoformat(),
+                        endTimeLteq=self.end.isoformat(),
+                    ),
+                    limit=_PAGE_SIZE,
+                    offset=offset,
+                ).fields(SessionInterface.id, SessionInterface.start_time),
+            )
+            page = response.get("sessions") or []
+            for session in page:
+                yield session
+            if len(page) < _PAGE_SIZE:
+                return
+            offset += _PAGE_SIZE
+
+    async def _participations(self, session_id: str):
+        offset = 0
+        while True:
+            response = await self.api.run_queries(
+                "backfillParticipations",
+                Query.session(id=session_id).fields(
+                    SessionInterface.session_participations(
+                        limit=_PAGE_SIZE, offset=offset, with_data=True
+                    ).fields(
+                        SessionParticipationInterface.id,
+                        SessionParticipationInterface.datafiles().fields(
+                            EdgeDataFileFields.url(format=DatafileFormat.json)
+                        ),
+                    )
+                ),
+            )
+            page = (response.get("session") or {}).get("sessionParticipations") or []
+            for participation in page:
+                yield participation
+            if len(page) < _PAGE_SIZE:
+                return
+            offset += _PAGE_SIZE
+
+    async def _download_and_write(
+        self,
+        participation: dict[str, Any],
+        manager: Callable[[httpx.AsyncClient], DownloadManager],
+        external: httpx.AsyncClient,
+        conversions: asyncio.Semaphore,
+        stats: BackfillStats,
+    ) -> int:
+        participation_id = participation["id"]
+        directory = self.download_dir / participation_id
+        urls = [
+            datafile["url"]
+            for datafile in participation.get("datafiles") or []
+            if datafile.get("url")
+        ]
+        paths = [directory / f"{i}.json" for i in range(len(urls))]
+        # One run per client, so a participation's datafiles download together
+        tasks: dict[httpx.AsyncClient, list[DownloadTask]] = {}
+        for url, path in zip(urls, paths):
+            url, client = download_target(self.api, url, external)
+            tasks.setdefault(client, []).append(DownloadTask(url, path))
+        try:
+            reports = await asyncio.gather(
+                *(manager(client).run(batch) for client, batch in tasks.items())
+            )
+            for report in reports:
+                if report.errors:
+                    raise next(iter(report.errors.values()))
+                stats.files += report.stats.completed
+                stats.bytes += report.stats.bytes
+
+            args = (self.lake, self.club_id, participation_id, paths)
+            async with conversions:
+                if self.pool is not None:
+                    return await self.pool.run(write_participation, *args)
+                return await asyncio.to_thread(write_participation, *args)
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
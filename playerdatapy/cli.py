@@ -0,0 +1,168 @@
+"""
+The ``playerdatapy`` command.
+
+    playerdatapy backfill CLUB_ID --start 2025-07-01 --end 2026-06-01
+
+Credentials are taken from ``--client-id`` and ``--client-secret``, or the
+``CLIENT_ID`` and ``CLIENT_SECRET`` environment variables. With a secret the
+client credentials flow is used; without one, the browser login (PKCE) flow.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional, Sequence
+
+from .backfill import (
+    Backfill,
+    BackfillCheckpoint,
+    BackfillEvent,
+    ParticipationStatus,
+)
+from .gqlauth import AuthenticationType
+from .playerdata_api import PlayerDataAPI
+from .raw.lake import RawLake
+from .raw.pool import ParsePool
+
+
+def _timestamp(value: str) -> datetime:
+    """An ISO 8601 date or time, taken as UTC if it has no timezone."""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="playerdatapy", description="PlayerData API tools."
+    )
+    parser.add_argument("--client-id", default=os.environ.get("CLIENT_ID"))
+    parser.add_argument("--client-secret", default=os.environ.get("CLIENT_SECRET"))
+    parser.add_argument("--base-url", help="API base URL, for non-production APIs.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    backfill = commands.add_parser(
+        "backfill",
+        help="Pull a club's raw data in a date range into a local dataset.",
+        description=(
+            "Download and convert the raw datafiles of every session of a club in "
+            "a date range into a local partitioned Parquet dataset. Progress is "
+            "checkpointed; running the same command again resumes."
+        ),
+    )
+    backfill.add_argument("club_id")
+    backfill.add_argument(
+        "--start", type=_timestamp, required=True, help="e.g. 2025-07-01"
+    )
+    backfill.add_argument(
+        "--end", type=_timestamp, required=True, help="e.g. 2026-06-01T00:00:00Z"
+    )
+    backfill.add_argument(
+        "--root", type=Path, help="The dataset's directory. Defaults to per-user data."
+    )
+    backfill.add_argument(
+        "--checkpoint",
+        type=Path,
+        help="Checkpoint database. Defaults to backfill-CLUB_ID.sqlite in the root.",
+    )
+    backfill.add_argument(
+        "--processes",
+        type=int,
+        default=os.cpu_count(),
+        help="Worker processes to parse in; 0 for threads (default: CPU count).",
+    )
+    backfill.add_argument(
+        "--downloads", type=int, default=8, help="Most downloads at once."
+    )
+    backfill.add_argument(
+        "--downloads-per-host",
+        type=int,
+        default=4,
+        help="Most downloads at once from one host.",
+    )
+    backfill.add_argument(
+        "--conversions",
+        type=int,
+        help="Most participations converted at once (default: --processes).",
+    )
+    return parser
+
+
+async def backfill(args: argparse.Namespace) -> int:
+    api = PlayerDataAPI(
+        client_id=args.client_id,
+        client_secret=args.client_secret or "",
+        authentication_type=(
+            AuthenticationType.CLIENT_CREDENTIALS_FLOW
+            if args.client_secret
+            else AuthenticationType.AUTHORISATION_CODE_FLOW_PCKE
+        ),
+        base_url=args.base_url,
+    )
+    lake = RawLake(args.root)
+    checkpoint_path = args.checkpoint or lake.root / f"backfill-{args.club_id}.sqlite"
+    pool = ParsePool(args.processes) if args.processes else None
+    conversions = args.conversions or args.processes or 2
+
+    async def on_progress(event: BackfillEvent) -> None:
+        stats = event.stats
+        if event.status == ParticipationStatus.DONE:
+            outcome = "done"
+        else:
+            outcome = f"failed: {event.error!r}"
+        print(
+            f"[{stats.written + stats.failed}/{stats.participations - stats.skipped}]"
+            f" {event.participation_id} {outcome}",
+            flush=True,
+        )
+
+    try:
+        with BackfillCheckpoint(checkpoint_path) as checkpoint:
+            stats = await Backfill(
+                api,
+                args.club_id,
+                args.start,
+                args.end,
+                checkpoint,
+                lake=lake,
+                pool=pool,
+                max_downloads=args.downloads,
+                max_per_host=args.downloads_per_host,
+                max_conversions=conversions,
+            ).run(on_progress)
+            failures = checkpoint.failures()
+    finally:
+        if pool is not None:
+            pool.close()
+        await api.http_client.aclose()
+
+    print(
+        f"{stats.sessions} sessions, {stats.participations} participations:"
+        f" {stats.written} written, {stats.skipped} already done,"
+        f" {stats.failed} failed ({stats.files} files, {stats.bytes / 1e6:.1f} MB)."
+    )
+    print(f"Dataset: {lake.root}")
+    if failures:
+        print(f"Run again to retry the {len(failures)} that failed.")
+        return 1
+    return 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if not args.client_id:
+        print("A client ID is required: pass --client-id or set CLIENT_ID.")
+        return 2
+    try:
+        return asyncio.run(backfill(args))
+    except KeyboardInterrupt:
+        print("Interrupted; run the same command again to resume.")
+        return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,243 @@
+"""
+Run many tenants' API clients over one shared, rate-limited connection pool.
+"""
+
+import asyncio
+from collections import deque
+from pathlib import Path
+from typing import AsyncIterator, Callable, Optional, Union
+
+import httpx
+
+from .auth.token_storage import user_data_dir
+from .gqlauth import AuthenticationType
+from .playerdata_api import PlayerDataAPI
+from .rate_limit import (
+    MAX_IN_FLIGHT,
+    PER_IP_LIMIT,
+    PER_TOKEN_LIMIT,
+    RATE_LIMIT_WINDOW,
+    MemoryBackend,
+    RateLimitBackend,
+    RateLimiter,
+)
+
+
+class ClientPool:
+    """
+    A set of ``PlayerDataAPI`` clients, one per tenant, sharing a connection pool.
+
+    Each tenant's requests are paced against its own per-token budget, then
+    granted a share of the global per-IP budget and in-flight limit in round-robin
+    order, so a tenant with a large backlog can't starve the others.
+
+    Rate limit windows live in ``backend``; give every worker process a
+    ``FileBackend`` on the same path to share the per-IP and per-token budgets
+    between them. The in-flight limit always applies per process.
+
+    Example:
+        async with ClientPool() as pool:
+            club_a = pool.add_client("club-a", client_id="...", client_secret="...")
+            club_b = pool.add_client("club-b", client_id="...", client_secret="...")
+            await asyncio.gather(club_a.run_queries(...), club_b.run_queries(...))
+    """
+
+    def __init__(
+        self,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        per_ip_limit: int = PER_IP_LIMIT,
+        per_token_limit: int = PER_TOKEN_LIMIT,
+        max_in_flight: int = MAX_IN_FLIGHT,
+        period: float = RATE_LIMIT_WINDOW,
+        backend: Optional[RateLimitBackend] = None,
+    ):
+        self.per_token_limit = per_token_limit
+        self.period = period
+        self.backend = backend or MemoryBackend()
+        self.clients: dict[str, PlayerDataAPI] = {}
+        self._transport = transport or httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(max_connections=max_in_flight)
+        )
+        self._ip_limiter = RateLimiter(per_ip_limit, period, "ip", self.backend)
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._waiters: dict[str, deque[asyncio.Future]] = {}
+        self._ready: deque[str] = deque()
+        self._dispatcher: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> "ClientPool":
+        return self
+
+    async def __aexit__(self, exc_type: object, exc_val: object, exc_tb: object):
+        await self.aclose()
+
+    def __getitem__(self, name: str) -> PlayerDataAPI:
+        return self.clients[name]
+
+    def add_client(
+        self,
+        name: str,
+        client_id: str,
+        client_secret: str = "",
+        authentication_type: AuthenticationType = AuthenticationType.CLIENT_CREDENTIALS_FLOW,
+        token_file: Optional[Union[str, Path]] = None,
+        base_url: Optional[str] = None,
+    ) -> PlayerDataAPI:
+        """Create a client for a tenant, routed through the shared pool.
+
+        Args:
+            name: Unique name for the tenant, used for fair scheduling.
+            client_id: The tenant's OAuth client id.
+            client_secret: The tenant's OAuth client secret.
+            authentication_type: OAuth flow used for the tenant.
+            token_file: Where to persist the tenant's token. Defaults to a file
+                per client id, so tenants never overwrite each other's tokens.
+            base_url: Override the API base URL.
+        """
+        if name in self.clients:
+            raise ValueError(f"A client named {name!r} is already in the pool")
+
+        api = PlayerDataAPI(
+            client_id=client_id,
+            client_secret=client_secret,
+            token_file=token_file or user_data_dir() / "tokens" / f"{client_id}.json",
+            authentication_type=authentication_type,
+            base_url=base_url,
+            transport=_TenantTransport(
+                self,
+                name,
+                RateLimiter(
+                    self.per_token_limit,
+                    self.period,
+                    f"token:{client_id}",
+                    self.backend,
+                ),
+            ),
+        )
+        self.clients[name] = api
+        return api
+
+    async def aclose(self) -> None:
+        """Close the shared connection pool."""
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+        await self._transport.aclose()
+
+    async def _send(
+        self, tenant: "_TenantTransport", request: httpx.Request
+    ) -> httpx.Response:
+        await tenant.token_limiter.acquire()
+        await self._wait_for_turn(tenant.name)
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            self._in_flight.release()
+            raise
+
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_ReleasingStream(response.stream, self._in_flight.release),
+            extensions=response.extensions,
+        )
+
+    async def _wait_for_turn(self, name: str) -> None:
+        """Wait for an in-flight slot and a per-IP slot, granted round-robin."""
+        turn = asyncio.get_running_loop().create_future()
+        queue = self._waiters.setdefault(name, deque())
+        queue.append(turn)
+        if len(queue) == 1:
+            self._ready.append(name)
+
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+
+        try:
+            await turn
+        except asyncio.CancelledError:
+            if turn.done() and not turn.cancelled():
+                # Granted a slot just as the caller gave up
+                self._in_flight.release()
+            raise
+
+    async def _dispatch(self) -> None:
+        # Slots are only taken while someone is still waiting for one
+        while self._has_waiter():
+            await self._in_flight.acquire()
+            if not self._has_waiter():
+                self._in_flight.release()
+                return
+            try:
+                await self._ip_limiter.acquire()
+            except Exception as e:
+                # E.g. a FileBackend that can't be read; fail the caller next in
+                # line rather than leave every caller waiting on a dead dispatcher
+                self._in_flight.release()
+                turn = self._next_turn()
+                if turn is not None:
+                    turn.set_exception(e)
+                continue
+            turn = self._next_turn()
+            if turn is None:
+                self._in_flight.release()
+                return
+            turn.set_result(None)
+
+    def _has_waiter(self) -> bool:
+        """Drop cancelled waiters from the front of the line, then check for any."""
+        while self._ready:
+            queue = self._waiters[self._ready[0]]
+            while queue and queue[0].cancelled():
+                queue.popleft()
+            if queue:
+                return True
+            self._ready.popleft()
+        return False
+
+    def _next_turn(self) -> Optional[asyncio.Future]:
+        while self._ready:
+            name = self._ready.popleft()
+            queue = self._waiters[name]
+            while queue:
+                turn = queue.popleft()
+                if not turn.cancelled():
+                    if queue:
+                        self._ready.append(name)
+                    return turn
+        return None
+
+
+class _TenantTransport(httpx.AsyncBaseTransport):
+    """Routes one tenant's requests through the pool's shared transport."""
+
+    def __init__(self, pool: ClientPool, name: str, token_limiter: RateLimiter):
+        self.pool = pool
+        self.name = name
+        self.token_limiter = token_limiter
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self.pool._send(self, request)
+
+    async def aclose(self) -> None:
+        # The shared transport belongs to the pool; closing one tenant's client
+        # must not close it for everyone else.
+        pass
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response stream that frees the request's in-flight slot once closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]):
+        self._stream = stream
+        self._release: Optional[Callable[[], None]] = release
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._release is not None:
+                self._release()
+                self._release = None
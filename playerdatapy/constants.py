@@ -7,5 +7,14 @@ def graphql_url_for(base_url: str) -> str:
     return f"{base_url}/api/graphql"
 
 
+def graphql_ws_url_for(graphql_url: str) -> str:
+    if graphql_url.startswith("http"):
+        return "ws" + graphql_url.removeprefix("http")
+    return graphql_url
+
+
 API_BASE_URL = os.environ.get("PLAYERDATA_BASE_URL", DEFAULT_BASE_URL)
 GRAPHQL_URL = os.environ.get("PLAYERDATA_GRAPHQL_URL", graphql_url_for(API_BASE_URL))
+GRAPHQL_WS_URL = os.environ.get(
+    "PLAYERDATA_GRAPHQL_WS_URL", graphql_ws_url_for(GRAPHQL_URL)
+)
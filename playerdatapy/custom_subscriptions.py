@@ -0,0 +1,886 @@
+# Generated by ariadne-codegen
+
+from typing import Any, Optional, Union
+
+from .base_operation import GraphQLField
+from .custom_fields import (
+    BulkActionFields,
+    BulkAthleteImportFields,
+    BulkStaffImportFields,
+    ChecklistFields,
+    CommonAggregatedMetricsInterface,
+    ConfiguredAggMetricsFields,
+    ConfiguredMetricsFields,
+    DatasetFields,
+    FlexibleReportFields,
+    GatewayFields,
+    MatchEventFields,
+    MatchSessionAthletePeriodMetricSetFields,
+    MatchSessionPeriodMetricSetFields,
+    PendingMemberFields,
+    PersonFields,
+    QuestionFields,
+    SegmentFields,
+    SessionParticipationInterface,
+    TagDefinitionFields,
+    TrainingPlanImportFields,
+    TrainingSessionSegmentAthleteMetricSetFields,
+    TrainingSessionSegmentMetricSetFields,
+)
+from .custom_typing_fields import (
+    AthletePeriodMetricsUpdatedSubscriptionPayloadGraphQLField,
+    AthleteSegmentMetricsUpdatedSubscriptionPayloadGraphQLField,
+    AthleteSessionMetricsUpdatedSubscriptionPayloadGraphQLField,
+    BulkActionSubscriptionPayloadGraphQLField,
+    BulkAthleteImportSubscriptionPayloadGraphQLField,
+    BulkStaffImportSubscriptionPayloadGraphQLField,
+    MatchEventCreatedSubscriptionPayloadGraphQLField,
+    PendingMemberCreatedSubscriptionPayloadGraphQLField,
+    PeriodMetricsUpdatedSubscriptionPayloadGraphQLField,
+    PitchDetectedSubscriptionPayloadGraphQLField,
+    QuestionSubscriptionPayloadGraphQLField,
+    SegmentMetricsUpdatedSubscriptionPayloadGraphQLField,
+    SessionMetricsUpdatedSubscriptionPayloadGraphQLField,
+    SessionQuickActionsSubscriptionPayloadGraphQLField,
+    SetupChecklistUpdatedSubscriptionPayloadGraphQLField,
+    TrainingPlanImportSubscriptionPayloadGraphQLField,
+)
+from .enums import MatchEventClassEnum
+from .input_types import OrderInputObject
+
+
+class AthletePeriodMetricsUpdatedSubscriptionPayloadFields(GraphQLField):
+    """Autogenerated return type of AthletePeriodMetricsUpdatedSubscription."""
+
+    @classmethod
+    def metric_set(cls) -> "MatchSessionAthletePeriodMetricSetFields":
+        """The new metric set"""
+        return MatchSessionAthletePeriodMetricSetFields("metricSet")
+
+    def fields(
+        self,
+        *subfields: Union[
+            AthletePeriodMetricsUpdatedSubscriptionPayloadGraphQLField,
+            "MatchSessionAthletePeriodMetricSetFields",
+        ],
+    ) -> "AthletePeriodMetricsUpdatedSubscriptionPayloadFields":
+        """Subfields should come from the AthletePeriodMetricsUpdatedSubscriptionPayloadFields class"""
+        self._subfields.extend(subfields)
+        return self
+
+    def alias(
+        self, alias: str
+    ) -> "AthletePeriodMetricsUpdatedSubscriptionPayloadFields":
+        self._alias = alias
+        return self
+
+
+class AthleteSegmentMetricsUpdatedSubscriptionPayloadFields(GraphQLField):
+    """Autogenerated return type of AthleteSegmentMetricsUpdatedSubscription."""
+
+    @classmethod
+    def configured_metrics(
+        cls, *, requested_json_keys: Optional[list[str]] = None
+    ) -> "ConfiguredMetricsFields":
+        """Configured athlete metrics for the segment participation"""
+        arguments: dict[str, dict[str, Any]] = {
+            "requestedJsonKeys": {"type": "[String!]", "value": requested_json_keys}
+        }
+        cleared_arguments = {
+            key: value for key, value in arguments.items() if value["value"] is not None
+        }
+        return ConfiguredMetricsFields("configuredMetrics", arguments=cleared_arguments)
+
+    @classmethod
+    def metric_set(cls) -> "TrainingSessionSegmentAthleteMetricSetFields":
+        """The new metric set"""
+        return TrainingSessionSegmentAthleteMetricSetFields("metricSet")
+
+    def fields(
+        self,
+        *subfields: Union[
+            AthleteSegmentMetricsUpdatedSubscriptionPayloadGraphQLField,
+            "ConfiguredMetricsFields",
+            "TrainingSessionSegmentAthleteMetricSetFields",
+        ],
+    ) -> "AthleteSegmentMetricsUpdatedSubscriptionPayloadFields":
+        """Subfields should come from the AthleteSegmentMetricsUpdatedSubscriptionPayloadFields class"""
+        self._subfields.extend(subfields)
+        return self
+
+    def alias(
+        self, alias: str
+    ) -> "AthleteSegmentMetricsUpdatedSubscriptionPayloadFields":
+        self._alias = alias
+        return self
+
+
+class AthleteSessionMetricsUpdatedSubscriptionPayloadFields(GraphQLField):
+    """Autogenerated return type of AthleteSessionMetricsUpdatedSubscription."""
+
+    @classmethod
+    def configured_metrics(
+        cls, *, requested_json_keys: Optional[list[str]] = None
+    ) -> "ConfiguredMetricsFields":
+        """Configured athlete metrics for the session participation"""
+        arguments: dict[str, dict[str, Any]] = {
+            "requestedJsonKeys": {"type": "[String!]", "value": requested_json_keys}
+        }
+        cleared_arguments = {
+            key: value for key, value in arguments.items() if value["value"] is not None
+        }
+        return ConfiguredMetricsFields("configuredMetrics", arguments=cleared_arguments)
+
+    def fields(
+        self,
+        *subfields: Union[
+            AthleteSessionMetricsUpdatedSubscriptionPayloadGraphQLField,
+            "ConfiguredMetricsFields",
+        ],
+    ) -> "AthleteSessionMetricsUpdatedSubscriptionPayloadFields":
+        """Subfields should come from the AthleteSessionMetricsUpdatedSubscriptionPayloadFields class"""
+        self._subfields.extend(subfields)
+        return self
+
+    def alias(
+        self, alias: str
+    ) -> "AthleteSessionMetricsUpdatedSubscriptionPayloadFields":
+        self._alias = alias
+        return self
+
+
+class BulkActionSubscriptionPayloadFields(GraphQLField):
+    """Autogenerated return type of BulkActionSubscription."""
+
+    @classmethod
+    def bulk_action(cls) -> "BulkActionFields":
+        """The bulk action record"""
+        return BulkActionFields("bulkAction")
+
+    def fields(
+        self,
+        *subfields: Union[
+            BulkActionSubscriptionPayloadGraphQLField, "BulkActionFields"
+        ],
+    ) -> "BulkActionSubscriptionPayloadFields":
+        """Subfields should come from the BulkActionSubscriptionPayloadFields class"""
+        self._subfields.extend(subfields)
+        return self
+
+    def alias(self, alias: str) -> "BulkActionSubscriptionPayloadFields":
+        self._alias = alias
+        return self
+
+
+class BulkAthleteImportSubscriptionPayloadFields(GraphQLField):
+    """Autogenerated return type of BulkAthleteImportSubscription."""
+
+    @classmethod
+    def bulk_athlete_import(cls) -> "BulkAthleteImportFields":
+        """The bulk athlete import record"""
+        return BulkAthleteImportFields("bulkAthleteImport")
+
+    def fields(
+        self,
+        *subfields: Union[
+            BulkAthleteImportSubscriptionPayloadGraphQLField, "BulkAthleteImportFields"
+        ],
+    ) -> "BulkAthleteImportSubscriptionPayloadFields":
+        """Subfields should come from the BulkAthleteImportSubscriptionPayloadFields class"""
+        self._subfields.extend(subfields)
+        return self
+
+    def alias(self, alias: str) -> "BulkAthleteImportSubscriptionPayloadFields":
+        self._alias = alias
+        return self
+
+
+class BulkStaffImportSubscriptionPayloadFields(GraphQLField):
+    """Autogenerated return type of BulkStaffImportSubscription."""
+
+    @classmethod
+    def bulk_staff_import(cls) -> "BulkStaffImportFields":
+        """The bulk staff import record"""
+        return BulkStaffImportFields("bulkStaffImport")
+
+    def fields(
+        self,
+        *subfields: Union[
+            BulkStaffImportSubscriptionPayloadGraphQLField, "BulkStaffImportFields"
+        ],
+    ) -> "BulkStaffImportSubscriptionPayloadFields":
+        """Subfields should come from the BulkStaffImportSubscriptionPayloadFields class"""
+        self._subfields.extend(subfields)
+        return self
+
+    def alias(self, alias: str) -> "BulkStaffImportSubscriptionPayloadFields":
+        self._alias = alias
+        return self
+
+
+class MatchEventCreatedSubscriptionPayloadFields(GraphQLField):
+    """Autogenerated return type of MatchEventCreatedSubscription."""
+
+    @classmethod
+    def match_event(cls) -> "MatchEventFields":
+        """The new match event"""
+        return MatchEventFields("matchEvent")
+
+    def fields(
+        self,
+        *subfields: Union[
+            MatchEventCreatedSubscriptionPayloadGraphQLField, "MatchEventFields"
+        ],
+    ) -> "MatchEventCreatedSubscriptionPayloadFields":
+        """Subfields should come from the MatchEventCreatedSubscriptionPayloadFields class"""
+        self._subfields.extend(subfields)
+        return self
+
+    def alias(self, alias: str) -> "MatchEventCreatedSubscriptionPayloadFields":
+        self._alias = alias
+        return self
+
+
+class PendingMemberCreatedSubscriptionPayloadFields(GraphQLField):
+    """Autogenerated return type of PendingMemberCreatedSubscription."""
+
+    @classmethod
+    def pending_member(cls) -> "PendingMemberFields":
+        """latest pending member created"""
+        return PendingMemberFields("pendingMember")
+
+    def fields(
+        self,
+        *subfields: Union[
+            PendingMemberCreatedSubscriptionPayloadGraphQLField, "PendingMemberFields"
+        ],
+    ) -> "PendingMemberCreatedSubscriptionPayloadFields":
+        """Subfields should come from the PendingMemberCreatedSubscriptionPayloadFields class"""
+        self._subfields.extend(subfields)
+        return self
+
+    def alias(self, alias: str) -> "PendingMemberCreatedSubscriptionPayloadFields":
+        self._alias = alias
+        return self
+
+
+class PeriodMetricsUpdatedSubscriptionPayloadFields(GraphQLField):
+    """Autogenerated return type of PeriodMetricsUpdatedSubscription."""
+
+    @classmethod
+    def configured_agg_metrics(
+        cls, *, requested_json_keys: Optional[list[str]] = None
+    ) -> "ConfiguredAggMetricsFields":
+        """Configured aggregated metrics for a match session period"""
+        arguments: dict[str, dict[str, Any]] = {
+            "requestedJsonKeys": {"type": "[String!]", "value": requested_json_keys}
+        }
+        cleared_arguments = {
+            key: value for key, value in arguments.items() if value["value"] is not None
+        }
+        return ConfiguredAggMetricsFields(
+            "configuredAggMetrics", arguments=cleared_arguments
+        )
+
+    @classmethod
+    def metric_set(cls) -> "MatchSessionPeriodMetricSetFields":
+        """The period metric set"""
+        return MatchSessionPeriodMetricSetFields("metricSet")
+
+    def fields(
+        self,
+        *subfields: Union[
+            PeriodMetricsUpdatedSubscriptionPayloadGraphQLField,
+            "ConfiguredAggMetricsFields",
+            "MatchSessionPeriodMetricSetFields",
+        ],
+    ) -> "PeriodMetricsUpdatedSubscriptionPayloadFields":
+        """Subfields should come from the PeriodMetricsUpdatedSubscriptionPayloadFields class"""
+        self._subfields.extend(subfields)
+        return self
+
+    def alias(self, alias: str) -> "PeriodMetricsUpdatedSubscriptionPayloadFields":
+        self._alias = alias
+        return self
+
+
+class PitchDetectedSubscriptionPayloadFields(GraphQLField):
+    """Autogenerated return type of PitchDetectedSubscription."""
+
+    detected_at: "PitchDetectedSubscriptionPayloadGraphQLField" = (
+        PitchDetectedSubscriptionPayloadGraphQLField("detectedAt")
+    )
+    "When the pitch detection completed"
+    expires_at: "PitchDetectedSubscriptionPayloadGraphQLField" = (
+        PitchDetectedSubscriptionPayloadGraphQLField("expiresAt")
+    )
+    "When this notification will expire (frontend should hide after this time)"
+    pitch_name: "PitchDetectedSubscriptionPayloadGraphQLField" = (
+        PitchDetectedSubscriptionPayloadGraphQLField("pitchName")
+    )
+    "The name of the detected pitch (null if no pitch detected)"
+    session_id: "PitchDetectedSubscriptionPayloadGraphQLField" = (
+        PitchDetectedSubscriptionPayloadGraphQLField("sessionId")
+    )
+    "The session ID where pitch detection was performed"
+    success: "PitchDetectedSubscriptionPayloadGraphQLField" = (
+        PitchDetectedSubscriptionPayloadGraphQLField("success")
+    )
+    "Whether a pitch was successfully detected"
+
+    def fields(
+        self, *subfields: PitchDetectedSubscriptionPayloadGraphQLField
+    ) -> "PitchDetectedSubscriptionPayloadFields":
+        """Subfields should come from the PitchDetectedSubscriptionPayloadFields class"""
+        self._subfields.extend(subfields)
+        return self
+
+    def alias(self, alias: str) -> "PitchDetectedSubscriptionPayloadFields":
+        self._alias = alias
+        return self
+
+
+class QuestionSubscriptionPayloadFields(GraphQLField):
+    """Autogenerated return type of QuestionSubscription."""
+
+    @classmethod
+    def question(cls) -> "QuestionFields":
+        """The question"""
+        return QuestionFields("question")
+
+    def fields(
+        self,
+        *subfields: Union[QuestionSubscriptionPayloadGraphQLField, "QuestionFields"],
+    ) -> "QuestionSubscriptionPayloadFields":
+        """Subfields should come from the QuestionSubscriptionPayloadFields class"""
+        self._subfields.extend(subfields)
+        return self
+
+    def alias(self, alias: str) -> "QuestionSubscriptionPayloadFields":
+        self._alias = alias
+        return self
+
+
+class SegmentMetricsUpdatedSubscriptionPayloadFields(GraphQLField):
+    """Autogenerated return type of SegmentMetricsUpdatedSubscription."""
+
+    @classmethod
+    def configured_agg_metrics(
+        cls, *, requested_json_keys: Optional[list[str]] = None
+    ) -> "ConfiguredAggMetricsFields":
+        """Configured aggregated metrics for the segment"""
+        arguments: dict[str, dict[str, Any]] = {
+            "requestedJsonKeys": {"type": "[String!]", "value": requested_json_keys}
+        }
+        cleared_arguments = {
+            key: value for key, value in arguments.items() if value["value"] is not None
+        }
+        return ConfiguredAggMetricsFields(
+            "configuredAggMetrics", arguments=cleared_arguments
+        )
+
+    @classmethod
+    def metric_set(cls) -> "TrainingSessionSegmentMetricSetFields":
+        """The new metric set"""
+        return TrainingSessionSegmentMetricSetFields("metricSet")
+
+    def fields(
+        self,
+        *subfields: Union[
+            SegmentMetricsUpdatedSubscriptionPayloadGraphQLField,
+            "ConfiguredAggMetricsFields",
+            "TrainingSessionSegmentMetricSetFields",
+        ],
+    ) -> "SegmentMetricsUpdatedSubscriptionPayloadFields":
+        """Subfields should come from the SegmentMetricsUpdatedSubscriptionPayloadFields class"""
+        self._subfields.extend(subfields)
+        return self
+
+    def alias(self, alias: str) -> "SegmentMetricsUpdatedSubscriptionPayloadFields":
+        self._alias = alias
+        return self
+
+
+class SessionMetricsUpdatedSubscriptionPayloadFields(GraphQLField):
+    """Autogenerated return type of SessionMetricsUpdatedSubscription."""
+
+    @classmethod
+    def configured_agg_metrics(
+        cls, *, requested_json_keys: Optional[list[str]] = None
+    ) -> "ConfiguredAggMetricsFields":
+        """Configured aggregated metrics for the session"""
+        arguments: dict[str, dict[str, Any]] = {
+            "requestedJsonKeys": {"type": "[String!]", "value": requested_json_keys}
+        }
+        cleared_arguments = {
+            key: value for key, value in arguments.items() if value["value"] is not None
+        }
+        return ConfiguredAggMetricsFields(
+            "configuredAggMetrics", arguments=cleared_arguments
+        )
+
+    @classmethod
+    def metric_set(cls) -> "CommonAggregatedMetricsInterface":
+        """The new metric set"""
+        return CommonAggregatedMetricsInterface("metricSet")
+
+    def fields(
+        self,
+        *subfields: Union[
+            SessionMetricsUpdatedSubscriptionPayloadGraphQLField,
+            "CommonAggregatedMetricsInterface",
+            "ConfiguredAggMetricsFields",
+        ],
+    ) -> "SessionMetricsUpdatedSubscriptionPayloadFields":
+        """Subfields should come from the SessionMetricsUpdatedSubscriptionPayloadFields class"""
+        self._subfields.extend(subfields)
+        return self
+
+    def alias(self, alias: str) -> "SessionMetricsUpdatedSubscriptionPayloadFields":
+        self._alias = alias
+        return self
+
+
+class SessionQuickActionsSubscriptionPayloadFields(GraphQLField):
+    """Autogenerated return type of SessionQuickActionsSubscription."""
+
+    end_time: "SessionQuickActionsSubscriptionPayloadGraphQLField" = (
+        SessionQuickActionsSubscriptionPayloadGraphQLField("endTime")
+    )
+    "The session end time"
+
+    @classmethod
+    def ordered_segments(
+        cls, *, limit: Optional[int] = None, offset: Optional[int] = None
+    ) -> "SegmentFields":
+        """Ordered session segments"""
+        arguments: dict[str, dict[str, Any]] = {
+            "limit": {"type": "Int", "value": limit},
+            "offset": {"type": "Int", "value": offset},
+        }
+        cleared_arguments = {
+            key: value for key, value in arguments.items() if value["value"] is not None
+        }
+        return SegmentFields("orderedSegments", arguments=cleared_arguments)
+
+    quick_action_state: "SessionQuickActionsSubscriptionPayloadGraphQLField" = (
+        SessionQuickActionsSubscriptionPayloadGraphQLField("quickActionState")
+    )
+    "The quick action state of the session"
+
+    @classmethod
+    def segments(
+        cls,
+        *,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        order: Optional[list[OrderInputObject]] = None,
+    ) -> "SegmentFields":
+        """Session segments"""
+        arguments: dict[str, dict[str, Any]] = {
+            "limit": {"type": "Int", "value": limit},
+            "offset": {"type": "Int", "value": offset},
+            "order": {"type": "[OrderInputObject!]", "value": order},
+        }
+        cleared_arguments = {
+            key: value for key, value in arguments.items() if value["value"] is not None
+        }
+        return SegmentFields("segments", arguments=cleared_arguments)
+
+    @classmethod
+    def session_participations(
+        cls,
+        *,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        with_data: Optional[bool] = None,
+    ) -> "SessionParticipationInterface":
+        """The session participations"""
+        arguments: dict[str, dict[str, Any]] = {
+            "limit": {"type": "Int", "value": limit},
+            "offset": {"type": "Int", "value": offset},
+            "withData": {"type": "Boolean", "value": with_data},
+        }
+        cleared_arguments = {
+            key: value for key, value in arguments.items() if value["value"] is not None
+        }
+        return SessionParticipationInterface(
+            "sessionParticipations", arguments=cleared_arguments
+        )
+
+    start_time: "SessionQuickActionsSubscriptionPayloadGraphQLField" = (
+        SessionQuickActionsSubscriptionPayloadGraphQLField("startTime")
+    )
+    "The session start time"
+
+    @classmethod
+    def tag_definitions(
+        cls, *, limit: Optional[int] = None, offset: Optional[int] = None
+    ) -> "TagDefinitionFields":
+        """The session tag definitions"""
+        arguments: dict[str, dict[str, Any]] = {
+            "limit": {"type": "Int", "value": limit},
+            "offset": {"type": "Int", "value": offset},
+        }
+        cleared_arguments = {
+            key: value for key, value in arguments.items() if value["value"] is not None
+        }
+        return TagDefinitionFields("tagDefinitions", arguments=cleared_arguments)
+
+    def fields(
+        self,
+        *subfields: Union[
+            SessionQuickActionsSubscriptionPayloadGraphQLField,
+            "SegmentFields",
+            "SessionParticipationInterface",
+            "TagDefinitionFields",
+        ],
+    ) -> "SessionQuickActionsSubscriptionPayloadFields":
+        """Subfields should come from the SessionQuickActionsSubscriptionPayloadFields class"""
+        self._subfields.extend(subfields)
+        return self
+
+    def alias(self, alias: str) -> "SessionQuickActionsSubscriptionPayloadFields":
+        self._alias = alias
+        return self
+
+
+class SetupChecklistUpdatedSubscriptionPayloadFields(GraphQLField):
+    """Autogenerated return type of SetupChecklistUpdatedSubscription."""
+
+    @classmethod
+    def setup_checklist(cls) -> "ChecklistFields":
+        """The updated setup checklist"""
+        return ChecklistFields("setupChecklist")
+
+    def fields(
+        self,
+        *subfields: Union[
+            SetupChecklistUpdatedSubscriptionPayloadGraphQLField, "ChecklistFields"
+        ],
+    ) -> "SetupChecklistUpdatedSubscriptionPayloadFields":
+        """Subfields should come from the SetupChecklistUpdatedSubscriptionPayloadFields class"""
+        self._subfields.extend(subfields)
+        return self
+
+    def alias(self, alias: str) -> "SetupChecklistUpdatedSubscriptionPayloadFields":
+        self._alias = alias
+        return self
+
+
+class TrainingPlanImportSubscriptionPayloadFields(GraphQLField):
+    """Autogenerated return type of TrainingPlanImportSubscription."""
+
+    @classmethod
+    def training_plan_import(cls) -> "TrainingPlanImportFields":
+        """The training plan import record"""
+        return TrainingPlanImportFields("trainingPlanImport")
+
+    def fields(
+        self,
+        *subfields: Union[
+            TrainingPlanImportSubscriptionPayloadGraphQLField,
+            "TrainingPlanImportFields",
+        ],
+    ) -> "TrainingPlanImportSubscriptionPayloadFields":
+        """Subfields should come from the TrainingPlanImportSubscriptionPayloadFields class"""
+        self._subfields.extend(subfields)
+        return self
+
+    def alias(self, alias: str) -> "TrainingPlanImportSubscriptionPayloadFields":
+        self._alias = alias
+        return self
+
+
+class Subscription:
+    @classmethod
+    def athlete_period_metrics_updated_event(
+        cls, session_participation_id: str
+    ) -> AthletePeriodMetricsUpdatedSubscriptionPayloadFields:
+        """Emitted when an athlete's period metrics are updated"""
+        arguments: dict[str, dict[str, Any]] = {
+            "sessionParticipationId": {"type": "ID!", "value": session_participation_id}
+        }
+        cleared_arguments = {
+            key: value for key, value in arguments.items() if value["value"] is not None
+        }
+        return AthletePeriodMetricsUpdatedSubscriptionPayloadFields(
+            field_name="athletePeriodMetricsUpdatedEvent", arguments=cleared_arguments
+        )
+
+    @classmethod
+    def athlete_segment_metrics_updated_event(
+        cls, segment_participation_id: str
+    ) -> AthleteSegmentMetricsUpdatedSubscriptionPayloadFields:
+        """Emitted when an athlete's segment metrics are updated"""
+        arguments: dict[str, dict[str, Any]] = {
+            "segmentParticipationId": {"type": "ID!", "value": segment_participation_id}
+        }
+        cleared_arguments = {
+            key: value for key, value in arguments.items() if value["value"] is not None
+        }
+        return AthleteSegmentMetricsUpdatedSubscriptionPayloadFields(
+            field_name="athleteSegmentMetricsUpdatedEvent", arguments=cleared_arguments
+        )
+
+    @classmethod
+    def athlete_session_metrics_updated_event(
+        cls,
+        session_participation_id: str,
+        *,
+        requested_json_keys: Optional[list[str]] = None,
+        requested_keys: Optional[list[str]] = None,
+    ) -> AthleteSessionMetricsUpdatedSubscriptionPayloadFields:
+        """Emitted when an athlete's session metrics are updated"""
+        arguments: dict[str, dict[str, Any]] = {
+            "requestedJsonKeys": {"type": "[String!]", "value": requested_json_keys},
+            "requestedKeys": {"type": "[String!]", "value": requested_keys},
+            "sessionParticipationId": {
+                "type": "ID!",
+                "value": session_participation_id,
+            },
+        }
+        cleared_arguments = {
+            key: value for key, value in arguments.items() if value["value"] is not None
+        }
+        return AthleteSessionMetricsUpdatedSubscriptionPayloadFields(
+            field_name="athleteSessionMetricsUpdatedEvent", arguments=cleared_arguments
+        )
+
+    @classmethod
+    def bulk_action_event(cls, id: str) -> BulkActionSubscriptionPayloadFields:
+        """Emitted when a bulk action is updated"""
+        arguments: dict[str, dict[str, Any]] = {"id": {"type": "ID!", "value": id}}
+        cleared_arguments = {
+            key: value for key, value in arguments.items() if value["value"] is not None
+        }
+        return BulkActionSubscriptionPayloadFields(
+            field_name="bulkActionEvent", arguments=cleared_arguments
+        )
+
+    @classmethod
+    def bulk_athlete_import_event(
+        cls, id: str
+    ) -> BulkAthleteImportSubscriptionPayloadFields:
+        """Emitted when a bulk athlete import is updated"""
+        arguments: dict[str, dict[str, Any]] = {"id": {"type": "ID!", "value": id}}
+        cleared_arguments = {
+            key: value for key, value in arguments.items() if value["value"] is not None
+        }
+        return BulkAthleteImportSubscriptionPayloadFields(
+            field_name="bulkAthleteImportEvent", arguments=cleared_arguments
+        )
+
+    @classmethod
+    def bulk_staff_import_event(
+        cls, id: str
+    ) -> BulkStaffImportSubscriptionPayloadFields:
+        """Emitted when a bulk staff import is updated"""
+        arguments: dict[str, dict[str, Any]] = {"id": {"type": "ID!", "value": id}}
+        cleared_arguments = {
+            key: value for key, value in arguments.items() if value["value"] is not None
+        }
+        return BulkStaffImportSubscriptionPayloadFields(
+            field_name="bulkStaffImportEvent", arguments=cleared_arguments
+        )
+
+    @classmethod
+    def dataset_updated_event(cls, *, id: Optional[str] = None) -> DatasetFields:
+        """Emitted when a dataset is updated"""
+        arguments: dict[str, dict[str, Any]] = {"id": {"type": "ID", "value": id}}
+        cleared_arguments = {
+            key: value for key, value in arguments.items() if value["value"] is not None
+        }
+        return DatasetFields(
+            field_name="datasetUpdatedEvent", arguments=cleared_arguments
+        )
+
+    @classmethod
+    def flexible_report_updated_event(
+        cls, flexible_report_id: str
+    ) -> FlexibleReportFields:
+        """Emitted when a flexible report is updated"""
+        arguments: dict[str, dict[str, Any]] = {
+            "flexibleReportId": {"type": "ID!", "value": flexible_report_id}
+        }
+        cleared_arguments = {
+            key: value for key, value in arguments.items() if value["value"] is not None
+        }
+        return FlexibleReportFields(
+            field_name="flexibleReportUpdatedEvent", arguments=cleared_arguments
+        )
+
+    @classmethod
+    def gateway(cls, serial_number: str) -> GatewayFields:
+        """Subscribe to updates for a gateway"""
+        arguments: dict[str, dict[str, Any]] = {
+            "serialNumber": {"type": "String!", "value": serial_number}
+        }
+        cleared_arguments = {
+            key: value for key, value in arguments.items() if value["value"] is not None
+        }
+        return GatewayFields(field_name="gateway", arguments=cleared_arguments)
+
+    @classmethod
+    def match_event_created_event(
+        cls,
+        session_participation_id: str,
+        *,
+        event_classes: Optional[list[MatchEventClassEnum]] = None,
+    ) -> MatchEventCreatedSubscriptionPayloadFields:
+        """Emitted when a match event is created"""
+        arguments: dict[str, dict[str, Any]] = {
+            "eventClasses": {"type": "[MatchEventClassEnum!]", "value": event_classes},
+            "sessionParticipationId": {
+                "type": "ID!",
+                "value": session_participation_id,
+            },
+        }
+        cleared_arguments = {
+            key: value for key, value in arguments.items() if value["value"] is not None
+        }
+        return MatchEventCreatedSubscriptionPayloadFields(
+            field_name="matchEventCreatedEvent", arguments=cleared_arguments
+        )
+
+    @classmethod
+    def pending_member_created_event(
+        cls, club_id: str
+    ) -> PendingMemberCreatedSubscriptionPayloadFields:
+        """Emitted when a pending member is created"""
+        arguments: dict[str, dict[str, Any]] = {
+            "clubId": {"type": "ID!", "value": club_id}
+        }
+        cleared_arguments = {
+            key: value for key, value in arguments.items() if value["value"] is not None
+        }
+        return PendingMemberCreatedSubscriptionPayloadFields(
+            field_name="pendingMemberCreatedEvent", arguments=cleared_arguments
+        )
+
+    @classmethod
+    def period_metrics_updated_event(
+        cls, period_id: str
+    ) -> PeriodMetricsUpdatedSubscriptionPayloadFields:
+        """Emitted when a period's metrics are updated"""
+        arguments: dict[str, dict[str, Any]] = {
+            "periodId": {"type": "ID!", "value": period_id}
+        }
+        cleared_arguments = {
+            key: value for key, value in arguments.items() if value["value"] is not None
+        }
+        return PeriodMetricsUpdatedSubscriptionPayloadFields(
+            field_name="periodMetricsUpdatedEvent", arguments=cleared_arguments
+        )
+
+    @classmethod
+    def person(cls, person_id: str) -> PersonFields:
+        """Subscribe to updates for a person"""
+        arguments: dict[str, dict[str, Any]] = {
+            "personId": {"type": "ID!", "value": person_id}
+        }
+        cleared_arguments = {
+            key: value for key, value in arguments.items() if value["value"] is not None
+        }
+        return PersonFields(field_name="person", arguments=cleared_arguments)
+
+    @classmethod
+    def pitch_detected_event(
+        cls, session_id: str
+    ) -> PitchDetectedSubscriptionPayloadFields:
+        """Emitted when a pitch is detected"""
+        arguments: dict[str, dict[str, Any]] = {
+            "sessionId": {"type": "ID!", "value": session_id}
+        }
+        cleared_arguments = {
+            key: value for key, value in arguments.items() if value["value"] is not None
+        }
+        return PitchDetectedSubscriptionPayloadFields(
+            field_name="pitchDetectedEvent", arguments=cleared_arguments
+        )
+
+    @classmethod
+    def question(cls, question_id: str) -> QuestionSubscriptionPayloadFields:
+        """Subscribe to updates for a chat question"""
+        arguments: dict[str, dict[str, Any]] = {
+            "questionId": {"type": "ID!", "value": question_id}
+        }
+        cleared_arguments = {
+            key: value for key, value in arguments.items() if value["value"] is not None
+        }
+        return QuestionSubscriptionPayloadFields(
+            field_name="question", arguments=cleared_arguments
+        )
+
+    @classmethod
+    def segment_metrics_updated_event(
+        cls, segment_id: str
+    ) -> SegmentMetricsUpdatedSubscriptionPayloadFields:
+        """Emitted when a segment's metrics are updated"""
+        arguments: dict[str, dict[str, Any]] = {
+            "segmentId": {"type": "ID!", "value": segment_id}
+        }
+        cleared_arguments = {
+            key: value for key, value in arguments.items() if value["value"] is not None
+        }
+        return SegmentMetricsUpdatedSubscriptionPayloadFields(
+            field_name="segmentMetricsUpdatedEvent", arguments=cleared_arguments
+        )
+
+    @classmethod
+    def session_metrics_updated_event(
+        cls, session_id: str
+    ) -> SessionMetricsUpdatedSubscriptionPayloadFields:
+        """Emitted when a session's metrics are updated"""
+        arguments: dict[str, dict[str, Any]] = {
+            "sessionId": {"type": "ID!", "value": session_id}
+        }
+        cleared_arguments = {
+            key: value for key, value in arguments.items() if value["value"] is not None
+        }
+        return SessionMetricsUpdatedSubscriptionPayloadFields(
+            field_name="sessionMetricsUpdatedEvent", arguments=cleared_arguments
+        )
+
+    @classmethod
+    def session_quick_actions_event(
+        cls, session_id: str
+    ) -> SessionQuickActionsSubscriptionPayloadFields:
+        """Emitted when a session's quick actions change"""
+        arguments: dict[str, dict[str, Any]] = {
+            "sessionId": {"type": "ID!", "value": session_id}
+        }
+        cleared_arguments = {
+            key: value for key, value in arguments.items() if value["value"] is not None
+        }
+        return SessionQuickActionsSubscriptionPayloadFields(
+            field_name="sessionQuickActionsEvent", arguments=cleared_arguments
+        )
+
+    @classmethod
+    def setup_checklist_updated_event(
+        cls, club_id: str
+    ) -> SetupChecklistUpdatedSubscriptionPayloadFields:
+        """Emitted when a setup checklist is updated"""
+        arguments: dict[str, dict[str, Any]] = {
+            "clubId": {"type": "ID!", "value": club_id}
+        }
+        cleared_arguments = {
+            key: value for key, value in arguments.items() if value["value"] is not None
+        }
+        return SetupChecklistUpdatedSubscriptionPayloadFields(
+            field_name="setupChecklistUpdatedEvent", arguments=cleared_arguments
+        )
+
+    @classmethod
+    def training_plan_import_event(
+        cls, id: str
+    ) -> TrainingPlanImportSubscriptionPayloadFields:
+        """Emitted when a training plan import is updated"""
+        arguments: dict[str, dict[str, Any]] = {"id": {"type": "ID!", "value": id}}
+        cleared_arguments = {
+            key: value for key, value in arguments.items() if value["value"] is not None
+        }
+        return TrainingPlanImportSubscriptionPayloadFields(
+            field_name="trainingPlanImportEvent", arguments=cleared_arguments
+        )
@@ -0,0 +1,40 @@
+"""
+Downloading datafiles and media from the URLs the API returns.
+"""
+
+from .cache import CacheEntry, CacheStats, DownloadCache, cache_key
+from .manager import (
+    DownloadEvent,
+    DownloadManager,
+    DownloadManifest,
+    DownloadReport,
+    DownloadStats,
+    DownloadStatus,
+    DownloadTask,
+)
+from .ranged import RangeError, download_ranges
+from .records import RecordBatcher, RecordCounter
+from .stream import DownloadResult, conditional_headers, stream_to_file
+from .targets import download_target
+
+__all__ = [
+    "CacheEntry",
+    "CacheStats",
+    "DownloadCache",
+    "DownloadEvent",
+    "DownloadManager",
+    "DownloadManifest",
+    "DownloadReport",
+    "DownloadResult",
+    "DownloadStats",
+    "DownloadStatus",
+    "DownloadTask",
+    "RangeError",
+    "RecordBatcher",
+    "RecordCounter",
+    "cache_key",
+    "conditional_headers",
+    "download_ranges",
+    "download_target",
+    "stream_to_file",
+]
@@ -0,0 +1,342 @@
+"""
+On-disk cache of downloaded datafiles.
+
+Recordings don't change without their ``updatedAt`` changing, so a file is cached
+under a key derived from the recording's id and ``updatedAt``: a repeat download
+of an unchanged recording is served from disk, and a changed recording gets a
+new key. The cache is bounded in size, evicting the least recently used files,
+and can store files zstd-compressed.
+
+Files whose URL doesn't change with the content, e.g. heatmap images, can be
+revalidated instead: the cache keeps each file's ``ETag`` and ``Last-Modified``
+and asks the server whether the file changed, so an unchanged file costs a 304
+response rather than a download.
+
+An index file records each entry's size. It is updated under a file lock, and
+each file's last use is kept as its modification time, so several processes can
+share one cache directory and a cache hit doesn't rewrite the index.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import BinaryIO, Callable, Optional, Union
+
+import httpx
+
+from ..auth.token_storage import atomic_write_text, file_lock, user_data_dir
+from .stream import conditional_headers, stream_to_file
+
+try:
+    import zstandard  # type: ignore[import-not-found,unused-ignore]
+except ImportError:
+    zstandard = None
+
+DEFAULT_MAX_BYTES = 10 * 1024**3
+
+
+def cache_key(object_id: str, updated_at: Optional[str] = None, kind: str = "") -> str:
+    """The cache key of one version of an object.
+
+    Args:
+        object_id: The recording or participation id.
+        updated_at: The object's ``updatedAt``, so a changed object gets a new key.
+        kind: Distinguishes different files of the same object, e.g. its format.
+    """
+    identity = json.dumps([kind, object_id, updated_at])
+    return hashlib.sha256(identity.encode()).hexdigest()
+
+
+@dataclass
+class CacheEntry:
+    """A file held in the cache."""
+
+    key: str
+    size: int
+    "Size of the original file."
+    stored_size: int
+    "Size on disk, after compression."
+    compressed: bool
+    last_used: float
+    "When the entry was last stored or read, as the stored file's modification time."
+    etag: Optional[str] = None
+    "The ``ETag`` the file was served with, for revalidating it."
+    last_modified: Optional[str] = None
+    "The ``Last-Modified`` the file was served with, for revalidating it."
+
+
+@dataclass
+class CacheStats:
+    """What ``DownloadCache.fetch`` has done since the cache was created."""
+
+    hits: int = 0
+    "Fetches served from disk without asking the server."
+    not_modified: int = 0
+    "Fetches revalidated with the server and answered with 304."
+    downloads: int = 0
+    "Fetches that downloaded the file."
+    bytes_downloaded: int = 0
+
+
+class DownloadCache:
+    """
+    Size-bounded cache of downloaded files, keyed with ``cache_key``.
+
+    Example:
+        cache = DownloadCache(max_bytes=50 * 1024**3)
+        entry = await cache.fetch(
+            http_client, url, cache_key(recording["id"], recording["updatedAt"])
+        )
+        with cache.open(entry.key) as f:
+            frames = parse_raw(f)
+    """
+
+    def __init__(
+        self,
+        root: Optional[Union[str, Path]] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        compress: bool = False,
+        compression_level: int = 3,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            root: Directory holding the cache. Defaults to a ``cache`` directory in
+                the per-user data directory.
+            max_bytes: Most bytes kept on disk before least recently used files
+                are evicted.
+            compress: Store files zstd-compressed. Requires the ``cache`` extra
+                (``pip install playerdatapy[cache]``).
+            compression_level: zstd compression level.
+        """
+        if compress and zstandard is None:
+            raise ImportError(
+                "Compressed caching requires 'zstandard': "
+                "pip install playerdatapy[cache]"
+            )
+        self.root = Path(root) if root is not None else user_data_dir() / "cache"
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self.compression_level = compression_level
+        self.index_path = self.root / "index.json"
+        self.lock_path = self.root / "index.lock"
+        self._clock = clock
+        self._fetching: dict[str, asyncio.Lock] = {}
+        self._fetchers: dict[str, int] = {}
+        self.stats = CacheStats()
+
+    def path(self, key: str, compressed: bool = False) -> Path:
+        """Where the file for ``key`` is stored."""
+        suffix = ".zst" if compressed else ""
+        return self.root / "objects" / key[:2] / f"{key}{suffix}"
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """The entry for ``key``, marking it as recently used, or ``None``."""
+        # The index is replaced atomically, so it can be read without the lock
+        entry = self._read_index().get(key)
+        if entry is None:
+            return None
+        entry.last_used = self._clock()
+        try:
+            self._touch(self.path(key, entry.compressed), entry.last_used)
+        except FileNotFoundError:
+            # Removed behind the cache's back
+            with file_lock(self.lock_path):
+                index = self._read_index()
+                if index.pop(key, None) is not None:
+                    self._write_index(index)
+            return None
+        return entry
+
+    def open(self, key: str) -> BinaryIO:
+        """Open the cached file for ``key`` for reading, decompressing if needed.
+
+        Raises:
+            KeyError: ``key`` isn't cached.
+        """
+        entry = self.get(key)
+        if entry is None:
+            raise KeyError(key)
+        f = self.path(key, entry.compressed).open("rb")
+        if entry.compressed:
+            return zstandard.ZstdDecompressor().stream_reader(f, closefd=True)
+        return f
+
+    def put(
+        self,
+        key: str,
+        source: Union[str, Path],
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> CacheEntry:
+        """Move the file at ``source`` into the cache under ``key``.
+
+        Evicts least recently used entries until the cache fits ``max_bytes``.
+
+        Args:
+            key: The file's cache key.
+            source: The file to move in.
+            etag: The ``ETag`` the file was served with.
+            last_modified: The ``Last-Modified`` the file was served with.
+        """
+        source = Path(source)
+        size = source.stat().st_size
+        target = self.path(key, self.compress)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if self.compress:
+            fd, tmp_path = tempfile.mkstemp(dir=target.parent, prefix=f".{key}.")
+            try:
+                with source.open("rb") as src, os.fdopen(fd, "wb") as dst:
+                    zstandard.ZstdCompressor(level=self.compression_level).copy_stream(
+                        src, dst
+                    )
+                os.replace(tmp_path, target)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            source.unlink()
+        else:
+            shutil.move(source, target)
+
+        last_used = self._clock()
+        self._touch(target, last_used)
+        entry = CacheEntry(
+            key=key,
+            size=size,
+            stored_size=target.stat().st_size,
+            compressed=self.compress,
+            last_used=last_used,
+            etag=etag,
+            last_modified=last_modified,
+        )
+        with file_lock(self.lock_path):
+            index = self._read_index()
+            previous = index.get(key)
+            if previous is not None and previous.compressed != entry.compressed:
+                self.path(key, previous.compressed).unlink(missing_ok=True)
+            index[key] = entry
+            self._evict(index, keep=key)
+            self._write_index(index)
+        return entry
+
+    def discard(self, key: str) -> None:
+        """Remove ``key`` from the cache, if it is there."""
+        with file_lock(self.lock_path):
+            index = self._read_index()
+            entry = index.pop(key, None)
+            if entry is not None:
+                self.path(key, entry.compressed).unlink(missing_ok=True)
+                self._write_index(index)
+
+    @property
+    def size(self) -> int:
+        """Bytes the cached files take on disk."""
+        with file_lock(self.lock_path):
+            return sum(entry.stored_size for entry in self._read_index().values())
+
+    async def fetch(
+        self,
+        http_client: httpx.AsyncClient,
+        url: str,
+        key: str,
+        revalidate: bool = False,
+    ) -> CacheEntry:
+        """The entry for ``key``, downloading it from ``url`` on a miss.
+
+        Concurrent fetches of the same key share one download.
+
+        Args:
+            http_client: The client to download with.
+            url: The file's URL.
+            key: The file's cache key.
+            revalidate: Ask the server whether a cached file changed, with
+                ``If-None-Match``/``If-Modified-Since``, and download it again
+                only if it did. Use when ``key`` doesn't change with the content.
+        """
+        lock = self._fetching.setdefault(key, asyncio.Lock())
+        self._fetchers[key] = self._fetchers.get(key, 0) + 1
+        try:
+            async with lock:
+                return await self._fetch(http_client, url, key, revalidate)
+        finally:
+            self._fetchers[key] -= 1
+            if not self._fetchers[key]:
+                del self._fetchers[key]
+                del self._fetching[key]
+
+    async def _fetch(
+        self, http_client: httpx.AsyncClient, url: str, key: str, revalidate: bool
+    ) -> CacheEntry:
+        entry = await asyncio.to_thread(self.get, key)
+        headers = None
+        if entry is not None:
+            if not revalidate:
+                self.stats.hits += 1
+                return entry
+            headers = conditional_headers(entry.etag, entry.last_modified)
+        # A name of its own, as other processes may be fetching the same key
+        downloads = self.root / "downloads"
+        downloads.mkdir(parents=True, exist_ok=True)
+        fd, name = tempfile.mkstemp(dir=downloads, prefix=f"{key}.")
+        os.close(fd)
+        download = Path(name)
+        try:
+            result = await stream_to_file(http_client, url, download, headers=headers)
+            if result.not_modified and entry is not None:
+                self.stats.not_modified += 1
+                return entry
+            self.stats.downloads += 1
+            self.stats.bytes_downloaded += result.size
+            return await asyncio.to_thread(
+                self.put, key, download, result.etag, result.last_modified
+            )
+        finally:
+            download.unlink(missing_ok=True)
+
+    def _evict(self, index: dict[str, CacheEntry], keep: str) -> None:
+        total = sum(entry.stored_size for entry in index.values())
+        for entry in sorted(index.values(), key=self._last_used):
+            if total <= self.max_bytes:
+                return
+            if entry.key == keep:
+                continue
+            self.path(entry.key, entry.compressed).unlink(missing_ok=True)
+            del index[entry.key]
+            total -= entry.stored_size
+
+    def _last_used(self, entry: CacheEntry) -> float:
+        try:
+            return self.path(entry.key, entry.compressed).stat().st_mtime
+        except FileNotFoundError:
+            return entry.last_used
+
+    @staticmethod
+    def _touch(path: Path, when: float) -> None:
+        os.utime(path, (when, when))
+
+    def _read_index(self) -> dict[str, CacheEntry]:
+        try:
+            entries = json.loads(self.index_path.read_text() or "{}")
+        except FileNotFoundError:
+            return {}
+        except json.JSONDecodeError:
+            # Forgetting the index only costs re-downloads; orphans are overwritten
+            return {}
+        return {key: CacheEntry(key=key, **entry) for key, entry in entries.items()}
+
+    def _write_index(self, index: dict[str, CacheEntry]) -> None:
+        atomic_write_text(
+            self.index_path,
+            json.dumps(
+                {
+                    key: {k: v for k, v in asdict(entry).items() if k != "key"}
+                    for key, entry in index.items()
+                }
+            ),
+        )
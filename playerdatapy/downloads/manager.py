@@ -0,0 +1,346 @@
+"""
+Downloading many files at once, with bounded concurrency and retries.
+
+``DownloadManager`` runs downloads concurrently, up to a global limit and a lower
+limit per host, so a few thousand recordings neither exhaust sockets nor hammer
+one server. Transient failures (dropped connections, 429 and 5xx responses) are
+retried with exponential backoff. Progress is reported to an async callback, and
+a ``DownloadManifest`` records finished files so an interrupted run resumes
+without downloading them again.
+"""
+
+import asyncio
+import json
+import random
+import time
+from collections.abc import Awaitable, Iterable
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+import httpx
+
+from .stream import DownloadResult, stream_to_file
+
+RETRY_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+@dataclass
+class DownloadTask:
+    """A file to download."""
+
+    url: str
+    path: Union[str, Path]
+    "Where to save the file."
+    id: Optional[str] = None
+    "Identifies the task in the manifest and report. Defaults to ``path``."
+
+    @property
+    def key(self) -> str:
+        """The task's ``id``, or its ``path`` if it has none."""
+        return self.id if self.id is not None else str(self.path)
+
+
+class DownloadStatus(str, Enum):
+    """What happened to a task, as reported by a ``DownloadEvent``."""
+
+    STARTED = "started"
+    RETRYING = "retrying"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+    "Already completed in the manifest."
+
+
+@dataclass
+class DownloadStats:
+    """Totals across a ``DownloadManager.run``."""
+
+    completed: int = 0
+    failed: int = 0
+    skipped: int = 0
+    retries: int = 0
+    bytes: int = 0
+    "Bytes downloaded, not counting skipped files."
+    records: int = 0
+    "Records downloaded, if they are counted."
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def records_per_second(self) -> float:
+        return self.records / self.elapsed if self.elapsed else 0.0
+
+
+@dataclass
+class DownloadEvent:
+    """A change in a task's progress, passed to ``on_progress``."""
+
+    task: DownloadTask
+    status: DownloadStatus
+    stats: DownloadStats
+    "The run's totals so far, updated as the run goes on."
+    attempt: int = 1
+    result: Optional[DownloadResult] = None
+    "Set when ``status`` is ``COMPLETED`` or ``SKIPPED``."
+    error: Optional[BaseException] = None
+    "Set when ``status`` is ``RETRYING`` or ``FAILED``."
+
+
+@dataclass
+class DownloadReport:
+    """The outcome of a ``DownloadManager.run``, by task key."""
+
+    results: dict[str, DownloadResult]
+    errors: dict[str, BaseException]
+    stats: DownloadStats
+
+
+ProgressCallback = Callable[[DownloadEvent], Awaitable[None]]
+
+
+class DownloadManifest:
+    """
+    Record of the tasks of a bulk download and which have finished.
+
+    The manifest is a JSON lines file, appended to as tasks are added and
+    finish, so recording progress costs the same however many tasks there are.
+    A run interrupted part way can be resumed from it with ``pending()``.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._tasks: dict[str, DownloadTask] = {}
+        self._done: dict[str, DownloadResult] = {}
+        self._load()
+
+    def add(self, tasks: Iterable[DownloadTask]) -> None:
+        """Record tasks that are to be downloaded."""
+        new = [task for task in tasks if task.key not in self._tasks]
+        for task in new:
+            self._tasks[task.key] = task
+        self._append(
+            {"id": task.key, "url": task.url, "path": str(task.path)} for task in new
+        )
+
+    def completed(self, task: DownloadTask) -> Optional[DownloadResult]:
+        """The task's result, if it finished and its file is still in place."""
+        result = self._done.get(task.key)
+        if result is None or not result.path.is_file():
+            return None
+        if result.path.stat().st_size != result.size:
+            return None
+        return result
+
+    def record(self, task: DownloadTask, result: DownloadResult) -> None:
+        """Record that ``task`` finished."""
+        self._done[task.key] = result
+        self._append(
+            [
+                {
+                    "id": task.key,
+                    "done": True,
+                    "path": str(result.path),
+                    "size": result.size,
+                    "records": result.records,
+                }
+            ]
+        )
+
+    def pending(self) -> list[DownloadTask]:
+        """The tasks recorded that haven't finished."""
+        return [task for task in self._tasks.values() if self.completed(task) is None]
+
+    def _load(self) -> None:
+        try:
+            lines = self.path.read_text().splitlines()
+        except FileNotFoundError:
+            return
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # A line cut short by the interruption being resumed from
+                continue
+            if entry.get("done"):
+                self._done[entry["id"]] = DownloadResult(
+                    path=Path(entry["path"]),
+                    size=entry["size"],
+                    records=entry["records"],
+                )
+            else:
+                self._tasks[entry["id"]] = DownloadTask(
+                    url=entry["url"], path=entry["path"], id=entry["id"]
+                )
+
+    def _append(self, entries: Iterable[dict]) -> None:
+        lines = "".join(json.dumps(entry) + "\n" for entry in entries)
+        if lines:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a") as f:
+                f.write(lines)
+
+
+def is_transient(error: BaseException) -> bool:
+    """Whether retrying the download might succeed."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in RETRY_STATUSES
+    return isinstance(error, httpx.TransportError)
+
+
+class DownloadManager:
+    """
+    Downloads many files concurrently, retrying transient failures.
+
+    Example:
+        async def on_progress(event):
+            print(event.status.value, event.task.key, event.stats.bytes_per_second)
+
+        manager = DownloadManager(
+            http_client, manifest=DownloadManifest("out/manifest.jsonl")
+        )
+        report = await manager.run(
+            [DownloadTask(r["url"], f"out/{r['id']}.json", r["id"]) for r in recordings],
+            on_progress=on_progress,
+        )
+        print(report.errors)
+    """
+
+    def __init__(
+        self,
+        http_client: httpx.AsyncClient,
+        max_concurrency: int = 8,
+        max_per_host: int = 4,
+        max_attempts: int = 4,
+        retry_delay: float = 1.0,
+        max_retry_delay: float = 30.0,
+        count_records: bool = False,
+        manifest: Optional[DownloadManifest] = None,
+    ):
+        """
+        Args:
+            http_client: The client to download with.
+            max_concurrency: Most downloads running at once.
+            max_per_host: Most downloads running at once from one host.
+            max_attempts: Attempts at each file before giving up on it.
+            retry_delay: Delay before the first retry; doubled after each one.
+            max_retry_delay: Upper bound on the delay between attempts.
+            count_records: Count and check the JSON records of each file, as
+                ``stream_to_file`` does.
+            manifest: Where to record finished files, and skip those already
+                recorded.
+        """
+        if max_concurrency < 1 or max_per_host < 1 or max_attempts < 1:
+            raise ValueError(
+                "max_concurrency, max_per_host and max_attempts must be at least 1"
+            )
+        self.http_client = http_client
+        self.max_per_host = max_per_host
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.count_records = count_records
+        self.manifest = manifest
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._hosts: dict[str, asyncio.Semaphore] = {}
+
+    async def run(
+        self,
+        tasks: Iterable[DownloadTask],
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> DownloadReport:
+        """Download every task, carrying on past tasks that fail.
+
+        Args:
+            tasks: The files to download.
+            on_progress: Awaited as each task starts, is retried, and finishes.
+                Downloads wait for it, so it should return quickly.
+        """
+        tasks = list(tasks)
+        stats = DownloadStats()
+        report = DownloadReport(results={}, errors={}, stats=stats)
+        if self.manifest is not None:
+            self.manifest.add(tasks)
+
+        async def notify(event: DownloadEvent) -> None:
+            if on_progress is not None:
+                await on_progress(event)
+
+        async def download(task: DownloadTask) -> None:
+            done = self.manifest.completed(task) if self.manifest else None
+            if done is not None:
+                stats.skipped += 1
+                report.results[task.key] = done
+                await notify(
+                    DownloadEvent(task, DownloadStatus.SKIPPED, stats, 0, done)
+                )
+                return
+
+            host = httpx.URL(task.url).host
+            host_slots = self._hosts.setdefault(
+                host, asyncio.Semaphore(self.max_per_host)
+            )
+            Path(task.path).parent.mkdir(parents=True, exist_ok=True)
+            attempt = 1
+            while True:
+                try:
+                    # Host first, so a task waiting on a busy host doesn't hold a
+                    # global slot
+                    async with host_slots, self._slots:
+                        if attempt == 1:
+                            await notify(
+                                DownloadEvent(task, DownloadStatus.STARTED, stats)
+                            )
+                        result = await stream_to_file(
+                            self.http_client, task.url, task.path, self.count_records
+                        )
+                    break
+                except Exception as e:
+                    if attempt >= self.max_attempts or not is_transient(e):
+                        stats.failed += 1
+                        report.errors[task.key] = e
+                        await notify(
+                            DownloadEvent(
+                                task, DownloadStatus.FAILED, stats, attempt, error=e
+                            )
+                        )
+                        return
+                    stats.retries += 1
+                    await notify(
+                        DownloadEvent(
+                            task, DownloadStatus.RETRYING, stats, attempt, error=e
+                        )
+                    )
+                    # Back off without the slots, so other downloads use them
+                    await asyncio.sleep(self._backoff(attempt, e))
+                    attempt += 1
+
+            stats.completed += 1
+            stats.bytes += result.size
+            stats.records += result.records or 0
+            report.results[task.key] = result
+            if self.manifest is not None:
+                self.manifest.record(task, result)
+            await notify(
+                DownloadEvent(task, DownloadStatus.COMPLETED, stats, attempt, result)
+            )
+
+        await asyncio.gather(*(download(task) for task in tasks))
+        return report
+
+    def _backoff(self, attempt: int, error: BaseException) -> float:
+        if isinstance(error, httpx.HTTPStatusError):
+            retry_after = error.response.headers.get("retry-after", "")
+            if retry_after.isdigit():
+                return min(self.max_retry_delay, float(retry_after))
+        delay = min(self.max_retry_delay, self.retry_delay * 2 ** (attempt - 1))
+        # Jitter so downloads failing together don't retry in lockstep
+        return delay * random.uniform(0.5, 1)
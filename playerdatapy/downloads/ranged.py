@@ -0,0 +1,231 @@
+"""
+Resumable downloads of large files in parallel byte ranges.
+
+The file is split into fixed-size chunks fetched with HTTP ``Range`` requests,
+several at a time over the client's pooled connections, and written in place
+into a ``.part`` file preallocated to the full size. A small JSON file next to it
+records the finished chunks, so a download that fails part way resumes from
+where it stopped on the next call instead of starting over.
+
+Servers that don't support ranges, and empty files, are downloaded with
+``stream_to_file``.
+"""
+
+import asyncio
+import json
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Union
+
+import httpx
+
+from ..auth.token_storage import atomic_write_text
+from .stream import DownloadResult, partial_path, stream_to_file
+
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+DEFAULT_CONCURRENCY = 4
+
+_CONTENT_RANGE = re.compile(r"bytes (\d+)-(\d+)/(\d+|\*)")
+
+
+class RangeError(Exception):
+    """The server's response doesn't match the byte range requested."""
+
+
+@dataclass
+class _Progress:
+    size: int
+    chunk_size: int
+    validator: Optional[str]
+    done: set[int]
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["_Progress"]:
+        try:
+            state = json.loads(path.read_text())
+            return cls(
+                size=state["size"],
+                chunk_size=state["chunk_size"],
+                validator=state["validator"],
+                done=set(state["done"]),
+            )
+        except (FileNotFoundError, ValueError, KeyError, TypeError):
+            return None
+
+    def save(self, path: Path) -> None:
+        atomic_write_text(
+            path,
+            json.dumps(
+                {
+                    "size": self.size,
+                    "chunk_size": self.chunk_size,
+                    "validator": self.validator,
+                    "done": sorted(self.done),
+                }
+            ),
+        )
+
+
+def progress_path(path: Path) -> Path:
+    """Where the finished chunks of a download to ``path`` are recorded."""
+    return path.with_name(f"{path.name}.part.json")
+
+
+def _parse_content_range(value: Optional[str]) -> tuple[int, int, Optional[int]]:
+    match = _CONTENT_RANGE.fullmatch(value or "")
+    if match is None:
+        raise RangeError(f"Unexpected Content-Range: {value!r}")
+    first, last, total = match.groups()
+    return int(first), int(last), None if total == "*" else int(total)
+
+
+def _validator(etag: Optional[str], last_modified: Optional[str]) -> Optional[str]:
+    # Weak ETags can't be used with If-Range
+    if etag and not etag.startswith("W/"):
+        return etag
+    return last_modified
+
+
+async def _probe(
+    http_client: httpx.AsyncClient, url: str, headers: dict[str, str]
+) -> tuple[Optional[int], Optional[str], Optional[str]]:
+    """The file's size, ETag and Last-Modified.
+
+    The size is ``None`` if ranges aren't served, or the file is empty: the first
+    byte of an empty file is out of range, so the server answers 416.
+    """
+    async with http_client.stream(
+        "GET", url, headers={**headers, "Range": "bytes=0-0"}
+    ) as response:
+        if response.status_code == 416:
+            return None, None, None
+        response.raise_for_status()
+        if response.status_code != 206:
+            return None, None, None
+        _, _, total = _parse_content_range(response.headers.get("content-range"))
+        return (
+            total,
+            response.headers.get("etag"),
+            response.headers.get("last-modified"),
+        )
+
+
+async def download_ranges(
+    http_client: httpx.AsyncClient,
+    url: str,
+    path: Union[str, Path],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    headers: Optional[dict[str, str]] = None,
+) -> DownloadResult:
+    """Download ``url`` to ``path`` in parallel ranges, resuming a previous attempt.
+
+    Example:
+        http_client = httpx.AsyncClient(limits=httpx.Limits(max_connections=8))
+        await download_ranges(http_client, video_url, "match.mp4", concurrency=8)
+
+    Args:
+        http_client: The client to download with. Its connection limits cap
+            ``concurrency``.
+        url: The file's URL. Signed URLs may be refreshed between attempts; the
+            download resumes as long as the file itself hasn't changed.
+        path: Where to save the file.
+        chunk_size: Bytes fetched by each range request.
+        concurrency: Ranges fetched at once.
+        headers: Extra request headers.
+
+    Raises:
+        httpx.HTTPStatusError: The server responded with an error status.
+        RangeError: The server returned a different range or size than asked
+            for. The chunks finished so far are kept for the next attempt.
+    """
+    if chunk_size < 1 or concurrency < 1:
+        raise ValueError("chunk_size and concurrency must be at least 1")
+    path = Path(path)
+    headers = headers or {}
+    size, etag, last_modified = await _probe(http_client, url, headers)
+    if size is None:
+        return await stream_to_file(http_client, url, path, headers=headers)
+    validator = _validator(etag, last_modified)
+
+    part = partial_path(path)
+    progress_file = progress_path(path)
+    progress = _Progress.load(progress_file)
+    if (
+        progress is None
+        or not part.exists()
+        or (progress.size, progress.chunk_size, progress.validator)
+        != (size, chunk_size, validator)
+    ):
+        # Nothing to resume, or the file changed since
+        progress = _Progress(size, chunk_size, validator, set())
+        with part.open("wb") as f:
+            f.truncate(size)
+        progress.save(progress_file)
+
+    pending: asyncio.Queue[int] = asyncio.Queue()
+    for index in range(-(-size // chunk_size)):
+        if index not in progress.done:
+            pending.put_nowait(index)
+
+    range_headers = dict(headers)
+    if validator is not None:
+        range_headers["If-Range"] = validator
+
+    with part.open("r+b") as f:
+
+        async def fetch(index: int) -> None:
+            start = index * chunk_size
+            end = min(start + chunk_size, size) - 1
+            async with http_client.stream(
+                "GET", url, headers={**range_headers, "Range": f"bytes={start}-{end}"}
+            ) as response:
+                response.raise_for_status()
+                if response.status_code != 206:
+                    raise RangeError("Server ignored the range; the file changed")
+                first, last, total = _parse_content_range(
+                    response.headers.get("content-range")
+                )
+                if (first, last) != (start, end) or total not in (None, size):
+                    raise RangeError(
+                        f"Asked for bytes {start}-{end}/{size}, got "
+                        f"{response.headers.get('content-range')}"
+                    )
+                offset = start
+                async for chunk in response.aiter_bytes():
+                    if offset + len(chunk) > end + 1:
+                        raise RangeError(f"Range {start}-{end} returned too many bytes")
+                    # No await between seek and write, so workers can't interleave
+                    f.seek(offset)
+                    f.write(chunk)
+                    offset += len(chunk)
+            if offset != end + 1:
+                raise RangeError(f"Range {start}-{end} ended at byte {offset}")
+            # On disk before it is recorded, so a crash can't skip the chunk
+            f.flush()
+            os.fsync(f.fileno())
+            progress.done.add(index)
+            progress.save(progress_file)
+
+        async def worker() -> None:
+            while not pending.empty():
+                await fetch(pending.get_nowait())
+
+        workers = [
+            asyncio.create_task(worker())
+            for _ in range(min(concurrency, pending.qsize()))
+        ]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    if part.stat().st_size != size:
+        raise RangeError(f"Downloaded file is {part.stat().st_size} bytes, not {size}")
+    part.replace(path)
+    progress_file.unlink(missing_ok=True)
+    return DownloadResult(path=path, size=size, etag=etag, last_modified=last_modified)
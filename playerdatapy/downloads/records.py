@@ -0,0 +1,240 @@
+"""
+Counting and validating the records of a JSON datafile as it streams past.
+
+Datafiles are either a JSON array of records, or an object holding the array
+under ``"records"`` (ball data). ``RecordCounter`` tracks just enough of the JSON
+structure to count that array's items, without decoding them.
+"""
+
+import re
+from typing import Optional
+
+# Bytes that change the scanner's state outside and inside strings.
+_STRUCTURE = re.compile(rb'["\[\]{},:]')
+_STRING = re.compile(rb'["\\]')
+
+RECORDS_KEY = b"records"
+
+
+class RecordCounter:
+    """Counts the records of a JSON datafile fed to it in chunks.
+
+    Example:
+        counter = RecordCounter()
+        async for chunk in response.aiter_bytes():
+            counter.feed(chunk)
+        counter.close()
+        print(counter.records)
+    """
+
+    def __init__(self):
+        self._stack = bytearray()
+        self._in_string = False
+        self._escaped = False
+        self._key: Optional[bytearray] = None
+        self._current_key: Optional[bytes] = None
+        self._record_depth: Optional[int] = None
+        self._separators = 0
+        self._has_records = False
+        self._started = False
+
+    @property
+    def records(self) -> int:
+        """Records seen so far."""
+        return self._separators + self._has_records
+
+    def feed(self, chunk: bytes) -> None:
+        """Scan the next chunk of the document.
+
+        Raises:
+            ValueError: The document isn't well-formed JSON.
+        """
+        pos = 0
+        if self._escaped and chunk:
+            # The previous chunk ended on a backslash; skip the escaped byte
+            self._capture(chunk, 0, 1)
+            self._escaped = False
+            pos = 1
+
+        while True:
+            pattern = _STRING if self._in_string else _STRUCTURE
+            match = pattern.search(chunk, pos)
+            end = match.start() if match else len(chunk)
+
+            if self._in_string:
+                self._capture(chunk, pos, end)
+            else:
+                self._check_content(chunk, pos, end)
+            if match is None:
+                return
+
+            token = chunk[end]
+            pos = end + 1
+            if self._in_string:
+                if token == ord("\\"):
+                    if pos == len(chunk):
+                        self._escaped = True
+                        return
+                    self._capture(chunk, pos - 1, pos + 1)
+                    pos += 1
+                else:
+                    self._in_string = False
+                continue
+            self._structure(token, end)
+
+    def close(self) -> None:
+        """Check the document ended where it should.
+
+        Raises:
+            ValueError: The document is empty or truncated.
+        """
+        if not self._started or self._stack or self._in_string:
+            raise ValueError("Truncated JSON document")
+
+    def _structure(self, token: int, index: int) -> None:
+        depth = len(self._stack)
+        at_records = depth == self._record_depth
+        if token in b'[{"' and not at_records and depth == 0:
+            if self._started:
+                raise ValueError("Unexpected data after JSON document")
+            self._started = True
+        if at_records and token in b'[{"':
+            self._has_records = True
+
+        if token == ord('"'):
+            self._in_string = True
+            self._key = bytearray() if self._stack == b"{" else None
+        elif token in b"[{":
+            if token == ord("[") and (
+                depth == 0 or (self._stack == b"{" and self._current_key == RECORDS_KEY)
+            ):
+                self._record_depth = depth + 1
+                self._records_started(index)
+            self._stack.append(token)
+        elif token in b"]}":
+            opener = ord("[") if token == ord("]") else ord("{")
+            if not self._stack or self._stack[-1] != opener:
+                raise ValueError("Mismatched brackets in JSON document")
+            self._stack.pop()
+            if at_records:
+                self._record_depth = None
+                self._records_ended(index)
+        elif token == ord(","):
+            if at_records:
+                self._separators += 1
+                self._record_ended(index)
+            if self._stack == b"{":
+                self._current_key = None
+        elif token == ord(":") and self._stack == b"{" and self._key is not None:
+            self._current_key = bytes(self._key)
+
+    # Hooks for subclasses, given the index of the token in the current chunk.
+
+    def _records_started(self, index: int) -> None:
+        pass
+
+    def _record_ended(self, index: int) -> None:
+        pass
+
+    def _records_ended(self, index: int) -> None:
+        pass
+
+    def _check_content(self, chunk: bytes, start: int, end: int) -> None:
+        # Scalars (numbers, true, false, null) don't produce tokens of their own
+        if start == end or not chunk[start:end].strip():
+            return
+        if len(self._stack) == self._record_depth:
+            self._has_records = True
+        elif not self._stack:
+            if self._started:
+                raise ValueError("Unexpected data after JSON document")
+            self._started = True
+
+    def _capture(self, chunk: bytes, start: int, end: int) -> None:
+        if self._key is not None:
+            self._key += chunk[start:end]
+
+
+class RecordBatcher(RecordCounter):
+    """Cuts a JSON datafile fed in chunks into JSON arrays of whole records.
+
+    Only the records not yet handed out are held, so memory stays bounded by
+    ``batch_size`` whatever the size of the file.
+
+    Example:
+        batcher = RecordBatcher(10_000)
+        for chunk in chunks:
+            for batch in batcher.feed(chunk):
+                frame = pl.read_json(batch)
+        for batch in batcher.close():
+            ...
+    """
+
+    def __init__(self, batch_size: int):
+        """
+        Args:
+            batch_size: Records in each batch; the last may have fewer.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        super().__init__()
+        self.batch_size = batch_size
+        self._buffer = bytearray()
+        self._pending = 0
+        self._copy_from: Optional[int] = None
+        self._chunk = b""
+        self._ready: list[bytes] = []
+
+    def feed(self, chunk: bytes) -> list[bytes]:  # type: ignore[override]
+        """Scan the next chunk of the document.
+
+        Returns:
+            The batches completed by this chunk, each a JSON array.
+        """
+        self._chunk = chunk
+        if self._copy_from is not None:
+            self._copy_from = 0
+        super().feed(chunk)
+        if self._copy_from is not None:
+            self._buffer += chunk[self._copy_from :]
+        self._chunk = b""
+        ready, self._ready = self._ready, []
+        return ready
+
+    def close(self) -> list[bytes]:  # type: ignore[override]
+        """Check the document ended where it should.
+
+        Returns:
+            The final batch, if any records are left.
+        """
+        super().close()
+        ready, self._ready = self._ready, []
+        return ready
+
+    def _records_started(self, index: int) -> None:
+        self._copy_from = index + 1
+
+    def _record_ended(self, index: int) -> None:
+        self._take(index)
+        self._pending += 1
+        if self._pending >= self.batch_size:
+            self._emit()
+        else:
+            self._buffer += b","
+        self._copy_from = index + 1
+
+    def _records_ended(self, index: int) -> None:
+        self._take(index)
+        if self._buffer.strip():
+            self._emit()
+        self._buffer = bytearray()
+        self._copy_from = None
+
+    def _take(self, index: int) -> None:
+        assert self._copy_from is not None
+        self._buffer += self._chunk[self._copy_from : index]
+
+    def _emit(self) -> None:
+        self._ready.append(b"[" + bytes(self._buffer) + b"]")
+        self._buffer = bytearray()
+        self._pending = 0
@@ -0,0 +1,120 @@
+"""
+Streaming downloads of datafiles straight to disk.
+
+The response body is written as it arrives, so memory use doesn't grow with the
+file, and the bytes on disk are exactly those served: nothing is decoded and
+re-encoded on the way.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Union
+
+import httpx
+
+from .records import RecordCounter
+
+
+@dataclass
+class DownloadResult:
+    """A file downloaded to disk."""
+
+    path: Path
+    "Where the file was written."
+    size: int
+    "Bytes written."
+    records: Optional[int] = None
+    "Records in the file, if they were counted."
+    etag: Optional[str] = None
+    "The response's ``ETag``, for revalidating the file later."
+    last_modified: Optional[str] = None
+    "The response's ``Last-Modified``, for revalidating the file later."
+    not_modified: bool = False
+    "The server answered a conditional request with 304, so nothing was written."
+
+
+def conditional_headers(
+    etag: Optional[str] = None, last_modified: Optional[str] = None
+) -> dict[str, str]:
+    """Request headers asking for the file only if it changed since it was saved.
+
+    Args:
+        etag: The ``ETag`` the file was saved with.
+        last_modified: The ``Last-Modified`` the file was saved with, used when
+            there is no ``etag``.
+    """
+    if etag is not None:
+        return {"If-None-Match": etag}
+    if last_modified is not None:
+        return {"If-Modified-Since": last_modified}
+    return {}
+
+
+def partial_path(path: Path) -> Path:
+    """Where a download to ``path`` is written until it completes."""
+    return path.with_name(f"{path.name}.part")
+
+
+async def stream_to_file(
+    http_client: httpx.AsyncClient,
+    url: str,
+    path: Union[str, Path],
+    count_records: bool = False,
+    headers: Optional[dict[str, str]] = None,
+) -> DownloadResult:
+    """Download ``url`` to ``path`` without holding the body in memory.
+
+    The body is written to a ``.part`` file next to ``path`` and moved into
+    place once complete, so ``path`` never holds a truncated file.
+
+    Args:
+        http_client: The client to download with.
+        url: The file's URL.
+        path: Where to save the file.
+        count_records: Count the file's JSON records while streaming, which also
+            checks the file is complete, well-formed JSON.
+        headers: Extra request headers, e.g. ``conditional_headers(...)`` to
+            download only if the file changed. A 304 response leaves ``path``
+            untouched and returns a result with ``not_modified`` set.
+
+    Raises:
+        httpx.HTTPStatusError: The server responded with an error status.
+        ValueError: ``count_records`` is set and the body isn't well-formed JSON.
+    """
+    path = Path(path)
+    part = partial_path(path)
+    counter = RecordCounter() if count_records else None
+    size = 0
+    try:
+        async with http_client.stream("GET", url, headers=headers) as response:
+            if response.status_code == httpx.codes.NOT_MODIFIED:
+                return DownloadResult(
+                    path=path,
+                    size=0,
+                    etag=response.headers.get("etag"),
+                    last_modified=response.headers.get("last-modified"),
+                    not_modified=True,
+                )
+            response.raise_for_status()
+            etag = response.headers.get("etag")
+            last_modified = response.headers.get("last-modified")
+            with part.open("wb") as f:
+                async for chunk in response.aiter_bytes():
+                    f.write(chunk)
+                    size += len(chunk)
+                    if counter is not None:
+                        counter.feed(chunk)
+        if counter is not None:
+            counter.close()
+    except BaseException:
+        part.unlink(missing_ok=True)
+        raise
+
+    part.replace(path)
+    return DownloadResult(
+        path=path,
+        size=size,
+        records=counter.records if counter else None,
+        etag=etag,
+        last_modified=last_modified,
+    )
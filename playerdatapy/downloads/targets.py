@@ -0,0 +1,26 @@
+"""
+Choosing the client to download a URL returned by the API with.
+"""
+
+from typing import TYPE_CHECKING
+
+import httpx
+
+if TYPE_CHECKING:
+    from ..playerdata_api import PlayerDataAPI
+
+
+def download_target(
+    api: "PlayerDataAPI", url: str, external: httpx.AsyncClient
+) -> tuple[str, httpx.AsyncClient]:
+    """The URL to download from, and the client to download it with.
+
+    Relative URLs are resolved against the API. URLs outside the API (e.g.
+    presigned storage URLs) are downloaded with ``external``, without the API
+    token, which they don't need and shouldn't see.
+    """
+    api_url = httpx.URL(api.client.url)
+    resolved = api_url.join(url)
+    if resolved.host == api_url.host:
+        return str(resolved), api.http_client
+    return str(resolved), external
@@ -2,10 +2,14 @@
 GraphQL client for the Playerdata API
 """
 
+import asyncio
+import threading
+import time
 from enum import Enum
 from pathlib import Path
-from typing import Optional, Union
-from requests_oauthlib import OAuth2Session  # type: ignore[import-untyped]
+from typing import TYPE_CHECKING, AsyncGenerator, Generator, Optional, Union
+
+import httpx
 from oauthlib.oauth2 import TokenExpiredError  # type: ignore[import-untyped]
 
 from playerdatapy.auth.authorisation_code_flow import AuthorisationCodeFlow
@@ -14,6 +18,14 @@ from playerdatapy.auth.client_credentials_flow import ClientCredentialsFlow
 from playerdatapy.auth.token_storage import default_token_path
 from playerdatapy.constants import API_BASE_URL
 
+if TYPE_CHECKING:
+    # requests is only imported by the authorisation code flows
+    from requests_oauthlib import OAuth2Session  # type: ignore[import-untyped]
+
+
+# Client credential tokens are re-fetched this many seconds before they expire.
+TOKEN_EXPIRY_LEEWAY = 60
+
 
 class AuthenticationType(Enum):
     AUTHORISATION_CODE_FLOW = "authorisation_code_flow"
@@ -24,6 +36,9 @@ class AuthenticationType(Enum):
 class GraphqlAuth:
     """
     Interface for the Playerdata graphql api
+
+    Authentication is deferred until a token is first needed, so constructing an
+    instance never touches the disk or network.
     """
 
     def __init__(
@@ -38,22 +53,53 @@ class GraphqlAuth:
     ):
         self.client_id = client_id
         self.token_file: Path = Path(token_file) if token_file else default_token_path()
-        self.authenticator = None
         self.authentication_type = type
         self.client_secret = client_secret
         self.redirect_uri = redirect_uri
         self.port = port
         self.api_base_url = base_url or API_BASE_URL
-        self.authenticated_session = self._get_authenticated_session()
+        self.authenticator = self._create_authenticator()
+        self._authenticated_session: Optional["OAuth2Session"] = None
+        self._token: Optional[dict] = None
+        self._session_lock = threading.Lock()
+        self._async_session_lock = asyncio.Lock()
 
-    def _get_authenticated_session(self):
+    @property
+    def token(self) -> dict:
+        """The current token, authenticating on first access.
+
+        Client credentials are kept as the token itself and re-fetched once they
+        expire; the other flows take the token from ``authenticated_session``.
+        """
+        if self.authentication_type != AuthenticationType.CLIENT_CREDENTIALS_FLOW:
+            return self.authenticated_session.token
+        if self._token_expired():
+            with self._session_lock:
+                if self._token_expired():
+                    self._token = self._get_client_credentials_token()
+        return self._token
+
+    @property
+    def authenticated_session(self) -> "OAuth2Session":
+        """The authenticated session, created on first access."""
+        if self._authenticated_session is None:
+            with self._session_lock:
+                if self._authenticated_session is None:
+                    self._authenticated_session = self._get_authenticated_session()
+        return self._authenticated_session
+
+    @authenticated_session.setter
+    def authenticated_session(self, session: "OAuth2Session") -> None:
+        self._authenticated_session = session
+
+    def _create_authenticator(self):
         match self.authentication_type:
             case AuthenticationType.AUTHORISATION_CODE_FLOW_PCKE:
-                self.authenticator = AuthorisationCodeFlowPCKE(
+                return AuthorisationCodeFlowPCKE(
                     self.client_id, self.port, self.token_file, self.api_base_url
                 )
             case AuthenticationType.AUTHORISATION_CODE_FLOW:
-                self.authenticator = AuthorisationCodeFlow(
+                return AuthorisationCodeFlow(
                     self.client_id,
                     self.port,
                     self.client_secret,
@@ -61,18 +107,20 @@ class GraphqlAuth:
                     self.api_base_url,
                 )
             case AuthenticationType.CLIENT_CREDENTIALS_FLOW:
-                self.authenticator = ClientCredentialsFlow(
+                return ClientCredentialsFlow(
                     self.client_id,
                     self.client_secret,
                     self.token_file,
                     self.api_base_url,
                 )
 
+    def _get_authenticated_session(self):
+        from requests_oauthlib import OAuth2Session  # type: ignore[import-untyped]
+
         try:
             token = self.authenticator.get_token()
         except TokenExpiredError:
-            self.authenticator.authenticate(self.redirect_uri)
-            token = self.authenticator.get_token()
+            token = self._refresh_token()
 
         return OAuth2Session(
             self.client_id,
@@ -81,5 +129,97 @@ class GraphqlAuth:
             token_updater=self.authenticator.save_token,
         )
 
+    def _get_client_credentials_token(self) -> dict:
+        try:
+            return self.authenticator.get_token(leeway=TOKEN_EXPIRY_LEEWAY)
+        except TokenExpiredError:
+            return self._refresh_token(leeway=TOKEN_EXPIRY_LEEWAY)
+
+    def _refresh_token(self, leeway: float = 0) -> dict:
+        """Authenticate under the token file lock.
+
+        Concurrent processes sharing a token file queue on the lock; whoever gets
+        it first authenticates, the rest find its fresh token and skip the fetch.
+        """
+        with self.authenticator.lock():
+            try:
+                return self.authenticator.get_token(leeway=leeway)
+            except TokenExpiredError:
+                self.authenticator.authenticate(self.redirect_uri)
+                return self.authenticator.get_token()
+
     def _get_authentication_token(self):
-        return self.authenticated_session.token["access_token"]
+        return self.token["access_token"]
+
+    async def _aget_authentication_token(
+        self, http_client: Optional[httpx.AsyncClient] = None
+    ) -> str:
+        """Return the access token, authenticating without blocking the event loop.
+
+        Client credentials are fetched natively with ``http_client`` (sharing its
+        connection pool) and re-fetched once they expire, as that grant issues no
+        refresh token. Interactive flows run in a worker thread.
+        """
+        if self.authentication_type != AuthenticationType.CLIENT_CREDENTIALS_FLOW:
+            if self._authenticated_session is None:
+                return await asyncio.to_thread(self._get_authentication_token)
+            return self._get_authentication_token()
+
+        if self._token_expired():
+            async with self._async_session_lock:
+                if self._token_expired():
+                    self._token = await self._aget_client_credentials_token(http_client)
+        return self._get_authentication_token()
+
+    async def _aget_client_credentials_token(
+        self, http_client: Optional[httpx.AsyncClient]
+    ) -> dict:
+        try:
+            token = self.authenticator.get_token(leeway=TOKEN_EXPIRY_LEEWAY)
+        except TokenExpiredError:
+            async with self.authenticator.alock():
+                try:
+                    token = self.authenticator.get_token(leeway=TOKEN_EXPIRY_LEEWAY)
+                except TokenExpiredError:
+                    await self.authenticator.aauthenticate(http_client)
+                    token = self.authenticator.get_token()
+        return token
+
+    def _token_expired(self) -> bool:
+        if self._token is None:
+            return True
+        expires_at = self._token.get("expires_at")
+        return (
+            expires_at is not None and expires_at - TOKEN_EXPIRY_LEEWAY <= time.time()
+        )
+
+
+class BearerTokenAuth(httpx.Auth):
+    """httpx auth that sends the access token of a ``GraphqlAuth`` as a bearer token.
+
+    The token is looked up per request, so authentication only happens when the
+    first request is sent. Pass the client this auth is attached to as
+    ``http_client`` to fetch client credentials over the same connection pool.
+    """
+
+    def __init__(
+        self,
+        graphql_auth: GraphqlAuth,
+        http_client: Optional[httpx.AsyncClient] = None,
+    ):
+        self.graphql_auth = graphql_auth
+        self.http_client = http_client
+
+    def sync_auth_flow(
+        self, request: httpx.Request
+    ) -> Generator[httpx.Request, httpx.Response, None]:
+        token = self.graphql_auth._get_authentication_token()
+        request.headers["Authorization"] = f"Bearer {token}"
+        yield request
+
+    async def async_auth_flow(
+        self, request: httpx.Request
+    ) -> AsyncGenerator[httpx.Request, httpx.Response]:
+        token = await self.graphql_auth._aget_authentication_token(self.http_client)
+        request.headers["Authorization"] = f"Bearer {token}"
+        yield request
@@ -1,5 +1,6 @@
 # Generated by ariadne-codegen
 
+from collections.abc import AsyncIterator
 from typing import Any
 
 from graphql import (
@@ -107,3 +108,29 @@ class Client(AsyncBaseClient):
             operation_type=OperationType.MUTATION,
             operation_name=operation_name,
         )
+
+    def build_custom_operation(
+        self, *fields: GraphQLField, operation_type: OperationType, operation_name: str
+    ) -> tuple[str, dict[str, Any]]:
+        selections = self._build_selection_set(fields)
+        combined_variables = self._combine_variables(fields)
+        variable_definitions = self._build_variable_definitions(
+            combined_variables["types"]
+        )
+        operation_ast = self._build_operation_ast(
+            selections, operation_type, operation_name, variable_definitions
+        )
+        return print_ast(operation_ast), combined_variables["values"]
+
+    async def subscribe(
+        self, *fields: GraphQLField, operation_name: str
+    ) -> AsyncIterator[dict[str, Any]]:
+        query, variables = self.build_custom_operation(
+            *fields,
+            operation_type=OperationType.SUBSCRIPTION,
+            operation_name=operation_name,
+        )
+        async for data in self.execute_ws(
+            query, operation_name=operation_name, variables=variables
+        ):
+            yield data
@@ -0,0 +1,295 @@
+"""
+Waiting for long-running server-side operations to finish.
+
+Bulk actions, bulk imports, datasets and raw data exports are processed in the
+background after the mutation creating them returns. A ``Job`` describes how to
+read one's current state and, where the API has one, the subscription announcing
+its updates; ``PlayerDataAPI.wait_for`` uses the subscription when it can and
+polls with adaptive backoff otherwise.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Union
+
+from graphql import OperationType
+
+from .base_operation import GraphQLField
+from .custom_fields import (
+    BulkActionFields,
+    BulkAthleteImportFields,
+    BulkStaffImportFields,
+    DatasetFields,
+    RequestRawDataExportPayloadFields,
+    ValidationErrorFields,
+)
+from .custom_mutations import Mutation
+from .custom_queries import Query
+from .custom_subscriptions import (
+    BulkActionSubscriptionPayloadFields,
+    BulkAthleteImportSubscriptionPayloadFields,
+    BulkStaffImportSubscriptionPayloadFields,
+    Subscription,
+)
+from .enums import (
+    BulkOperationStatusEnum,
+    DatasetStatusEnum,
+    RawDataExportFormatEnum,
+    RawDataExportTypeEnum,
+    RawDataStatusEnum,
+)
+from .exceptions import GraphQLClientError
+from .gqlclient import Client
+from .subscriptions import OverflowPolicy, SubscriptionManager
+
+_BULK_OPERATION_DONE = frozenset(
+    {BulkOperationStatusEnum.Succeeded.value, BulkOperationStatusEnum.Failed.value}
+)
+
+RecordPath = tuple[Union[str, int], ...]
+
+
+@dataclass(frozen=True)
+class Job:
+    """A background operation ``PlayerDataAPI.wait_for`` can wait on.
+
+    Build one with the classmethods, e.g. ``Job.bulk_action(id)``.
+    """
+
+    name: str
+    "Identifies the job in operation names and errors."
+    poll: Callable[[], GraphQLField]
+    "Builds the field reading the job's current state."
+    poll_path: RecordPath
+    "Where the job's record is in the ``poll`` result."
+    done_statuses: frozenset[str]
+    "Statuses after which the job won't change again."
+    poll_operation: OperationType = OperationType.QUERY
+    "Whether ``poll`` is a query, or an idempotent mutation."
+    subscription: Optional[Callable[[], GraphQLField]] = None
+    "Builds the subscription announcing the job's updates, if there is one."
+    subscription_path: RecordPath = ()
+    "Where the job's record is in each subscription result."
+
+    @classmethod
+    def bulk_action(cls, id: str) -> "Job":
+        """A ``createBulkAction`` bulk action."""
+        return cls(
+            name="bulkAction",
+            poll=lambda: Query.bulk_action(id=id).fields(*_bulk_action_fields()),
+            poll_path=("bulkAction",),
+            done_statuses=_BULK_OPERATION_DONE,
+            subscription=lambda: Subscription.bulk_action_event(id=id).fields(
+                BulkActionSubscriptionPayloadFields.bulk_action().fields(
+                    *_bulk_action_fields()
+                )
+            ),
+            subscription_path=("bulkActionEvent", "bulkAction"),
+        )
+
+    @classmethod
+    def bulk_athlete_import(cls, id: str) -> "Job":
+        """A ``createBulkAthleteImport`` import."""
+        return cls(
+            name="bulkAthleteImport",
+            poll=lambda: Query.bulk_athlete_import(id=id).fields(
+                *_bulk_import_fields(BulkAthleteImportFields)
+            ),
+            poll_path=("bulkAthleteImport",),
+            done_statuses=_BULK_OPERATION_DONE,
+            subscription=lambda: Subscription.bulk_athlete_import_event(id=id).fields(
+                BulkAthleteImportSubscriptionPayloadFields.bulk_athlete_import().fields(
+                    *_bulk_import_fields(BulkAthleteImportFields)
+                )
+            ),
+            subscription_path=("bulkAthleteImportEvent", "bulkAthleteImport"),
+        )
+
+    @classmethod
+    def bulk_staff_import(cls, id: str) -> "Job":
+        """A ``createBulkStaffImport`` import."""
+        return cls(
+            name="bulkStaffImport",
+            poll=lambda: Query.bulk_staff_import(id=id).fields(
+                *_bulk_import_fields(BulkStaffImportFields)
+            ),
+            poll_path=("bulkStaffImport",),
+            done_statuses=_BULK_OPERATION_DONE,
+            subscription=lambda: Subscription.bulk_staff_import_event(id=id).fields(
+                BulkStaffImportSubscriptionPayloadFields.bulk_staff_import().fields(
+                    *_bulk_import_fields(BulkStaffImportFields)
+                )
+            ),
+            subscription_path=("bulkStaffImportEvent", "bulkStaffImport"),
+        )
+
+    @classmethod
+    def dataset(cls, id: str) -> "Job":
+        """A ``createDataset`` dataset being generated."""
+        return cls(
+            name="dataset",
+            poll=lambda: Query.datasets(ids=[id]).fields(*_dataset_fields()),
+            poll_path=("datasets", 0),
+            done_statuses=frozenset(
+                {DatasetStatusEnum.Completed.value, DatasetStatusEnum.Failed.value}
+            ),
+            subscription=lambda: Subscription.dataset_updated_event(id=id).fields(
+                *_dataset_fields()
+            ),
+            subscription_path=("datasetUpdatedEvent",),
+        )
+
+    @classmethod
+    def raw_data_export(
+        cls,
+        session_participation_id: str,
+        data_type: RawDataExportTypeEnum = RawDataExportTypeEnum.FULL,
+        format: RawDataExportFormatEnum = RawDataExportFormatEnum.JSON,
+    ) -> "Job":
+        """A ``requestRawDataExport`` export.
+
+        There is no subscription for exports; the mutation is idempotent and is
+        called again to poll.
+        """
+        return cls(
+            name="rawDataExport",
+            poll=lambda: Mutation.request_raw_data_export(
+                data_type=data_type,
+                format=format,
+                session_participation_id=session_participation_id,
+            ).fields(
+                RequestRawDataExportPayloadFields.status,
+                RequestRawDataExportPayloadFields.download_url,
+                RequestRawDataExportPayloadFields.errors().fields(
+                    ValidationErrorFields.full_messages, ValidationErrorFields.path
+                ),
+            ),
+            poll_path=("requestRawDataExport",),
+            done_statuses=frozenset(
+                {RawDataStatusEnum.READY.value, RawDataStatusEnum.UNAVAILABLE.value}
+            ),
+            poll_operation=OperationType.MUTATION,
+        )
+
+    def is_done(self, record: dict[str, Any]) -> bool:
+        """Whether ``record`` is in one of the job's final states."""
+        return record.get("status") in self.done_statuses
+
+    def record_from(
+        self, data: dict[str, Any], path: RecordPath
+    ) -> Optional[dict[str, Any]]:
+        """The job's record at ``path`` in a result's ``data``, if it is there."""
+        value: Any = data
+        for key in path:
+            try:
+                value = value[key]
+            except (KeyError, IndexError, TypeError):
+                return None
+        return value
+
+    async def poll_once(self, client: Client) -> dict[str, Any]:
+        """Read the job's current state.
+
+        Raises:
+            GraphQLClientError: The job doesn't exist.
+        """
+        data = await client.execute_custom_operation(
+            self.poll(),
+            operation_type=self.poll_operation,
+            operation_name=f"{self.name}Status",
+        )
+        record = self.record_from(data, self.poll_path)
+        if record is None:
+            raise GraphQLClientError(f"{self.name} not found")
+        return record
+
+
+def _bulk_action_fields() -> list[GraphQLField]:
+    return [
+        BulkActionFields.id,
+        BulkActionFields.status,
+        BulkActionFields.succeeded_count,
+        BulkActionFields.skipped_count,
+        BulkActionFields.error_count,
+    ]
+
+
+def _bulk_import_fields(
+    fields: Union[type[BulkAthleteImportFields], type[BulkStaffImportFields]],
+) -> list[GraphQLField]:
+    return [
+        fields.id,
+        fields.status,
+        fields.created_count,
+        fields.skipped_count,
+        fields.unarchived_count,
+    ]
+
+
+def _dataset_fields() -> list[GraphQLField]:
+    return [DatasetFields.id, DatasetFields.status, DatasetFields.errors]
+
+
+async def poll_until_done(
+    client: Client,
+    job: Job,
+    poll_interval: float = 1.0,
+    max_poll_interval: float = 30.0,
+) -> dict[str, Any]:
+    """Poll ``job`` until it finishes, backing off while its status is unchanged.
+
+    The delay doubles after each poll that sees the same status, up to
+    ``max_poll_interval``, and drops back to ``poll_interval`` when the status
+    moves on.
+
+    Returns:
+        The job's final record.
+    """
+    delay = poll_interval
+    status = None
+    while True:
+        record = await job.poll_once(client)
+        if job.is_done(record):
+            return record
+        if record.get("status") != status:
+            status = record.get("status")
+            delay = poll_interval
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, max_poll_interval)
+
+
+async def wait_with_subscription(
+    client: Client,
+    subscriptions: SubscriptionManager,
+    job: Job,
+    max_poll_interval: float = 30.0,
+) -> Optional[dict[str, Any]]:
+    """Wait for ``job`` to finish from its subscription's updates.
+
+    The job is polled once after subscribing, in case it finished first, and
+    again whenever ``max_poll_interval`` passes without an update, in case one
+    was missed while reconnecting.
+
+    Returns:
+        The job's final record, or ``None`` if the server completed the
+        subscription first.
+    """
+    assert job.subscription is not None
+    stream = await subscriptions.subscribe_fields(
+        job.subscription(),
+        operation_name=f"{job.name}Updates",
+        max_queue=1,
+        overflow=OverflowPolicy.DROP_OLDEST,
+    )
+    async with stream:
+        record = await job.poll_once(client)
+        while not job.is_done(record):
+            try:
+                data = await asyncio.wait_for(anext(stream), max_poll_interval)
+            except StopAsyncIteration:
+                return None
+            except asyncio.TimeoutError:
+                record = await job.poll_once(client)
+                continue
+            record = job.record_from(data, job.subscription_path) or record
+        return record
@@ -0,0 +1,278 @@
+"""
+Live squad state for a session, kept up to date by subscriptions.
+
+``LiveSquad`` holds the latest session metrics of every participation in a
+session as columns, one row per participation. Each
+``athleteSessionMetricsUpdatedEvent`` only rewrites the metrics it carries, so
+snapshots and squad aggregates are cheap to take on every tick without
+requerying the API.
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Any, Callable, Iterable, Optional, Sequence
+
+import polars as pl
+
+from .base_operation import GraphQLField
+from .custom_fields import (
+    ConfiguredMetricsFields,
+    FloatMetricValueFields,
+    GenericMetricFields,
+    IntMetricValueFields,
+    MetricSetMetadataFields,
+    SessionInterface,
+    SessionParticipationInterface,
+)
+from .custom_queries import Query
+from .custom_subscriptions import (
+    AthleteSessionMetricsUpdatedSubscriptionPayloadFields,
+    Subscription,
+)
+from .custom_typing_fields import MetricValueUnionUnion
+from .playerdata_api import PlayerDataAPI
+from .subscriptions import OverflowPolicy, SubscriptionManager, SubscriptionStream
+
+PARTICIPATION_COLUMN = "session_participation_id"
+UPDATED_AT_COLUMN = "updated_at"
+
+# Default and maximum page size of the API.
+_PAGE_SIZE = 30
+
+
+def session_metrics_subscription(
+    participation_id: str, metric_keys: Optional[Sequence[str]] = None
+) -> GraphQLField:
+    """The ``athleteSessionMetricsUpdatedEvent`` selection ``LiveSquad`` applies.
+
+    Args:
+        participation_id: The session participation to follow.
+        metric_keys: Only receive these metrics; all configured metrics if ``None``.
+    """
+    return Subscription.athlete_session_metrics_updated_event(
+        session_participation_id=participation_id,
+        requested_keys=list(metric_keys) if metric_keys is not None else None,
+    ).fields(
+        AthleteSessionMetricsUpdatedSubscriptionPayloadFields.configured_metrics().fields(
+            ConfiguredMetricsFields.data().fields(
+                GenericMetricFields.key,
+                MetricValueUnionUnion("localValue")
+                .on("FloatMetricValue", FloatMetricValueFields.float_value)
+                .on("IntMetricValue", IntMetricValueFields.int_value),
+            ),
+            ConfiguredMetricsFields.metadata().fields(
+                MetricSetMetadataFields.updated_at
+            ),
+        )
+    )
+
+
+def _numeric_value(metric: dict[str, Any]) -> Optional[float]:
+    value = metric.get("localValue") or {}
+    if value.get("floatValue") is not None:
+        return float(value["floatValue"])
+    if value.get("intValue") is not None:
+        return float(value["intValue"])
+    return None
+
+
+class LiveSquad:
+    """
+    Latest session metrics per participation, as columns.
+
+    Rows are fixed at construction, one per participation; a column is added the
+    first time a metric key is seen. Only numeric metrics (``FloatMetricValue``
+    and ``IntMetricValue``) are kept.
+
+    Example:
+        squad = await LiveSquad.for_session(api, session_id, ["distance"])
+        async with api.subscriptions() as subscriptions:
+            task = asyncio.create_task(squad.run(subscriptions))
+            ...
+            print(squad.snapshot())
+            print(squad.aggregate())
+    """
+
+    def __init__(
+        self,
+        participation_ids: Iterable[str],
+        metric_keys: Optional[Sequence[str]] = None,
+    ):
+        """
+        Args:
+            participation_ids: The session participations making up the squad.
+            metric_keys: Only subscribe to these metrics; all configured metrics
+                if ``None``.
+        """
+        self.participation_ids = list(dict.fromkeys(participation_ids))
+        self.metric_keys = metric_keys
+        self.version = 0
+        self._rows = {pid: row for row, pid in enumerate(self.participation_ids)}
+        self._updated_at: list[Optional[datetime]] = [None] * len(self._rows)
+        self._columns: dict[str, list[Optional[float]]] = {}
+        self._snapshot: Optional[pl.DataFrame] = None
+        self._snapshot_version = -1
+
+    @classmethod
+    async def for_session(
+        cls,
+        api: PlayerDataAPI,
+        session_id: str,
+        metric_keys: Optional[Sequence[str]] = None,
+    ) -> "LiveSquad":
+        """Build a squad of every participation in a session.
+
+        Args:
+            api: The API to list the session's participations with.
+            session_id: The session to follow.
+            metric_keys: Only subscribe to these metrics; all if ``None``.
+        """
+        participation_ids: list[str] = []
+        offset = 0
+        while True:
+            response = await api.run_queries(
+                "liveSquadParticipations",
+                Query.session(id=session_id).fields(
+                    SessionInterface.session_participations(
+                        limit=_PAGE_SIZE, offset=offset
+                    ).fields(SessionParticipationInterface.id)
+                ),
+            )
+            page = (response.get("session") or {}).get("sessionParticipations") or []
+            participation_ids += [participation["id"] for participation in page]
+            if len(page) < _PAGE_SIZE:
+                return cls(participation_ids, metric_keys)
+            offset += _PAGE_SIZE
+
+    @property
+    def metrics(self) -> list[str]:
+        """Metric keys seen so far, in the order they were first seen."""
+        return list(self._columns)
+
+    def apply(self, participation_id: str, data: dict[str, Any]) -> bool:
+        """Apply one ``athleteSessionMetricsUpdatedEvent`` result.
+
+        Metrics in the update overwrite the participation's previous values;
+        metrics it doesn't carry keep theirs.
+
+        Args:
+            participation_id: The participation the update was subscribed for.
+            data: The ``data`` of the subscription result.
+
+        Returns:
+            Whether the update was for a participation in the squad.
+        """
+        row = self._rows.get(participation_id)
+        if row is None:
+            return False
+
+        configured = (data.get("athleteSessionMetricsUpdatedEvent") or {}).get(
+            "configuredMetrics"
+        ) or {}
+        for metric in configured.get("data") or []:
+            column = self._columns.get(metric["key"])
+            if column is None:
+                column = self._columns[metric["key"]] = [None] * len(self._rows)
+            column[row] = _numeric_value(metric)
+
+        updated_at = (configured.get("metadata") or {}).get("updatedAt")
+        if updated_at:
+            self._updated_at[row] = datetime.fromisoformat(updated_at)
+
+        self.version += 1
+        return True
+
+    def snapshot(self) -> pl.DataFrame:
+        """The current state, one row per participation and a column per metric.
+
+        The frame is rebuilt at most once per update, however often it is taken.
+        """
+        if self._snapshot_version != self.version:
+            self._snapshot = pl.DataFrame(
+                {
+                    PARTICIPATION_COLUMN: self.participation_ids,
+                    UPDATED_AT_COLUMN: self._updated_at,
+                    **self._columns,
+                },
+                schema={
+                    PARTICIPATION_COLUMN: pl.String,
+                    UPDATED_AT_COLUMN: pl.Datetime("us", "UTC"),
+                    **{key: pl.Float64 for key in self._columns},
+                },
+            )
+            self._snapshot_version = self.version
+        assert self._snapshot is not None
+        return self._snapshot
+
+    def aggregate(self, *exprs: pl.Expr) -> pl.DataFrame:
+        """Squad aggregates over the current state.
+
+        Args:
+            exprs: Expressions to evaluate over the snapshot, e.g.
+                ``pl.col("distance").sum()``. By default, one row per metric with
+                its mean, min, max, sum and the number of participations reporting
+                it.
+        """
+        snapshot = self.snapshot()
+        if exprs:
+            return snapshot.select(*exprs)
+
+        value = pl.col("value")
+        return (
+            snapshot.unpivot(
+                on=self.metrics, index=PARTICIPATION_COLUMN, variable_name="metric"
+            )
+            .group_by("metric", maintain_order=True)
+            .agg(
+                value.mean().alias("mean"),
+                value.min().alias("min"),
+                value.max().alias("max"),
+                value.sum().alias("sum"),
+                value.count().alias("count"),
+            )
+        )
+
+    async def run(
+        self,
+        subscriptions: SubscriptionManager,
+        on_update: Optional[Callable[["LiveSquad", str], Any]] = None,
+    ) -> None:
+        """Subscribe for every participation and apply updates until cancelled.
+
+        Updates only carry the metrics that changed, so none can be dropped;
+        streams wait for the squad rather than skipping ahead.
+
+        Args:
+            subscriptions: The manager to run the subscriptions on.
+            on_update: Called with the squad and participation id after each
+                update is applied.
+        """
+        streams = {
+            participation_id: await subscriptions.subscribe_fields(
+                session_metrics_subscription(participation_id, self.metric_keys),
+                operation_name="liveSquadMetrics",
+                overflow=OverflowPolicy.BLOCK,
+            )
+            for participation_id in self.participation_ids
+        }
+        try:
+            await asyncio.gather(
+                *(
+                    self._consume(participation_id, stream, on_update)
+                    for participation_id, stream in streams.items()
+                )
+            )
+        finally:
+            for stream in streams.values():
+                await stream.aclose()
+
+    async def _consume(
+        self,
+        participation_id: str,
+        stream: SubscriptionStream,
+        on_update: Optional[Callable[["LiveSquad", str], Any]],
+    ) -> None:
+        async for data in stream:
+            self.apply(participation_id, data)
+            if on_update is not None:
+                on_update(self, participation_id)
@@ -1,10 +1,29 @@
+import asyncio
+from collections.abc import AsyncIterator, Iterable
 from pathlib import Path
-from typing import Optional, Union
+from typing import TYPE_CHECKING, Any, Optional, Union
 
-from .gqlauth import GraphqlAuth, AuthenticationType
+import httpx
+
+from .gqlauth import BearerTokenAuth, GraphqlAuth, AuthenticationType
 from .gqlclient import Client
 from .base_operation import GraphQLField
-from playerdatapy.constants import GRAPHQL_URL, graphql_url_for
+from .exceptions import GraphQLClientError
+from .enums import RawDataExportFormatEnum, RawDataExportTypeEnum
+from .jobs import Job, poll_until_done, wait_with_subscription
+from .subscriptions import SubscriptionManager, WebSocketException
+from playerdatapy.constants import (
+    GRAPHQL_URL,
+    GRAPHQL_WS_URL,
+    graphql_url_for,
+    graphql_ws_url_for,
+)
+
+if TYPE_CHECKING:
+    # polars is only imported when raw data is used, to keep imports fast
+    from .raw.export import RawExport
+    from .raw.parse import OutputFormat
+    from .raw.pool import ParsePool
 
 
 class PlayerDataAPI(GraphqlAuth):
@@ -17,6 +36,7 @@ class PlayerDataAPI(GraphqlAuth):
         port: int = 8888,
         authentication_type: AuthenticationType = AuthenticationType.AUTHORISATION_CODE_FLOW,
         base_url: Optional[str] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
     ):
         super().__init__(
             client_id=client_id,
@@ -28,9 +48,162 @@ class PlayerDataAPI(GraphqlAuth):
             base_url=base_url,
         )
         graphql_url = graphql_url_for(base_url) if base_url else GRAPHQL_URL
+        ws_url = graphql_ws_url_for(graphql_url) if base_url else GRAPHQL_WS_URL
+        self.http_client = httpx.AsyncClient(transport=transport)
+        self.http_client.auth = BearerTokenAuth(self, http_client=self.http_client)
         self.client = Client(
-            url=graphql_url,
-            headers={"Authorization": f"Bearer {self._get_authentication_token()}"},
+            url=graphql_url, ws_url=ws_url, http_client=self.http_client
+        )
+
+    async def warm_up(self, connections: int = 1) -> None:
+        """Authenticate and open pooled connections ahead of the first request.
+
+        The token fetch and connection set-up run concurrently. Calling this is
+        optional: without it, both happen on the first query.
+
+        Args:
+            connections: Number of connections to open to the GraphQL endpoint.
+        """
+        await asyncio.gather(
+            self._aget_authentication_token(self.http_client),
+            *(self._open_connection() for _ in range(connections)),
+        )
+
+    async def _open_connection(self) -> None:
+        # Unauthenticated, so it doesn't wait on the token; the status is irrelevant,
+        # the connection is returned to the pool either way.
+        await self.http_client.request("HEAD", self.client.url, auth=None)
+
+    def subscriptions(self, **kwargs) -> SubscriptionManager:
+        """Create a manager running subscriptions over one shared websocket.
+
+        Each connection is authenticated with the current token. Keyword arguments
+        are passed to ``SubscriptionManager``.
+        """
+        return SubscriptionManager(self.client, headers=self._ws_headers, **kwargs)
+
+    async def _ws_headers(self) -> dict[str, str]:
+        token = await self._aget_authentication_token(self.http_client)
+        return {"Authorization": f"Bearer {token}"}
+
+    async def wait_for(
+        self,
+        job: Job,
+        timeout: Optional[float] = None,
+        use_subscription: bool = True,
+        poll_interval: float = 1.0,
+        max_poll_interval: float = 30.0,
+    ) -> dict[str, Any]:
+        """Wait for a bulk action, import, dataset or raw data export to finish.
+
+        Waits on the job's subscription when it has one and the websocket
+        connection can be made; otherwise, or if the subscription fails, polls
+        with a delay that grows while the job's status is unchanged.
+
+        Example:
+            result = await api.run_mutations("createBulkAction", ...)
+            job = Job.bulk_action(result["createBulkAction"]["bulkAction"]["id"])
+            bulk_action = await api.wait_for(job, timeout=600)
+
+        Args:
+            job: The job to wait for, e.g. ``Job.dataset(dataset_id)``.
+            timeout: Seconds to wait before raising ``TimeoutError``, or ``None``
+                to wait indefinitely.
+            use_subscription: Set to ``False`` to always poll.
+            poll_interval: Initial delay between polls.
+            max_poll_interval: Upper bound on the delay between polls, and the
+                longest a subscription waits without an update before polling.
+
+        Returns:
+            The job's final record, including its ``status``.
+        """
+        async with asyncio.timeout(timeout):
+            if use_subscription and job.subscription is not None:
+                try:
+                    async with self.subscriptions(max_reconnect_attempts=3) as manager:
+                        record = await wait_with_subscription(
+                            self.client, manager, job, max_poll_interval
+                        )
+                    if record is not None:
+                        return record
+                except (
+                    GraphQLClientError,
+                    NotImplementedError,
+                    OSError,
+                    WebSocketException,
+                ):
+                    # No websocket connection, or the upgrade was rejected;
+                    # polling still works
+                    pass
+            return await poll_until_done(
+                self.client, job, poll_interval, max_poll_interval
+            )
+
+    def export_raw(
+        self,
+        session_participation_ids: Iterable[str],
+        data_type: RawDataExportTypeEnum = RawDataExportTypeEnum.FULL,
+        format: RawDataExportFormatEnum = RawDataExportFormatEnum.JSON,
+        directory: Union[str, Path] = ".",
+        output: Union["OutputFormat", str] = "parquet",
+        max_downloads: int = 4,
+        max_conversions: int = 2,
+        max_polling: int = 10,
+        timeout: Optional[float] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+        pool: Optional["ParsePool"] = None,
+    ) -> AsyncIterator["RawExport"]:
+        """Export, download and convert the raw data of many participations.
+
+        Exports are requested and polled ``max_polling`` at a time. Each is
+        downloaded as soon as it is ready and converted to Parquet or Arrow IPC
+        while the others are still being prepared, and yielded as it finishes.
+
+        Example:
+            async for export in api.export_raw(participation_ids, directory="raw"):
+                if export.error is None and export.files:
+                    gps = pl.scan_parquet(export.files[SampleType.GPS])
+
+        Args:
+            session_participation_ids: The participations to export.
+            data_type: What to export, e.g. ``RawDataExportTypeEnum.GPS``.
+            format: The format to export in. JSON exports are converted into one
+                typed file per sample type; CSV exports into one file.
+            directory: Where to save downloads, with each participation's
+                converted files in a subdirectory named after it.
+            output: The ``OutputFormat`` to convert to.
+            max_downloads: Most exports downloaded at once.
+            max_conversions: Most exports converted at once, each in a thread,
+                or in ``pool``.
+            max_polling: Most exports polled at once. Each poll is a request, so
+                this keeps polling within the API's rate limit.
+            timeout: Seconds to wait for each export to be ready.
+            http_client: Client for downloads from outside the API, e.g.
+                presigned storage URLs. Those are sent without the API token.
+            pool: Worker processes to convert in, rather than threads, to use
+                more than one core for parsing.
+
+        Yields:
+            Each participation's ``RawExport``, in the order they finish. Failed
+            exports are yielded with their ``error`` set; exports with no data
+            with status ``UNAVAILABLE``.
+        """
+        from .raw.export import export_raw
+        from .raw.parse import OutputFormat
+
+        return export_raw(
+            self,
+            session_participation_ids,
+            data_type,
+            format,
+            directory,
+            OutputFormat(output),
+            max_downloads,
+            max_conversions,
+            max_polling,
+            timeout,
+            http_client,
+            pool,
         )
 
     async def run_queries(self, operation_name: str, *query_objects: GraphQLField):
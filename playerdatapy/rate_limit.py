@@ -0,0 +1,128 @@
+"""
+Client-side pacing for the API rate limits documented in ``docs/limits.md``.
+
+Limiters keep their state in a backend. ``MemoryBackend`` (the default) only
+coordinates the current process; ``FileBackend`` shares budgets between worker
+processes on one host. Anything implementing ``RateLimitBackend`` — e.g. a Redis
+client — can be plugged in to share budgets more widely.
+"""
+
+import asyncio
+import json
+import time
+from collections import deque
+from pathlib import Path
+from typing import Callable, MutableSequence, Optional, Protocol, Union
+
+from .auth.token_storage import atomic_write_text, file_lock
+
+# Published API limits, enforced over a rolling window.
+RATE_LIMIT_WINDOW = 5.0
+PER_IP_LIMIT = 150
+PER_TOKEN_LIMIT = 100
+MAX_IN_FLIGHT = 20
+
+
+class RateLimitBackend(Protocol):
+    """Storage for rolling-window rate limits, shared by every limiter using it."""
+
+    async def acquire(self, key: str, limit: int, period: float) -> float:
+        """Take a slot in ``key``'s window if one is free.
+
+        Returns:
+            ``0`` if a slot was taken, otherwise the seconds until one frees up.
+        """
+        ...
+
+
+def _take_slot(
+    timestamps: MutableSequence[float], limit: int, period: float, now: float
+) -> float:
+    """Sliding-log admission shared by the backends; mutates ``timestamps``."""
+    while timestamps and timestamps[0] <= now - period:
+        del timestamps[0]
+
+    if len(timestamps) < limit:
+        timestamps.append(now)
+        return 0
+    return timestamps[0] + period - now
+
+
+class MemoryBackend:
+    """Rate limit state held in this process."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._windows: dict[str, deque[float]] = {}
+
+    async def acquire(self, key: str, limit: int, period: float) -> float:
+        return self.acquire_nowait(key, limit, period)
+
+    def acquire_nowait(self, key: str, limit: int, period: float) -> float:
+        window = self._windows.setdefault(key, deque())
+        return _take_slot(window, limit, period, self._clock())
+
+
+class FileBackend:
+    """Rate limit state in a lock-protected file, shared by processes on one host.
+
+    Point every worker at the same ``path``; each slot taken by any process
+    counts against the budget of all of them.
+    """
+
+    def __init__(self, path: Union[str, Path], clock: Callable[[], float] = time.time):
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(f"{self.path.name}.lock")
+        self._clock = clock
+
+    async def acquire(self, key: str, limit: int, period: float) -> float:
+        return await asyncio.to_thread(self.acquire_nowait, key, limit, period)
+
+    def acquire_nowait(self, key: str, limit: int, period: float) -> float:
+        with file_lock(self.lock_path):
+            windows = self._read()
+            window = windows.setdefault(key, [])
+            wait = _take_slot(window, limit, period, self._clock())
+            if not wait:
+                atomic_write_text(self.path, json.dumps(windows))
+            return wait
+
+    def _read(self) -> dict[str, list[float]]:
+        try:
+            return json.loads(self.path.read_text() or "{}")
+        except FileNotFoundError:
+            return {}
+        except json.JSONDecodeError:
+            return {}
+
+
+class RateLimiter:
+    """Rolling-window limiter allowing ``limit`` acquisitions every ``period`` seconds.
+
+    Limiters with the same ``key`` and ``backend`` share one budget.
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        period: float = RATE_LIMIT_WINDOW,
+        key: str = "default",
+        backend: Optional[RateLimitBackend] = None,
+    ):
+        self.limit = limit
+        self.period = period
+        self.key = key
+        self.backend = backend or MemoryBackend()
+
+    async def try_acquire(self) -> float:
+        """Take a slot if one is free.
+
+        Returns:
+            ``0`` if a slot was taken, otherwise the seconds until one frees up.
+        """
+        return await self.backend.acquire(self.key, self.limit, self.period)
+
+    async def acquire(self) -> None:
+        """Wait until a slot is free and take it."""
+        while (wait := await self.try_acquire()) > 0:
+            await asyncio.sleep(wait)
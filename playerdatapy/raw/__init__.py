@@ -0,0 +1,43 @@
+"""
+Raw sensor data from participation datafiles, as typed polars frames.
+"""
+
+from .align import Interpolation, align, aligned_column
+from .export import RawExport, convert_export
+from .incremental import SampleBatches, aiter_raw_batches, iter_raw_batches
+from .lake import RawLake, scan
+from .parse import (
+    SAMPLE_COLUMNS,
+    OutputFormat,
+    SampleType,
+    parse_raw,
+    read_raw,
+    sample_schema,
+    split_samples,
+    write_raw,
+)
+from .pool import ParsePool, from_ipc, parse_to_ipc
+
+__all__ = [
+    "Interpolation",
+    "OutputFormat",
+    "ParsePool",
+    "RawExport",
+    "RawLake",
+    "SAMPLE_COLUMNS",
+    "SampleBatches",
+    "SampleType",
+    "aiter_raw_batches",
+    "align",
+    "aligned_column",
+    "convert_export",
+    "from_ipc",
+    "iter_raw_batches",
+    "parse_raw",
+    "parse_to_ipc",
+    "read_raw",
+    "sample_schema",
+    "scan",
+    "split_samples",
+    "write_raw",
+]
@@ -0,0 +1,183 @@
+"""
+Aligning samples of different sensors onto one clock.
+
+GPS, acceleration, orientation and heartbeat samples come at different rates
+and times. ``align`` resamples each onto a common clock, averaging samples that
+fall in the same tick and joining the nearest samples to ticks without one, so
+every sensor's columns can be compared row by row. It is built from polars
+``group_by_dynamic`` and ``join_asof``, so the work is vectorized and lazy.
+"""
+
+from collections.abc import Iterable, Mapping
+from datetime import timedelta
+from enum import Enum
+from typing import Optional, Union
+
+import polars as pl
+
+from .parse import SAMPLE_COLUMNS, SampleType
+
+Duration = Union[str, timedelta]
+Frame = Union[pl.DataFrame, pl.LazyFrame]
+
+
+class Interpolation(str, Enum):
+    """How a sensor's value at a tick is taken from the samples around it."""
+
+    PREVIOUS = "previous"
+    "The last sample at or before the tick."
+    NEAREST = "nearest"
+    "The sample closest to the tick."
+    LINEAR = "linear"
+    """Linear between the samples either side of the tick, for float columns.
+
+    Other columns take the nearest sample. Where only one side is within the
+    tolerance, its sample is used as it is.
+    """
+
+
+def aligned_column(sample_type: SampleType, column: str) -> str:
+    """The name ``align`` gives a sample type's column, e.g. ``gps_speed``."""
+    return f"{sample_type.value.lower()}_{column}"
+
+
+def align(
+    frames: Mapping[SampleType, Frame],
+    every: Duration = "100ms",
+    interpolation: Interpolation = Interpolation.LINEAR,
+    tolerance: Optional[Duration] = "1s",
+    by: Optional[Union[str, Iterable[str]]] = None,
+) -> pl.LazyFrame:
+    """Resample sample frames onto one clock, one column per sensor's column.
+
+    The clock ticks every ``every`` from the first sample to the last, across
+    every type. Samples of a type within one tick are averaged first, so fast
+    sensors are downsampled and slow ones are interpolated.
+
+    Example:
+        frames = {
+            sample_type: lake.scan(club_id, start, end, types=[sample_type])
+            for sample_type in SampleType
+        }
+        aligned = align(frames, by="participation_id").collect()
+        per_participation = aligned.partition_by("participation_id", as_dict=True)
+
+    Args:
+        frames: Frames typed as by ``parse_raw``, by sample type.
+        every: The clock's interval, as a polars duration string or timedelta.
+        interpolation: How values at each tick are taken from samples.
+        tolerance: Furthest a sample can be from a tick to be used for it; ticks
+            without one are null. ``None`` for no limit.
+        by: Columns, such as ``participation_id``, whose groups are aligned
+            separately, each on its own clock.
+
+    Returns:
+        The ``by`` columns and ``time``, then each type's columns named as by
+        ``aligned_column``, sorted by ``by`` and ``time``.
+    """
+    by = [by] if isinstance(by, str) else list(by or [])
+    streams = {
+        sample_type: _resample(sample_type, frame.lazy(), every, by)
+        for sample_type, frame in frames.items()
+    }
+    aligned = _clock(streams.values(), every, by)
+    for sample_type, stream in streams.items():
+        columns = {
+            aligned_column(sample_type, name): dtype
+            for name, dtype in SAMPLE_COLUMNS[sample_type].items()
+        }
+        aligned = _join(aligned, stream, columns, interpolation, tolerance, by)
+    return aligned.sort([*by, "time"])
+
+
+def _resample(
+    sample_type: SampleType, frame: pl.LazyFrame, every: Duration, by: list[str]
+) -> pl.LazyFrame:
+    """Average a type's samples within each tick, renaming its columns."""
+    columns = SAMPLE_COLUMNS[sample_type]
+    values = [
+        (pl.col(name).mean() if dtype.is_float() else pl.col(name).last())
+        .cast(dtype)
+        .alias(aligned_column(sample_type, name))
+        for name, dtype in columns.items()
+    ]
+    return (
+        frame.select(*by, "time", *columns)
+        .sort([*by, "time"])
+        .group_by_dynamic("time", every=every, group_by=by or None)
+        # Keep the samples' mean time, not the tick's, to interpolate from
+        .agg(pl.col("time").mean().alias("_sample_time"), *values)
+        .drop("time")
+        .rename({"_sample_time": "time"})
+    )
+
+
+def _clock(
+    streams: Iterable[pl.LazyFrame], every: Duration, by: list[str]
+) -> pl.LazyFrame:
+    """Ticks every ``every`` from the first sample to the last of each group."""
+    times = pl.concat([stream.select(*by, "time") for stream in streams])
+    ticks = pl.datetime_range(
+        pl.col("time").min().dt.truncate(every),
+        pl.col("time").max(),
+        interval=every,
+    ).alias("time")
+    if not by:
+        return times.select(ticks)
+    return times.group_by(by).agg(ticks).explode("time")
+
+
+def _join(
+    aligned: pl.LazyFrame,
+    stream: pl.LazyFrame,
+    columns: dict[str, pl.DataType],
+    interpolation: Interpolation,
+    tolerance: Optional[Duration],
+    by: list[str],
+) -> pl.LazyFrame:
+    """Join a resampled stream's columns onto the clock."""
+    # Ticks and resampled samples are sorted within each group
+    by_args = {"by": by, "check_sortedness": False} if by else {}
+    if interpolation != Interpolation.LINEAR:
+        strategy = "backward" if interpolation == Interpolation.PREVIOUS else "nearest"
+        return aligned.join_asof(
+            stream,
+            on="time",
+            strategy=strategy,
+            tolerance=tolerance,
+            **by_args,
+        )
+
+    def side(name: str) -> pl.LazyFrame:
+        return stream.select(
+            *by,
+            "time",
+            pl.col("time").alias(f"_{name}"),
+            *(pl.col(column).alias(f"{column}_{name}") for column in columns),
+        )
+
+    joined = aligned.join_asof(
+        side("before"), on="time", strategy="backward", tolerance=tolerance, **by_args
+    ).join_asof(
+        side("after"), on="time", strategy="forward", tolerance=tolerance, **by_args
+    )
+    since = (pl.col("time") - pl.col("_before")).dt.total_milliseconds()
+    until = (pl.col("_after") - pl.col("time")).dt.total_milliseconds()
+    weight = since / (since + until)
+    values = []
+    for column, dtype in columns.items():
+        before, after = pl.col(f"{column}_before"), pl.col(f"{column}_after")
+        if dtype.is_float():
+            value = (
+                pl.when(pl.col("_after") > pl.col("_before"))
+                .then(before + (after - before) * weight)
+                .otherwise(pl.coalesce(before, after))
+            )
+        else:
+            value = (
+                pl.when(pl.col("_after").is_null() | (since <= until))
+                .then(before)
+                .otherwise(after)
+            )
+        values.append(value.cast(dtype).alias(column))
+    return joined.select(*aligned.collect_schema().names(), *values)
@@ -0,0 +1,177 @@
+"""
+Running raw data exports end to end: request, wait, download, convert.
+
+Each participation's export goes through its stages independently, so an export
+that is ready early is downloaded and converted while others are still being
+prepared, and results come out in the order they finish rather than waiting on
+the slowest.
+"""
+
+import asyncio
+import tempfile
+from collections import defaultdict
+from collections.abc import AsyncIterator, Iterable
+from contextlib import AsyncExitStack
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional, Union
+
+import httpx
+import polars as pl
+
+from ..downloads.stream import stream_to_file
+from ..downloads.targets import download_target
+from ..enums import RawDataExportFormatEnum, RawDataExportTypeEnum, RawDataStatusEnum
+from ..jobs import Job
+from .incremental import iter_raw_batches
+from .parse import OutputFormat, SampleType
+
+if TYPE_CHECKING:
+    from ..playerdata_api import PlayerDataAPI
+    from .pool import ParsePool
+
+
+@dataclass
+class RawExport:
+    """One participation's export, as far as it got."""
+
+    session_participation_id: str
+    status: Optional[str] = None
+    "The export's final ``RawDataStatusEnum`` value."
+    record: dict[str, Any] = field(default_factory=dict)
+    "The final ``requestRawDataExport`` payload, including any ``errors``."
+    path: Optional[Path] = None
+    "The downloaded export."
+    files: dict[SampleType, Path] = field(default_factory=dict)
+    "JSON exports converted, one file per sample type."
+    table: Optional[Path] = None
+    "CSV exports converted to one file."
+    error: Optional[BaseException] = None
+    "What stopped the export, if it failed."
+
+
+def convert_export(
+    path: Path,
+    directory: Path,
+    format: RawDataExportFormatEnum,
+    data_type: RawDataExportTypeEnum,
+    output: OutputFormat = OutputFormat.PARQUET,
+) -> tuple[dict[SampleType, Path], Optional[Path]]:
+    """Convert a downloaded export to Parquet or Arrow IPC in ``directory``.
+
+    JSON exports are parsed in batches with ``iter_raw_batches`` and written one
+    file per sample type, named as by ``write_raw``. CSV exports are converted as
+    they are to one file named after ``data_type``. Either way the export is
+    streamed, so memory use doesn't grow with its size.
+
+    Returns:
+        The files per sample type for JSON, or the one file for CSV.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    if format == RawDataExportFormatEnum.JSON:
+        return _convert_json(path, directory, output), None
+    table = directory / f"{data_type.value.lower()}.{output.value}"
+    _sink(pl.scan_csv(path), table, output)
+    return {}, table
+
+
+def _convert_json(
+    path: Path, directory: Path, output: OutputFormat
+) -> dict[SampleType, Path]:
+    # Batches are spilled to IPC files and then streamed into one file per type
+    with tempfile.TemporaryDirectory(dir=directory, prefix=".batches-") as tmp:
+        batches: dict[SampleType, list[Path]] = defaultdict(list)
+        for sample_type, batch in iter_raw_batches(path):
+            spilled = Path(tmp) / f"{sample_type.value}-{len(batches[sample_type])}"
+            batch.write_ipc(spilled)
+            batches[sample_type].append(spilled)
+        written = {}
+        for sample_type, files in batches.items():
+            table = directory / f"{sample_type.value.lower()}.{output.value}"
+            _sink(pl.scan_ipc(files), table, output)
+            written[sample_type] = table
+        return written
+
+
+def _sink(frame: pl.LazyFrame, path: Path, output: OutputFormat) -> None:
+    if output == OutputFormat.PARQUET:
+        frame.sink_parquet(path, statistics=True)
+    else:
+        frame.sink_ipc(path)
+
+
+async def export_raw(
+    api: "PlayerDataAPI",
+    session_participation_ids: Iterable[str],
+    data_type: RawDataExportTypeEnum,
+    format: RawDataExportFormatEnum,
+    directory: Union[str, Path],
+    output: OutputFormat,
+    max_downloads: int,
+    max_conversions: int,
+    max_polling: int,
+    timeout: Optional[float],
+    http_client: Optional[httpx.AsyncClient] = None,
+    pool: Optional["ParsePool"] = None,
+) -> AsyncIterator[RawExport]:
+    """The pipeline behind ``PlayerDataAPI.export_raw``."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    polling = asyncio.Semaphore(max_polling)
+    downloads = asyncio.Semaphore(max_downloads)
+    conversions = asyncio.Semaphore(max_conversions)
+    extension = format.value.lower()
+
+    async with AsyncExitStack() as stack:
+        external = http_client or await stack.enter_async_context(
+            httpx.AsyncClient(timeout=60.0)
+        )
+
+        async def convert(*args):
+            if pool is not None:
+                return await pool.run(convert_export, *args)
+            return await asyncio.to_thread(convert_export, *args)
+
+        async def run(session_participation_id: str) -> RawExport:
+            export = RawExport(session_participation_id)
+            try:
+                # Each export is polled, so only so many at once fit the rate limit
+                async with polling:
+                    export.record = await api.wait_for(
+                        Job.raw_data_export(
+                            session_participation_id, data_type, format
+                        ),
+                        timeout=timeout,
+                    )
+                export.status = export.record.get("status")
+                if export.status != RawDataStatusEnum.READY.value:
+                    return export
+
+                path = directory / f"{session_participation_id}.{extension}"
+                url, client = download_target(
+                    api, export.record["downloadUrl"], external
+                )
+                async with downloads:
+                    await stream_to_file(client, url, path)
+                export.path = path
+
+                async with conversions:
+                    export.files, export.table = await convert(
+                        path,
+                        directory / session_participation_id,
+                        format,
+                        data_type,
+                        output,
+                    )
+            except Exception as e:
+                export.error = e
+            return export
+
+        tasks = [asyncio.create_task(run(id)) for id in session_participation_ids]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield await finished
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,146 @@
+"""
+Parsing raw datafiles incrementally, in fixed-size batches per sample type.
+
+Long sessions hold millions of samples. Rather than decoding the whole file, the
+byte stream is cut into runs of whole records (``RecordBatcher``), each run is
+parsed with ``read_raw``, and the samples are regrouped into batches of
+``batch_size`` rows per sample type. Peak memory depends on ``batch_size``, not
+on the length of the session.
+"""
+
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
+from pathlib import Path
+from typing import IO, Union
+
+import polars as pl
+
+from ..downloads.records import RecordBatcher
+from .parse import SAMPLE_COLUMNS, SampleType, read_raw, split_samples
+
+DEFAULT_BATCH_SIZE = 100_000
+CHUNK_SIZE = 1 << 20
+
+RawStream = Union[str, Path, IO[bytes], Iterable[bytes]]
+
+
+class SampleBatches:
+    """Regroups parsed samples into frames of exactly ``batch_size`` rows per type.
+
+    Batches of each type are handed out in the order their samples were added.
+    """
+
+    def __init__(self, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.batch_size = batch_size
+        self._pending: dict[SampleType, list[pl.DataFrame]] = {
+            sample_type: [] for sample_type in SAMPLE_COLUMNS
+        }
+        self._rows = dict.fromkeys(SAMPLE_COLUMNS, 0)
+
+    def add(
+        self, frames: dict[SampleType, pl.DataFrame]
+    ) -> list[tuple[SampleType, pl.DataFrame]]:
+        """Add frames from ``split_samples``.
+
+        Returns:
+            The batches now full.
+        """
+        full = []
+        for sample_type, frame in frames.items():
+            if frame.is_empty():
+                continue
+            self._pending[sample_type].append(frame)
+            self._rows[sample_type] += frame.height
+            while self._rows[sample_type] >= self.batch_size:
+                full.append((sample_type, self._take(sample_type, self.batch_size)))
+        return full
+
+    def flush(self) -> list[tuple[SampleType, pl.DataFrame]]:
+        """The remaining, partly filled batches."""
+        return [
+            (sample_type, self._take(sample_type, rows))
+            for sample_type, rows in self._rows.items()
+            if rows
+        ]
+
+    def _take(self, sample_type: SampleType, rows: int) -> pl.DataFrame:
+        pending = pl.concat(self._pending[sample_type], rechunk=True)
+        self._pending[sample_type] = (
+            [pending.slice(rows)] if pending.height > rows else []
+        )
+        self._rows[sample_type] -= rows
+        return pending.head(rows)
+
+
+def _parse(batch: bytes) -> dict[SampleType, pl.DataFrame]:
+    return split_samples(read_raw(batch))
+
+
+def _chunks(source: RawStream, chunk_size: int) -> Iterator[bytes]:
+    if isinstance(source, (str, Path)):
+        with open(source, "rb") as f:
+            yield from iter(lambda: f.read(chunk_size), b"")
+    elif hasattr(source, "read"):
+        yield from iter(lambda: source.read(chunk_size), b"")  # type: ignore[union-attr]
+    else:
+        yield from source  # type: ignore[misc]
+
+
+def iter_raw_batches(
+    source: RawStream,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[tuple[SampleType, pl.DataFrame]]:
+    """Parse a raw datafile in batches of ``batch_size`` rows per sample type.
+
+    Example:
+        for sample_type, batch in iter_raw_batches("participation.json"):
+            writer[sample_type].write(batch)
+
+    Args:
+        source: A path to the JSON file, a binary file object, or an iterable of
+            byte chunks, e.g. ``response.iter_bytes()``.
+        batch_size: Rows in each batch; the last of each type may have fewer.
+        chunk_size: Bytes read at a time from a path or file object.
+
+    Yields:
+        ``(sample_type, frame)`` pairs, with frames typed as by ``parse_raw``.
+        Batches are in the order of the file, sorted by ``time`` within each.
+
+    Raises:
+        ValueError: The file is truncated or isn't well-formed JSON.
+    """
+    records = RecordBatcher(batch_size)
+    samples = SampleBatches(batch_size)
+    for chunk in _chunks(source, chunk_size):
+        for batch in records.feed(chunk):
+            yield from samples.add(_parse(batch))
+    for batch in records.close():
+        yield from samples.add(_parse(batch))
+    yield from samples.flush()
+
+
+async def aiter_raw_batches(
+    chunks: AsyncIterable[bytes], batch_size: int = DEFAULT_BATCH_SIZE
+) -> AsyncIterator[tuple[SampleType, pl.DataFrame]]:
+    """Parse a raw datafile as it downloads, like ``iter_raw_batches``.
+
+    Example:
+        async with http_client.stream("GET", url) as response:
+            async for sample_type, batch in aiter_raw_batches(response.aiter_bytes()):
+                ...
+
+    Args:
+        chunks: The file's bytes, e.g. ``response.aiter_bytes()``.
+        batch_size: Rows in each batch; the last of each type may have fewer.
+    """
+    records = RecordBatcher(batch_size)
+    samples = SampleBatches(batch_size)
+    async for chunk in chunks:
+        for batch in records.feed(chunk):
+            for item in samples.add(_parse(batch)):
+                yield item
+    for batch in records.close():
+        for item in samples.add(_parse(batch)):
+            yield item
+    for item in samples.flush():
+        yield item
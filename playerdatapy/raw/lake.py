@@ -0,0 +1,287 @@
+"""
+A local, hive-partitioned Parquet dataset of raw sensor samples.
+
+Samples are stored under ``club_id=…/date=…/participation_id=…/type=…/``, one
+Parquet file per batch written. Rows are sorted by ``time`` and every row group
+carries statistics, so a scan filtering on club, date, participation or type
+only opens the matching directories, and a time-window filter skips row groups
+outside the window. ``scan`` reads it back lazily, so queries over a season of
+participations run out of core.
+"""
+
+import os
+import shutil
+import uuid
+from collections.abc import Iterable
+from datetime import date, datetime, time, timezone
+from pathlib import Path
+from typing import Optional, Union
+
+import polars as pl
+
+from ..auth.token_storage import user_data_dir
+from .incremental import DEFAULT_BATCH_SIZE, RawStream, iter_raw_batches
+from .parse import SampleType, sample_schema
+
+DEFAULT_ROW_GROUP_SIZE = 64_000
+
+# Types of the columns taken from the partition directories.
+PARTITION_SCHEMA: dict[str, pl.DataType] = {
+    "club_id": pl.String(),
+    "date": pl.Date(),
+    "participation_id": pl.String(),
+    "type": pl.String(),
+}
+
+Instant = Union[date, datetime]
+
+
+def default_lake_root() -> Path:
+    """Where ``RawLake`` keeps its dataset unless told otherwise."""
+    return user_data_dir() / "raw"
+
+
+class RawLake:
+    """
+    Writes parsed samples into a hive-partitioned Parquet dataset.
+
+    Example:
+        lake = RawLake()
+        lake.write_datafile(club_id, participation_id, "participation.json")
+        gps = lake.scan(club_id, types=[SampleType.GPS])
+    """
+
+    def __init__(
+        self,
+        root: Optional[Union[str, Path]] = None,
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+        compression: str = "zstd",
+    ):
+        """
+        Args:
+            root: Directory holding the dataset. Defaults to ``raw`` in the
+                per-user data directory.
+            row_group_size: Rows in each Parquet row group. Smaller groups let
+                time filters skip more precisely, at some cost in file size.
+            compression: Parquet compression codec.
+        """
+        self.root = Path(root) if root is not None else default_lake_root()
+        self.row_group_size = row_group_size
+        self.compression = compression
+
+    def partition(
+        self,
+        club_id: str,
+        day: date,
+        participation_id: str,
+        sample_type: SampleType,
+    ) -> Path:
+        """The directory holding one participation's samples of a type on ``day``."""
+        return (
+            self.root
+            / f"club_id={club_id}"
+            / f"date={day.isoformat()}"
+            / f"participation_id={participation_id}"
+            / f"type={sample_type.value}"
+        )
+
+    def append(
+        self,
+        club_id: str,
+        participation_id: str,
+        sample_type: SampleType,
+        frame: pl.DataFrame,
+    ) -> list[Path]:
+        """Add a batch of one participation's samples of one type.
+
+        The batch is split by UTC date and sorted by ``time``. Each part is
+        written to a new file, moved into place once complete so scans never
+        see a partial file.
+
+        Args:
+            frame: Samples typed as by ``parse_raw``.
+
+        Returns:
+            The files written.
+        """
+        if frame.is_empty():
+            return []
+        written = []
+        days = frame.with_columns(pl.col("time").dt.date().alias("date"))
+        for (day,), part in days.partition_by(
+            "date", as_dict=True, include_key=False
+        ).items():
+            directory = self.partition(club_id, day, participation_id, sample_type)
+            directory.mkdir(parents=True, exist_ok=True)
+            name = f"part-{uuid.uuid4().hex}.parquet"
+            tmp = directory / f".{name}.tmp"
+            try:
+                part.sort("time").write_parquet(
+                    tmp,
+                    compression=self.compression,
+                    statistics=True,
+                    row_group_size=self.row_group_size,
+                )
+                os.replace(tmp, directory / name)
+            except BaseException:
+                tmp.unlink(missing_ok=True)
+                raise
+            written.append(directory / name)
+        return written
+
+    def write(
+        self,
+        club_id: str,
+        participation_id: str,
+        batches: Union[
+            dict[SampleType, pl.DataFrame], Iterable[tuple[SampleType, pl.DataFrame]]
+        ],
+        replace: bool = True,
+    ) -> list[Path]:
+        """Write a participation's samples.
+
+        Args:
+            batches: Frames from ``parse_raw``, or ``(sample_type, frame)`` batches
+                from ``iter_raw_batches``.
+            replace: Remove the participation's existing samples first, so
+                writing it again doesn't duplicate them.
+
+        Returns:
+            The files written.
+        """
+        if replace:
+            self.remove(club_id, participation_id)
+        if isinstance(batches, dict):
+            batches = batches.items()
+        written = []
+        for sample_type, frame in batches:
+            written += self.append(club_id, participation_id, sample_type, frame)
+        return written
+
+    def write_datafile(
+        self,
+        club_id: str,
+        participation_id: str,
+        source: RawStream,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        replace: bool = True,
+    ) -> list[Path]:
+        """Parse a raw datafile in batches straight into the dataset.
+
+        Args:
+            source: Anything ``iter_raw_batches`` reads.
+            batch_size: Rows parsed and written at a time per sample type.
+            replace: Remove the participation's existing samples first.
+        """
+        return self.write(
+            club_id,
+            participation_id,
+            iter_raw_batches(source, batch_size),
+            replace=replace,
+        )
+
+    def remove(self, club_id: str, participation_id: str) -> None:
+        """Remove a participation's samples from the dataset."""
+        for directory in (self.root / f"club_id={club_id}").glob(
+            f"date=*/participation_id={participation_id}"
+        ):
+            shutil.rmtree(directory)
+
+    def scan(
+        self,
+        club_id: str,
+        start: Optional[Instant] = None,
+        end: Optional[Instant] = None,
+        types: Optional[Iterable[SampleType]] = None,
+        participation_ids: Optional[Iterable[str]] = None,
+    ) -> pl.LazyFrame:
+        """Lazily scan a club's samples, as by the module level ``scan``."""
+        types = list(types) if types is not None else list(SampleType)
+        start, end = _utc(start), _utc(end)
+        first_day = start.date() if start is not None else None
+        last_day = end.date() if end is not None else None
+        wanted = set(participation_ids) if participation_ids is not None else None
+
+        # Pick out the files by their directories up front, rather than listing
+        # every file of the club for polars to prune.
+        files: dict[SampleType, list[Path]] = {sample_type: [] for sample_type in types}
+        for day_dir in sorted((self.root / f"club_id={club_id}").glob("date=*")):
+            day = date.fromisoformat(day_dir.name.removeprefix("date="))
+            if (first_day and day < first_day) or (last_day and day > last_day):
+                continue
+            for participation_dir in sorted(day_dir.glob("participation_id=*")):
+                participation_id = participation_dir.name.split("=", 1)[1]
+                if wanted is not None and participation_id not in wanted:
+                    continue
+                for sample_type in types:
+                    type_dir = participation_dir / f"type={sample_type.value}"
+                    files[sample_type] += sorted(type_dir.glob("*.parquet"))
+
+        frames = [
+            _scan_type(sample_type, paths) for sample_type, paths in files.items()
+        ]
+        frame = frames[0] if len(frames) == 1 else pl.concat(frames, how="diagonal")
+        if start is not None:
+            frame = frame.filter(pl.col("time") >= start)
+        if end is not None:
+            frame = frame.filter(pl.col("time") < end)
+        return frame
+
+
+def scan(
+    club_id: str,
+    start: Optional[Instant] = None,
+    end: Optional[Instant] = None,
+    types: Optional[Iterable[SampleType]] = None,
+    participation_ids: Optional[Iterable[str]] = None,
+    root: Optional[Union[str, Path]] = None,
+) -> pl.LazyFrame:
+    """Lazily scan a club's samples in the local dataset written by ``RawLake``.
+
+    Nothing is read until the frame is collected. Only the files in the date
+    range, participations and types asked for are opened; filters on ``time``
+    skip row groups outside the range, and only the columns selected are read.
+    Collect with the streaming engine to run queries larger than memory.
+
+    Example:
+        top_speeds = (
+            scan(club_id, date(2025, 7, 1), date(2026, 6, 1), types=[SampleType.GPS])
+            .group_by("participation_id")
+            .agg(pl.col("speed").max())
+            .collect(engine="streaming")
+        )
+
+    Args:
+        club_id: The club whose samples to scan.
+        start: Earliest sample time, inclusive. Dates are midnight UTC, and
+            datetimes without a timezone are taken as UTC.
+        end: Latest sample time, exclusive.
+        types: Sample types to scan. Defaults to all of them.
+        participation_ids: Participations to scan. Defaults to all of them.
+        root: The dataset's directory. Defaults to that of ``RawLake``.
+
+    Returns:
+        The samples' columns, with ``club_id``, ``date``, ``participation_id``
+        and ``type`` from the partitions. Columns of more than one type are
+        combined, null in the other types' rows.
+    """
+    return RawLake(root).scan(club_id, start, end, types, participation_ids)
+
+
+def _scan_type(sample_type: SampleType, files: list[Path]) -> pl.LazyFrame:
+    schema = sample_schema(sample_type)
+    if not files:
+        return pl.LazyFrame(schema={**schema, **PARTITION_SCHEMA})
+    return pl.scan_parquet(
+        files, schema=schema, hive_partitioning=True, hive_schema=PARTITION_SCHEMA
+    )
+
+
+def _utc(value: Optional[Instant]) -> Optional[datetime]:
+    if value is None:
+        return None
+    if not isinstance(value, datetime):
+        value = datetime.combine(value, time())
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
@@ -0,0 +1,154 @@
+"""
+Parsing raw participation datafiles into typed polars frames.
+
+A datafile (``EdgeDataFileFields.url(format=json)``) is a JSON array of samples
+from every sensor, told apart by their ``type``. It is parsed once into a single
+frame and split by ``type`` in one pass, rather than once per sensor.
+"""
+
+import io
+from enum import Enum
+from pathlib import Path
+from typing import IO, Any, Union
+
+import polars as pl
+
+
+class SampleType(str, Enum):
+    """The sensor sample types in a raw datafile."""
+
+    GPS = "GPS"
+    ACCELERATION = "ACCELERATION"
+    DEVICE_ORIENTATION = "DEVICE_ORIENTATION"
+    HEARTBEAT = "HEARTBEAT"
+
+
+class OutputFormat(str, Enum):
+    """File formats parsed samples can be written in."""
+
+    PARQUET = "parquet"
+    IPC = "ipc"
+    "Arrow IPC (Feather v2)."
+
+
+# Columns of each sample type besides ``time``, with the types they are kept as.
+SAMPLE_COLUMNS: dict[SampleType, dict[str, pl.DataType]] = {
+    SampleType.GPS: {
+        "latitude": pl.Float32(),
+        "longitude": pl.Float32(),
+        "speed": pl.Float32(),
+        "satellites": pl.UInt8(),
+    },
+    SampleType.ACCELERATION: {
+        "x": pl.Float32(),
+        "y": pl.Float32(),
+        "z": pl.Float32(),
+    },
+    SampleType.DEVICE_ORIENTATION: {
+        "x": pl.Float32(),
+        "y": pl.Float32(),
+        "z": pl.Float32(),
+        "w": pl.Float32(),
+    },
+    SampleType.HEARTBEAT: {"rtor_ms": pl.Float32()},
+}
+
+TIME_TYPE = pl.Datetime("ms", "UTC")
+
+# Every column of every sample type, as read from JSON.
+RAW_SCHEMA: dict[str, pl.DataType] = {"time": pl.Int64(), "type": pl.String()}
+for _columns in SAMPLE_COLUMNS.values():
+    RAW_SCHEMA.update(
+        {
+            name: pl.Int64() if dtype.is_integer() else pl.Float64()
+            for name, dtype in _columns.items()
+        }
+    )
+
+RawSource = Union[str, Path, bytes, IO[bytes], list[dict[str, Any]]]
+
+
+def sample_schema(sample_type: SampleType) -> dict[str, pl.DataType]:
+    """The schema of the frame ``parse_raw`` returns for ``sample_type``."""
+    return {"time": TIME_TYPE, **SAMPLE_COLUMNS[sample_type]}
+
+
+def read_raw(source: RawSource) -> pl.DataFrame:
+    """Read a raw datafile into one frame of every sample, still mixed by ``type``.
+
+    Args:
+        source: A path to the JSON file, its contents, a binary file object, or
+            the already decoded list of samples.
+    """
+    if isinstance(source, list):
+        return pl.DataFrame(source, schema=RAW_SCHEMA)
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    return pl.read_json(source, schema=RAW_SCHEMA)
+
+
+def split_samples(frame: pl.DataFrame) -> dict[SampleType, pl.DataFrame]:
+    """Split a frame from ``read_raw`` into one typed frame per sample type.
+
+    Every sample type gets a frame, empty if the datafile had none of its samples.
+    Frames are sorted by ``time``; unknown sample types are dropped.
+    """
+    partitions = frame.sort("time").partition_by(
+        "type", as_dict=True, include_key=False
+    )
+    frames = {}
+    for sample_type, columns in SAMPLE_COLUMNS.items():
+        partition = partitions.get((sample_type.value,))
+        if partition is None:
+            frames[sample_type] = pl.DataFrame(schema=sample_schema(sample_type))
+            continue
+        frames[sample_type] = partition.select(
+            pl.col("time").cast(pl.Datetime("ms")).dt.replace_time_zone("UTC"),
+            *(pl.col(name).cast(dtype) for name, dtype in columns.items()),
+        )
+    return frames
+
+
+def parse_raw(source: RawSource) -> dict[SampleType, pl.DataFrame]:
+    """Parse a raw datafile into one typed frame per sample type.
+
+    Example:
+        frames = parse_raw(response.content)
+        gps = frames[SampleType.GPS]
+
+    Args:
+        source: A path to the JSON file, its contents, a binary file object, or
+            the already decoded list of samples.
+
+    Returns:
+        A frame for every ``SampleType``, sorted by ``time``.
+    """
+    return split_samples(read_raw(source))
+
+
+def write_raw(
+    frames: dict[SampleType, pl.DataFrame],
+    directory: Union[str, Path],
+    format: OutputFormat = OutputFormat.PARQUET,
+) -> dict[SampleType, Path]:
+    """Write parsed frames to ``directory``, one file per sample type.
+
+    Files are named after the sample type, e.g. ``gps.parquet``; empty frames are
+    skipped.
+
+    Returns:
+        The path written for each sample type.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    written = {}
+    for sample_type, frame in frames.items():
+        if frame.is_empty():
+            continue
+        path = directory / f"{sample_type.value.lower()}.{format.value}"
+        if format == OutputFormat.PARQUET:
+            frame.write_parquet(path, statistics=True)
+        else:
+            frame.write_ipc(path)
+        written[sample_type] = path
+    return written
@@ -0,0 +1,106 @@
+"""
+Parsing and converting raw datafiles in worker processes.
+
+Parsing JSON is CPU-bound, and in one process a backfill parses one file at a
+time however many cores there are. ``ParsePool`` runs parsing and conversion in
+a process pool instead, fed straight from async downloads: at most
+``max_pending`` files wait for a worker, so downloads that get ahead of parsing
+are held back rather than piling up. Parsed frames come back as Arrow IPC
+buffers, which cost a copy to send rather than pickling every column.
+"""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Optional, TypeVar, Union
+
+import polars as pl
+
+from .parse import SampleType, parse_raw
+
+T = TypeVar("T")
+
+
+def parse_to_ipc(source: Union[str, Path, bytes]) -> dict[str, bytes]:
+    """Parse a raw datafile as ``parse_raw`` does, into Arrow IPC buffers.
+
+    Run in the workers of ``ParsePool``; ``from_ipc`` reads the result back.
+
+    Returns:
+        An IPC stream of each sample type's frame, by ``SampleType`` value.
+    """
+    return {
+        sample_type.value: frame.write_ipc(None).getvalue()
+        for sample_type, frame in parse_raw(source).items()
+    }
+
+
+def from_ipc(buffers: dict[str, bytes]) -> dict[SampleType, pl.DataFrame]:
+    """Read the frames ``parse_to_ipc`` wrote."""
+    return {
+        SampleType(sample_type): pl.read_ipc(buffer)
+        for sample_type, buffer in buffers.items()
+    }
+
+
+class ParsePool:
+    """
+    A process pool for parsing and converting raw datafiles from async code.
+
+    Example:
+        with ParsePool() as pool:
+            async for export in api.export_raw(participation_ids, pool=pool):
+                ...
+
+            frames = await pool.parse("participation.json")
+            await pool.run(lake.write_datafile, club_id, participation_id, path)
+    """
+
+    def __init__(
+        self, max_workers: Optional[int] = None, max_pending: Optional[int] = None
+    ):
+        """
+        Args:
+            max_workers: Worker processes. Defaults to the number of CPUs.
+            max_pending: Most calls submitted to the pool at once, running or
+                waiting for a worker. Defaults to twice ``max_workers``, enough
+                to keep the workers busy. Callers past it wait their turn.
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        # Forking a process with polars' thread pool running can deadlock
+        self._executor = ProcessPoolExecutor(
+            self.max_workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        self._pending = asyncio.Semaphore(max_pending or 2 * self.max_workers)
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        """Call ``fn(*args)`` in a worker, waiting for room in the pool first.
+
+        ``fn``, its arguments and its result must be picklable; pass paths rather
+        than data where possible.
+        """
+        async with self._pending:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, fn, *args)
+
+    async def parse(
+        self, source: Union[str, Path, bytes]
+    ) -> dict[SampleType, pl.DataFrame]:
+        """Parse a raw datafile in a worker, as ``parse_raw`` does.
+
+        Args:
+            source: A path to the JSON file, or its contents.
+        """
+        return from_ipc(await self.run(parse_to_ipc, source))
+
+    def close(self) -> None:
+        """Shut the workers down, after the calls already submitted finish."""
+        self._executor.shutdown()
+
+    def __enter__(self) -> "ParsePool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
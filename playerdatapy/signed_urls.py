@@ -0,0 +1,236 @@
+"""
+Reusing signed URLs until they expire, and fetching them in batches.
+
+Signed URLs stay valid until their ``expiresAt``, so fetching one for every
+download wastes a request. ``SignedUrlCache`` keeps each URL until shortly before
+it expires. URLs that do need fetching are collected for a moment and fetched
+together, one aliased field per object in a single query.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Optional
+
+from .base_operation import GraphQLField
+from .custom_fields import SignedUrlFields, VideoSignedUrlFields
+from .custom_queries import Query
+from .exceptions import GraphQLClientError, GraphQLClientGraphQLMultiError
+from .gqlclient import Client
+
+DEFAULT_BATCH_SIZE = 50
+
+
+@dataclass(frozen=True)
+class SignedUrl:
+    """A URL valid until ``expires_at``."""
+
+    url: str
+    expires_at: datetime
+
+    @classmethod
+    def from_data(cls, data: Optional[dict[str, Any]]) -> Optional["SignedUrl"]:
+        """Read a ``SignedUrl`` or ``VideoSignedUrl`` result, if there is one."""
+        if not data:
+            return None
+        expires_at = datetime.fromisoformat(data["expiresAt"])
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        return cls(url=data["signedUrl"], expires_at=expires_at)
+
+
+@dataclass(frozen=True)
+class SignedUrlSource:
+    """Where ``SignedUrlCache`` gets the signed URL of an object.
+
+    Build one with the classmethods, e.g. ``SignedUrlSource.video_recording_download()``.
+    """
+
+    name: str
+    "Identifies the source in cache keys and operation names."
+    field: Callable[[str], GraphQLField]
+    "Builds the top-level query field for an object id."
+    read: Callable[[Any], Optional[SignedUrl]]
+    "Reads the URL from the field's result."
+
+    @classmethod
+    def video_recording_download(cls) -> "SignedUrlSource":
+        """The broadcast-view MP4 of a video recording (``videoRecordingDownloadUrl``)."""
+        return cls(
+            name="videoRecordingDownloadUrl",
+            field=lambda id: Query.video_recording_download_url(
+                video_recording_id=id
+            ).fields(SignedUrlFields.signed_url, SignedUrlFields.expires_at),
+            read=SignedUrl.from_data,
+        )
+
+    @classmethod
+    def video_recording_view(
+        cls, resolution: Optional[str] = None, expires_in: Optional[int] = None
+    ) -> "SignedUrlSource":
+        """A camera video recording variant (``videoRecordingSignedUrl``).
+
+        Args:
+            resolution: The variant, e.g. ``"1080p"``. Defaults to the tallest.
+            expires_in: Seconds the URL should stay valid for.
+        """
+
+        def read(variants: Optional[list[dict[str, Any]]]) -> Optional[SignedUrl]:
+            if resolution is not None:
+                variants = [v for v in variants or [] if v["resolution"] == resolution]
+            if not variants:
+                return None
+            return SignedUrl.from_data(max(variants, key=lambda v: v["height"] or 0))
+
+        return cls(
+            name=f"videoRecordingSignedUrl:{resolution}:{expires_in}",
+            field=lambda id: Query.video_recording_signed_url(
+                video_recording_id=id, expires_in=expires_in
+            ).fields(
+                VideoSignedUrlFields.signed_url,
+                VideoSignedUrlFields.expires_at,
+                VideoSignedUrlFields.height,
+                VideoSignedUrlFields.resolution,
+            ),
+            read=read,
+        )
+
+
+class SignedUrlCache:
+    """
+    Signed URLs by object id, refetched shortly before they expire.
+
+    Example:
+        urls = SignedUrlCache(api.client)
+        source = SignedUrlSource.video_recording_download()
+        signed = await urls.get_many(source, video_recording_ids)
+        for video_recording_id, signed_url in signed.items():
+            await download_ranges(http_client, signed_url.url, f"{video_recording_id}.mp4")
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        refresh_before: timedelta = timedelta(minutes=5),
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        batch_delay: float = 0.0,
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ):
+        """
+        Args:
+            client: The client to fetch URLs with.
+            refresh_before: How long before ``expiresAt`` a URL is refetched, to
+                leave time to use it.
+            batch_size: Most URLs fetched by one query.
+            batch_delay: Seconds to wait collecting requests before fetching, so
+                concurrent ``get`` calls share a query.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.client = client
+        self.refresh_before = refresh_before
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self._clock = clock
+        self._urls: dict[tuple[str, str], SignedUrl] = {}
+        self._fetching: dict[tuple[str, str], asyncio.Future] = {}
+        self._pending: dict[str, list[str]] = {}
+        self._flushes: set[asyncio.Task] = set()
+
+    def cached(self, source: SignedUrlSource, id: str) -> Optional[SignedUrl]:
+        """The cached URL for ``id``, if it is still fresh enough to use."""
+        signed = self._urls.get((source.name, id))
+        if signed is None or signed.expires_at - self.refresh_before <= self._clock():
+            return None
+        return signed
+
+    async def get(self, source: SignedUrlSource, id: str) -> Optional[SignedUrl]:
+        """The signed URL for ``id``, or ``None`` if the API returned none.
+
+        Raises:
+            GraphQLClientError: Fetching the URL failed.
+        """
+        return (await self.get_many(source, [id])).get(id)
+
+    async def get_many(
+        self, source: SignedUrlSource, ids: list[str]
+    ) -> dict[str, SignedUrl]:
+        """The signed URLs for ``ids``, fetching the missing ones in batches.
+
+        Ids the API returned no URL for, or an error for, are left out.
+        """
+        urls: dict[str, SignedUrl] = {}
+        waiting: dict[str, asyncio.Future] = {}
+        for id in dict.fromkeys(ids):
+            signed = self.cached(source, id)
+            if signed is not None:
+                urls[id] = signed
+            else:
+                waiting[id] = self._request(source, id)
+
+        # Shielded, as other callers may be waiting on the same fetches
+        fetched = await asyncio.gather(*map(asyncio.shield, waiting.values()))
+        for id, signed in zip(waiting, fetched):
+            if signed is not None:
+                urls[id] = signed
+        return urls
+
+    def invalidate(self, source: SignedUrlSource, id: str) -> None:
+        """Forget the URL for ``id``, e.g. after the server rejected it."""
+        self._urls.pop((source.name, id), None)
+
+    def _request(self, source: SignedUrlSource, id: str) -> asyncio.Future:
+        key = (source.name, id)
+        future = self._fetching.get(key)
+        if future is not None:
+            return future
+        future = self._fetching[key] = asyncio.get_running_loop().create_future()
+        pending = self._pending.get(source.name)
+        if pending is None:
+            pending = self._pending[source.name] = []
+            task = asyncio.create_task(self._flush(source))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+        pending.append(id)
+        return future
+
+    async def _flush(self, source: SignedUrlSource) -> None:
+        await asyncio.sleep(self.batch_delay)
+        ids = self._pending.pop(source.name)
+        await asyncio.gather(
+            *(
+                self._fetch(source, ids[start : start + self.batch_size])
+                for start in range(0, len(ids), self.batch_size)
+            )
+        )
+
+    async def _fetch(self, source: SignedUrlSource, ids: list[str]) -> None:
+        error: BaseException = GraphQLClientError("Fetching signed URLs failed")
+        try:
+            errored: set[str] = set()
+            try:
+                data = await self.client.query(
+                    *(source.field(id).alias(f"url{i}") for i, id in enumerate(ids)),
+                    operation_name="SignedUrls",
+                )
+            except GraphQLClientGraphQLMultiError as e:
+                # Errors on some aliases still leave the others' URLs in the data
+                paths = [graphql_error.path for graphql_error in e.errors]
+                if e.data is None or not all(paths):
+                    raise
+                data = e.data
+                errored = {str(path[0]) for path in paths if path}
+            for i, id in enumerate(ids):
+                alias = f"url{i}"
+                signed = None if alias in errored else source.read(data.get(alias))
+                if signed is not None:
+                    self._urls[(source.name, id)] = signed
+                self._fetching.pop((source.name, id)).set_result(signed)
+        except Exception as e:
+            error = e
+        finally:
+            # Settle whatever is left, so no caller waits forever
+            for id in ids:
+                future = self._fetching.pop((source.name, id), None)
+                if future is not None:
+                    future.set_exception(error)
@@ -0,0 +1,582 @@
+"""
+Run many GraphQL subscriptions over one ``graphql-transport-ws`` websocket.
+"""
+
+import asyncio
+import itertools
+import json
+import random
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, AsyncIterator, Awaitable, Callable, Hashable, Optional, Union
+from uuid import uuid4
+
+from graphql import OperationType
+
+from .async_base_client import (
+    GRAPHQL_TRANSPORT_WS,
+    ClientConnection,
+    GraphQLTransportWSMessageType,
+    Subprotocol,
+    ws_connect,
+)
+from .base_operation import GraphQLField
+from .exceptions import (
+    GraphQLClientError,
+    GraphQLClientGraphQLMultiError,
+    GraphQLClientInvalidMessageFormat,
+)
+from .gqlclient import Client
+
+try:
+    from websockets.exceptions import (  # type: ignore[import-not-found,unused-ignore]
+        ConnectionClosed,
+        WebSocketException,
+    )
+except ImportError:
+
+    class WebSocketException(Exception):  # type: ignore[no-redef]
+        pass
+
+    class ConnectionClosed(WebSocketException):  # type: ignore[no-redef]
+        pass
+
+
+# graphql-transport-ws close codes for client errors that reconnecting won't fix:
+# invalid message, forbidden, subscriber already exists.
+_FATAL_CLOSE_CODES = {4400, 4403, 4409}
+
+
+class _FatalCloseError(GraphQLClientError):
+    """The server closed the connection for a reason reconnecting won't fix."""
+
+
+@dataclass
+class SubscriptionMetrics:
+    """Connection health of a ``SubscriptionManager``."""
+
+    connected: bool = False
+    reconnects: int = 0
+    messages: int = 0
+    ping_timeouts: int = 0
+    dropped: int = 0
+    """Messages discarded or conflated because a consumer fell behind."""
+    latency: Optional[float] = None
+    """Round-trip time of the last keepalive ping, in seconds."""
+
+
+class OverflowPolicy(Enum):
+    """What a subscription does with new messages when its queue is full."""
+
+    BLOCK = "block"
+    """Wait for the consumer, holding up every subscription on the connection."""
+    DROP_OLDEST = "drop_oldest"
+    """Discard the oldest queued message."""
+    CONFLATE = "conflate"
+    """Keep only the newest message per key, e.g. per session participation."""
+
+
+class SubscriptionStream:
+    """
+    Messages for one subscription, in the order the server sent them.
+
+    Iterate with ``async for``; iteration ends when the server completes the
+    subscription, and raises if the server reports an error.
+
+    At most ``max_queue`` messages wait for the consumer; ``overflow`` decides
+    what happens to the rest. With ``OverflowPolicy.CONFLATE`` a new message
+    replaces any queued message with the same ``conflate_key``, keeping its place
+    in the queue.
+    """
+
+    def __init__(
+        self,
+        manager: "SubscriptionManager",
+        query: str,
+        operation_name: Optional[str] = None,
+        variables: Optional[dict[str, Any]] = None,
+        max_queue: int = 1000,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+        conflate_key: Optional[Callable[[dict[str, Any]], Hashable]] = None,
+    ):
+        if max_queue < 1:
+            raise ValueError("max_queue must be at least 1")
+        if overflow is OverflowPolicy.CONFLATE and conflate_key is None:
+            raise ValueError("OverflowPolicy.CONFLATE requires a conflate_key")
+
+        self.id = str(uuid4())
+        self.query = query
+        self.operation_name = operation_name
+        self.variables = variables
+        self.max_queue = max_queue
+        self.overflow = overflow
+        self.conflate_key = conflate_key
+        self.dropped = 0
+        self._manager = manager
+        self._queue: OrderedDict[Hashable, dict[str, Any]] = OrderedDict()
+        self._sequence = itertools.count()
+        self._readable = asyncio.Event()
+        self._writable = asyncio.Event()
+        self._writable.set()
+        self._end: Optional[BaseException] = None
+        self._finished = False
+
+    def __aiter__(self) -> "SubscriptionStream":
+        return self
+
+    async def __anext__(self) -> dict[str, Any]:
+        while not self._queue:
+            if self._finished:
+                error, self._end = self._end, None
+                if error is not None:
+                    raise error
+                raise StopAsyncIteration
+            self._readable.clear()
+            await self._readable.wait()
+
+        _, data = self._queue.popitem(last=False)
+        self._writable.set()
+        return data
+
+    async def __aenter__(self) -> "SubscriptionStream":
+        return self
+
+    async def __aexit__(self, exc_type: object, exc_val: object, exc_tb: object):
+        await self.aclose()
+
+    @property
+    def finished(self) -> bool:
+        """Whether the server or client has ended the subscription."""
+        return self._finished
+
+    @property
+    def pending(self) -> int:
+        """Messages received but not yet read."""
+        return len(self._queue)
+
+    async def aclose(self) -> None:
+        """Stop the subscription; messages already received can still be read."""
+        await self._manager._unsubscribe(self)
+
+    async def _put(self, data: dict[str, Any]) -> None:
+        if self._finished:
+            return
+
+        if self.overflow is OverflowPolicy.CONFLATE:
+            assert self.conflate_key is not None
+            key = self.conflate_key(data)
+            if key in self._queue:
+                self._queue[key] = data
+                self.dropped += 1
+                return
+        else:
+            key = next(self._sequence)
+
+        while len(self._queue) >= self.max_queue:
+            if self.overflow is OverflowPolicy.BLOCK:
+                self._writable.clear()
+                await self._writable.wait()
+                if self._finished:
+                    return
+            else:
+                self._queue.popitem(last=False)
+                self.dropped += 1
+
+        self._queue[key] = data
+        self._readable.set()
+
+    def _finish(self, error: Optional[BaseException] = None) -> None:
+        if self._finished:
+            return
+        self._finished = True
+        self._end = error
+        self._readable.set()
+        self._writable.set()
+
+
+class SubscriptionManager:
+    """
+    Multiplexes subscriptions over a single websocket connection.
+
+    The connection is opened by the first ``subscribe`` call and shared by every
+    subscription after it; the server's messages are routed to each
+    subscription's stream by operation id.
+
+    If the connection drops while subscriptions are active, the manager
+    reconnects with exponential backoff and resubscribes them, so their streams
+    carry on. Keepalive pings detect connections that have silently died, and
+    ``metrics`` reports reconnects and ping latency.
+
+    Example:
+        async with api.subscriptions() as subscriptions:
+            streams = [
+                await subscriptions.subscribe(query, variables={"id": athlete_id})
+                for athlete_id in athlete_ids
+            ]
+            async for data in streams[0]:
+                ...
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        headers: Optional[Callable[[], Awaitable[dict[str, str]]]] = None,
+        ack_timeout: float = 5.0,
+        ping_interval: Optional[float] = 15.0,
+        ping_timeout: float = 10.0,
+        reconnect_delay: float = 0.5,
+        max_reconnect_delay: float = 30.0,
+        max_reconnect_attempts: Optional[int] = None,
+    ):
+        """
+        Args:
+            client: Client whose websocket URL, headers and connection init payload
+                are used for the connection.
+            headers: Called before each connection attempt for extra headers, e.g.
+                a fresh ``Authorization`` header.
+            ack_timeout: Seconds to wait for the server to acknowledge the
+                connection.
+            ping_interval: Seconds between keepalive pings, or ``None`` to disable
+                them.
+            ping_timeout: Seconds to wait for a pong before treating the
+                connection as dead and reconnecting.
+            reconnect_delay: Delay before the first reconnection attempt; doubled
+                after each failed attempt.
+            max_reconnect_delay: Upper bound on the delay between attempts.
+            max_reconnect_attempts: Consecutive failed attempts after which active
+                subscriptions fail with the last error. ``None`` retries forever.
+        """
+        self.client = client
+        self.ack_timeout = ack_timeout
+        self.ping_interval = ping_interval
+        self.ping_timeout = ping_timeout
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.max_reconnect_attempts = max_reconnect_attempts
+        self.metrics = SubscriptionMetrics()
+        self._headers = headers
+        self._streams: dict[str, SubscriptionStream] = {}
+        self._websocket: Optional[ClientConnection] = None
+        self._connected: Optional[asyncio.Future] = None
+        self._runner: Optional[asyncio.Task] = None
+        self._pong: Optional[asyncio.Future] = None
+        self._reader_blocked = False
+
+    async def __aenter__(self) -> "SubscriptionManager":
+        return self
+
+    async def __aexit__(self, exc_type: object, exc_val: object, exc_tb: object):
+        await self.aclose()
+
+    @property
+    def active(self) -> list[SubscriptionStream]:
+        """Subscriptions that have not finished yet."""
+        return list(self._streams.values())
+
+    async def subscribe(
+        self,
+        query: str,
+        operation_name: Optional[str] = None,
+        variables: Optional[dict[str, Any]] = None,
+        max_queue: int = 1000,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+        conflate_key: Optional[Callable[[dict[str, Any]], Hashable]] = None,
+    ) -> SubscriptionStream:
+        """Start a subscription on the shared connection, connecting if needed.
+
+        Args:
+            query: The GraphQL subscription document.
+            operation_name: Name of the operation to run from ``query``.
+            variables: Variables for the operation.
+            max_queue: Most messages held for a consumer that falls behind.
+            overflow: What to do with new messages once ``max_queue`` is reached.
+            conflate_key: For ``OverflowPolicy.CONFLATE``, returns the key a
+                message supersedes older messages by.
+
+        Returns:
+            A stream of the ``data`` of each result the server sends.
+        """
+        stream = SubscriptionStream(
+            self,
+            query,
+            operation_name,
+            variables,
+            max_queue=max_queue,
+            overflow=overflow,
+            conflate_key=conflate_key,
+        )
+        websocket = await self._ensure_connected()
+        self._streams[stream.id] = stream
+        try:
+            await self._send_subscribe(websocket, stream)
+        except ConnectionClosed:
+            # Dropped since connecting; the stream is resubscribed on reconnect
+            pass
+        return stream
+
+    async def subscribe_fields(
+        self, *fields: GraphQLField, operation_name: str, **kwargs: Any
+    ) -> SubscriptionStream:
+        """Start a subscription built from ``custom_subscriptions.Subscription``.
+
+        Example:
+            stream = await subscriptions.subscribe_fields(
+                Subscription.match_event_created_event(
+                    session_participation_id=participation_id
+                ).fields(
+                    MatchEventCreatedSubscriptionPayloadFields.match_event().fields(
+                        MatchEventFields.id
+                    )
+                ),
+                operation_name="matchEvents",
+            )
+
+        Args:
+            fields: Fields to select, as for ``Client.subscribe``.
+            operation_name: Name given to the generated operation.
+            kwargs: Passed on to ``subscribe``.
+        """
+        query, variables = self.client.build_custom_operation(
+            *fields,
+            operation_type=OperationType.SUBSCRIPTION,
+            operation_name=operation_name,
+        )
+        return await self.subscribe(query, operation_name, variables, **kwargs)
+
+    async def aclose(self) -> None:
+        """Close the connection, ending every subscription on it."""
+        if self._runner is not None:
+            self._runner.cancel()
+            try:
+                await self._runner
+            except asyncio.CancelledError:
+                pass
+        self._finish_all()
+
+    async def _ensure_connected(self) -> ClientConnection:
+        if self._runner is None or self._runner.done():
+            self._connected = asyncio.get_running_loop().create_future()
+            self._runner = asyncio.create_task(self._run())
+        assert self._connected is not None
+        return await asyncio.shield(self._connected)
+
+    async def _run(self) -> None:
+        """Hold the connection open, reconnecting while subscriptions are active."""
+        assert self._connected is not None
+        failures = 0
+        first_connection = True
+        error: Optional[BaseException] = None
+        try:
+            while True:
+                try:
+                    await self._serve_connection(first_connection)
+                    failures = 0
+                    error = None
+                except asyncio.CancelledError:
+                    raise
+                except Exception as exc:
+                    if first_connection and not self._connected.done():
+                        # Nothing to keep alive yet; let the caller see the error
+                        self._connected.set_exception(exc)
+                        return
+                    error = exc
+                    failures += 1
+
+                first_connection = False
+                if isinstance(error, _FatalCloseError) or not self._streams:
+                    return
+                if (
+                    self.max_reconnect_attempts is not None
+                    and failures > self.max_reconnect_attempts
+                ):
+                    return
+
+                if self._connected.done():
+                    self._connected = asyncio.get_running_loop().create_future()
+                await asyncio.sleep(self._backoff(failures))
+        finally:
+            self._websocket = None
+            self.metrics.connected = False
+            if not self._connected.done():
+                self._connected.set_exception(
+                    error or GraphQLClientError("Subscription connection closed")
+                )
+                # Only subscribe() calls awaiting it need to see the error
+                self._connected.exception()
+            self._finish_all(error)
+
+    async def _serve_connection(self, first_connection: bool) -> None:
+        """Connect, resubscribe active streams, and route messages until closed."""
+        assert self._connected is not None
+        async with self._connect() as websocket:
+            self._websocket = websocket
+            self.metrics.connected = True
+            if not first_connection:
+                self.metrics.reconnects += 1
+            for stream in self.active:
+                await self._send_subscribe(websocket, stream)
+            if not self._connected.done():
+                self._connected.set_result(websocket)
+
+            keepalive = asyncio.create_task(self._keepalive(websocket))
+            try:
+                async for message in websocket:
+                    await self._handle_message(message, websocket)
+            except ConnectionClosed:
+                if websocket.close_code not in _FATAL_CLOSE_CODES:
+                    raise
+            finally:
+                keepalive.cancel()
+                self._websocket = None
+                self.metrics.connected = False
+
+        if websocket.close_code in _FATAL_CLOSE_CODES:
+            raise _FatalCloseError(
+                f"Server closed the connection: {websocket.close_code} "
+                f"{websocket.close_reason}"
+            )
+
+    def _backoff(self, failures: int) -> float:
+        delay = min(self.max_reconnect_delay, self.reconnect_delay * 2**failures)
+        # Jitter so many clients dropped together don't reconnect in lockstep
+        return delay * random.uniform(0.5, 1)
+
+    async def _keepalive(self, websocket: ClientConnection) -> None:
+        if self.ping_interval is None:
+            return
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            self._pong = asyncio.get_running_loop().create_future()
+            sent = time.monotonic()
+            await websocket.send(
+                json.dumps({"type": GraphQLTransportWSMessageType.PING.value})
+            )
+            try:
+                await asyncio.wait_for(self._pong, self.ping_timeout)
+            except asyncio.TimeoutError:
+                if self._reader_blocked:
+                    # The pong is queued behind a slow BLOCK consumer, not lost
+                    continue
+                self.metrics.ping_timeouts += 1
+                await websocket.close()
+                return
+            self.metrics.latency = time.monotonic() - sent
+
+    @asynccontextmanager
+    async def _connect(self) -> AsyncIterator[ClientConnection]:
+        """Open the websocket and wait for the server to acknowledge it."""
+        headers = self.client.ws_headers.copy()
+        if self._headers is not None:
+            headers.update(await self._headers())
+
+        async with ws_connect(
+            self.client.ws_url,
+            subprotocols=[Subprotocol(GRAPHQL_TRANSPORT_WS)],
+            origin=self.client.ws_origin,
+            additional_headers=headers,
+        ) as websocket:
+            try:
+                await self.client._send_connection_init(websocket)
+                await asyncio.wait_for(
+                    self.client._wait_for_connection_ack(websocket),
+                    timeout=self.ack_timeout,
+                )
+            except asyncio.TimeoutError as exc:
+                raise GraphQLClientError(
+                    f"Connection ack not received within {self.ack_timeout} seconds"
+                ) from exc
+            except ConnectionClosed:
+                pass
+            if websocket.close_code is not None:
+                raise GraphQLClientError(
+                    f"Connection closed before ack: {websocket.close_code} "
+                    f"{websocket.close_reason}"
+                )
+            yield websocket
+
+    async def _send_subscribe(
+        self, websocket: ClientConnection, stream: SubscriptionStream
+    ) -> None:
+        await self.client._send_subscribe(
+            websocket,
+            operation_id=stream.id,
+            query=stream.query,
+            operation_name=stream.operation_name,
+            variables=stream.variables,
+        )
+
+    async def _unsubscribe(self, stream: SubscriptionStream) -> None:
+        stream._finish()
+        if self._streams.pop(stream.id, None) is None or self._websocket is None:
+            return
+        try:
+            await self._websocket.send(
+                json.dumps(
+                    {
+                        "id": stream.id,
+                        "type": GraphQLTransportWSMessageType.COMPLETE.value,
+                    }
+                )
+            )
+        except ConnectionClosed:
+            # Not resubscribed on reconnect, so nothing left to stop
+            pass
+
+    async def _handle_message(
+        self, message: Union[str, bytes], websocket: ClientConnection
+    ) -> None:
+        try:
+            message_dict = json.loads(message)
+        except json.JSONDecodeError as exc:
+            raise GraphQLClientInvalidMessageFormat(message=message) from exc
+
+        type_ = message_dict.get("type")
+        payload = message_dict.get("payload", {})
+
+        if type_ == GraphQLTransportWSMessageType.PING.value:
+            await websocket.send(
+                json.dumps({"type": GraphQLTransportWSMessageType.PONG.value})
+            )
+            return
+        if type_ == GraphQLTransportWSMessageType.PONG.value:
+            if self._pong is not None and not self._pong.done():
+                self._pong.set_result(None)
+            return
+
+        stream = self._streams.get(message_dict.get("id", ""))
+        if stream is None:
+            # Late messages for a subscription the client already stopped
+            return
+
+        if type_ == GraphQLTransportWSMessageType.NEXT.value:
+            if "data" not in payload:
+                del self._streams[stream.id]
+                stream._finish(GraphQLClientInvalidMessageFormat(message=message))
+            else:
+                self.metrics.messages += 1
+                dropped = stream.dropped
+                self._reader_blocked = True
+                try:
+                    await stream._put(payload["data"])
+                finally:
+                    self._reader_blocked = False
+                self.metrics.dropped += stream.dropped - dropped
+        elif type_ == GraphQLTransportWSMessageType.ERROR.value:
+            del self._streams[stream.id]
+            stream._finish(
+                GraphQLClientGraphQLMultiError.from_errors_dicts(
+                    errors_dicts=payload, data=message_dict
+                )
+            )
+        elif type_ == GraphQLTransportWSMessageType.COMPLETE.value:
+            del self._streams[stream.id]
+            stream._finish()
+
+    def _finish_all(self, error: Optional[BaseException] = None) -> None:
+        streams = list(self._streams.values())
+        self._streams.clear()
+        for stream in streams:
+            stream._finish(error)
@@ -30,7 +30,7 @@ class TestAuthorisationCodeFlowBase:
             mock_server_class.assert_called_once_with(8080)
 
     @patch("playerdatapy.auth.authorisation_code_flow_base.webbrowser")
-    @patch("playerdatapy.auth.authorisation_code_flow_base.OAuth2Session")
+    @patch("requests_oauthlib.OAuth2Session")
     @patch("playerdatapy.auth.authorisation_code_flow_base.Server")
     def test_authenticate_success(
         self, mock_server_class, mock_session_class, mock_webbrowser
@@ -93,7 +93,7 @@ class TestAuthorisationCodeFlowBase:
                 os.remove(token_file)
 
     @patch("playerdatapy.auth.authorisation_code_flow_base.webbrowser")
-    @patch("playerdatapy.auth.authorisation_code_flow_base.OAuth2Session")
+    @patch("requests_oauthlib.OAuth2Session")
     @patch("playerdatapy.auth.authorisation_code_flow_base.Server")
     def test_authenticate_stops_server_on_error(
         self, mock_server_class, mock_session_class, mock_webbrowser
@@ -1,7 +1,10 @@
+import asyncio
 import json
 import os
 import tempfile
+import threading
 import time
+from unittest.mock import patch
 
 from pathlib import Path
 import pytest
@@ -144,3 +147,89 @@ class TestBaseAuthFlow:
         finally:
             if os.path.exists(token_file):
                 os.remove(token_file)
+
+    def test_get_token_cached_until_file_changes(self, tmp_path):
+        """Test get_token only re-reads the file after it has been replaced."""
+        token_file = tmp_path / "token.json"
+        flow = BaseAuthFlow(client_id="test_client", token_file=token_file)
+        flow.save_token({"access_token": "first"})
+
+        assert flow.get_token() == {"access_token": "first"}
+        with patch.object(Path, "read_text") as mock_read_text:
+            assert flow.get_token() == {"access_token": "first"}
+            mock_read_text.assert_not_called()
+
+        # Another process writes a new token
+        BaseAuthFlow(client_id="test_client", token_file=token_file).save_token(
+            {"access_token": "second"}
+        )
+        assert flow.get_token() == {"access_token": "second"}
+
+    def test_get_token_returns_copy_of_cache(self, tmp_path):
+        """Test mutating a returned token does not corrupt the cached token."""
+        flow = BaseAuthFlow(client_id="test_client", token_file=tmp_path / "t.json")
+        flow.save_token({"access_token": "test_token"})
+
+        flow.get_token()["access_token"] = "mutated"
+
+        assert flow.get_token() == {"access_token": "test_token"}
+
+    def test_save_token_is_atomic(self, tmp_path):
+        """Test save_token replaces the file without leaving temporary files."""
+        token_file = tmp_path / "token.json"
+        token_file.write_text(json.dumps({"access_token": "old"}))
+        flow = BaseAuthFlow(client_id="test_client", token_file=token_file)
+
+        with patch(
+            "playerdatapy.auth.token_storage.os.replace", side_effect=OSError("boom")
+        ):
+            with pytest.raises(OSError):
+                flow.save_token({"access_token": "new"})
+
+        assert json.loads(token_file.read_text()) == {"access_token": "old"}
+        assert list(tmp_path.iterdir()) == [token_file]
+
+        flow.save_token({"access_token": "new"})
+        assert json.loads(token_file.read_text()) == {"access_token": "new"}
+        assert list(tmp_path.iterdir()) == [token_file]
+
+    def test_lock_is_exclusive(self, tmp_path):
+        """Test the token lock serialises holders across flows."""
+        token_file = tmp_path / "token.json"
+        events = []
+
+        def hold_lock(name):
+            flow = BaseAuthFlow(client_id="test_client", token_file=token_file)
+            with flow.lock():
+                events.append(f"{name}-enter")
+                time.sleep(0.05)
+                events.append(f"{name}-exit")
+
+        threads = [threading.Thread(target=hold_lock, args=(i,)) for i in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for enter, leave in zip(events[::2], events[1::2]):
+            assert enter.split("-")[0] == leave.split("-")[0]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_alock_leaves_lock_free(self, tmp_path):
+        """Test a task cancelled while waiting for the lock never takes it."""
+        flow = BaseAuthFlow(client_id="test_client", token_file=tmp_path / "token.json")
+
+        async def wait_for_lock():
+            async with flow.alock():
+                pass
+
+        with flow.lock():
+            waiter = asyncio.create_task(wait_for_lock())
+            await asyncio.sleep(0.1)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+
+        async with asyncio.timeout(1):
+            async with flow.alock():
+                pass
@@ -1,14 +1,34 @@
 import json
-import os
-import tempfile
-from unittest.mock import MagicMock, patch
+import time
+from unittest.mock import patch
+from urllib.parse import parse_qs
 
 from pathlib import Path
+import httpx
 import pytest
+from oauthlib.oauth2.rfc6749.errors import InvalidClientError
 
 from playerdatapy.auth.client_credentials_flow import ClientCredentialsFlow
 
 
+def token_endpoint(requests: list, status_code: int = 200, body: dict | None = None):
+    """Mock /oauth/token handler that records requests."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(
+            status_code,
+            json=body
+            or {
+                "access_token": "test_token",
+                "token_type": "Bearer",
+                "expires_in": 7200,
+            },
+        )
+
+    return handler
+
+
 class TestClientCredentialsFlow:
     """Tests for ClientCredentialsFlow class."""
 
@@ -22,99 +42,100 @@ class TestClientCredentialsFlow:
         assert flow.client_id == "test_client"
         assert flow.client_secret == "test_secret"
         assert flow.token_file == Path(".test_token")
+        assert flow.token_url == "https://app.playerdata.co.uk/oauth/token"
         assert flow.oauth_session is None
 
-    @patch("playerdatapy.auth.client_credentials_flow.OAuth2Session")
-    @patch("playerdatapy.auth.client_credentials_flow.BackendApplicationClient")
-    def test_authenticate_success(self, mock_client_class, mock_session_class):
-        """Test successful authentication."""
-        # Setup mocks
-        mock_client = MagicMock()
-        mock_client_class.return_value = mock_client
-
-        mock_session = MagicMock()
-        mock_session.fetch_token.return_value = {
-            "access_token": "test_token",
-            "token_type": "Bearer",
-        }
-        mock_session_class.return_value = mock_session
-
-        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".token") as f:
-            token_file = f.name
-
-        try:
-            flow = ClientCredentialsFlow(
-                client_id="test_client",
-                client_secret="test_secret",
-                token_file=token_file,
-            )
+    def test_authenticate_success(self, tmp_path):
+        """Test successful authentication saves a token in the usual format."""
+        requests = []
+        mock_client = httpx.Client(
+            transport=httpx.MockTransport(token_endpoint(requests))
+        )
+        token_file = tmp_path / "token.json"
 
+        flow = ClientCredentialsFlow(
+            client_id="test_client",
+            client_secret="test_secret",
+            token_file=token_file,
+        )
+        with patch(
+            "playerdatapy.auth.client_credentials_flow.httpx.Client",
+            return_value=mock_client,
+        ):
             result = flow.authenticate()
 
-            # Verify OAuth2Session was created correctly
-            mock_client_class.assert_called_once_with(client_id="test_client")
-            mock_session_class.assert_called_once_with(client=mock_client)
-
-            # Verify fetch_token was called
-            mock_session.fetch_token.assert_called_once_with(
-                token_url="https://app.playerdata.co.uk/oauth/token",
-                client_id="test_client",
-                client_secret="test_secret",
-            )
+        (request,) = requests
+        assert str(request.url) == "https://app.playerdata.co.uk/oauth/token"
+        assert parse_qs(request.content.decode()) == {
+            "grant_type": ["client_credentials"],
+            "client_id": ["test_client"],
+            "client_secret": ["test_secret"],
+        }
 
-            # Verify token was saved
-            assert result == {"access_token": "test_token", "token_type": "Bearer"}
-            with open(token_file, "r") as f:
-                saved_token = json.loads(f.read())
-                assert saved_token == {
-                    "access_token": "test_token",
-                    "token_type": "Bearer",
-                }
-
-            # Verify session was closed
-            mock_session.close.assert_called_once()
-        finally:
-            if os.path.exists(token_file):
-                os.remove(token_file)
-
-    @patch("playerdatapy.auth.client_credentials_flow.OAuth2Session")
-    @patch("playerdatapy.auth.client_credentials_flow.BackendApplicationClient")
-    def test_authenticate_closes_session_on_error(
-        self, mock_client_class, mock_session_class
-    ):
-        """Test that session is closed even if authentication fails."""
-        mock_client = MagicMock()
-        mock_client_class.return_value = mock_client
-
-        mock_session = MagicMock()
-        mock_session.fetch_token.side_effect = Exception("Token fetch failed")
-        mock_session_class.return_value = mock_session
+        assert result["access_token"] == "test_token"
+        assert result["expires_at"] == pytest.approx(time.time() + 7200, abs=5)
+        assert json.loads(token_file.read_text()) == result
+        assert flow.get_token() == result
 
+    def test_authenticate_without_saving(self, tmp_path):
+        """Test save_token=False leaves the token file untouched."""
+        mock_client = httpx.Client(transport=httpx.MockTransport(token_endpoint([])))
         flow = ClientCredentialsFlow(
-            client_id="test_client", client_secret="test_secret"
+            client_id="test_client",
+            client_secret="test_secret",
+            token_file=tmp_path / "token.json",
         )
 
-        with pytest.raises(Exception, match="Token fetch failed"):
-            flow.authenticate()
+        with patch(
+            "playerdatapy.auth.client_credentials_flow.httpx.Client",
+            return_value=mock_client,
+        ):
+            result = flow.authenticate(save_token=False)
 
-        # Verify session was still closed
-        mock_session.close.assert_called_once()
+        assert result["access_token"] == "test_token"
+        assert not (tmp_path / "token.json").exists()
 
-    def test_fetch_token(self):
-        """Test _fetch_token method."""
+    def test_authenticate_error_response(self, tmp_path):
+        """Test OAuth error responses raise oauthlib errors and save nothing."""
+        mock_client = httpx.Client(
+            transport=httpx.MockTransport(
+                token_endpoint([], status_code=401, body={"error": "invalid_client"})
+            )
+        )
         flow = ClientCredentialsFlow(
-            client_id="test_client", client_secret="test_secret"
+            client_id="test_client",
+            client_secret="wrong_secret",
+            token_file=tmp_path / "token.json",
         )
 
-        mock_session = MagicMock()
-        mock_session.fetch_token.return_value = {"access_token": "test_token"}
-        flow.oauth_session = mock_session
+        with patch(
+            "playerdatapy.auth.client_credentials_flow.httpx.Client",
+            return_value=mock_client,
+        ):
+            with pytest.raises(InvalidClientError):
+                flow.authenticate()
 
-        result = flow._fetch_token()
+        assert not (tmp_path / "token.json").exists()
 
-        mock_session.fetch_token.assert_called_once_with(
-            token_url="https://app.playerdata.co.uk/oauth/token",
+    @pytest.mark.asyncio
+    async def test_aauthenticate_uses_given_client(self, tmp_path):
+        """Test aauthenticate sends the token request over the caller's client."""
+        requests = []
+        flow = ClientCredentialsFlow(
             client_id="test_client",
             client_secret="test_secret",
+            token_file=tmp_path / "token.json",
+            base_url="https://preview.playerdata.co.uk",
         )
-        assert result == {"access_token": "test_token"}
+
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(token_endpoint(requests))
+        ) as http_client:
+            result = await flow.aauthenticate(http_client)
+            assert not http_client.is_closed
+
+        (request,) = requests
+        assert str(request.url) == "https://preview.playerdata.co.uk/oauth/token"
+        assert "Authorization" not in request.headers
+        assert result["access_token"] == "test_token"
+        assert flow.get_token() == result
@@ -0,0 +1,229 @@
+import asyncio
+import itertools
+
+import httpx
+import pytest
+
+from playerdatapy.downloads import DownloadCache, cache_key
+from playerdatapy.downloads import cache as cache_module
+
+BODY = b'[{"time": 1, "type": "GPS"}]'
+
+
+def counting_client(body: bytes = BODY):
+    requests = []
+
+    async def handler(request):
+        requests.append(request)
+        await asyncio.sleep(0)
+        return httpx.Response(200, content=body)
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler)), requests
+
+
+def make_cache(tmp_path, **kwargs):
+    ticks = itertools.count()
+    return DownloadCache(tmp_path / "cache", clock=lambda: next(ticks), **kwargs)
+
+
+def put_bytes(cache, tmp_path, key, data):
+    source = tmp_path / f"{key}.src"
+    source.write_bytes(data)
+    return cache.put(key, source)
+
+
+class TestCacheKey:
+    def test_changes_with_updated_at(self):
+        assert cache_key("rec-1", "2024-01-01T00:00:00Z") == cache_key(
+            "rec-1", "2024-01-01T00:00:00Z"
+        )
+        assert cache_key("rec-1", "2024-01-01T00:00:00Z") != cache_key(
+            "rec-1", "2024-01-02T00:00:00Z"
+        )
+        assert cache_key("rec-1") != cache_key("rec-1", kind="ball")
+
+
+class TestDownloadCache:
+    def test_put_and_open(self, tmp_path):
+        cache = make_cache(tmp_path)
+        entry = put_bytes(cache, tmp_path, "a" * 64, BODY)
+
+        assert entry.size == len(BODY)
+        assert not (tmp_path / f"{'a' * 64}.src").exists()
+        with cache.open("a" * 64) as f:
+            assert f.read() == BODY
+
+    def test_missing_key(self, tmp_path):
+        cache = make_cache(tmp_path)
+
+        assert cache.get("b" * 64) is None
+        with pytest.raises(KeyError):
+            cache.open("b" * 64)
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        cache = make_cache(tmp_path, max_bytes=2 * len(BODY))
+        first, second, third = "1" * 64, "2" * 64, "3" * 64
+        put_bytes(cache, tmp_path, first, BODY)
+        put_bytes(cache, tmp_path, second, BODY)
+        cache.get(first)
+        put_bytes(cache, tmp_path, third, BODY)
+
+        assert cache.get(first) is not None
+        assert cache.get(second) is None
+        assert not cache.path(second).exists()
+        assert cache.get(third) is not None
+        assert cache.size == 2 * len(BODY)
+
+    def test_index_is_shared(self, tmp_path):
+        put_bytes(make_cache(tmp_path), tmp_path, "c" * 64, BODY)
+
+        assert make_cache(tmp_path).get("c" * 64) is not None
+
+    def test_hit_leaves_index_alone(self, tmp_path):
+        cache = make_cache(tmp_path)
+        put_bytes(cache, tmp_path, "d" * 64, BODY)
+        before = cache.index_path.stat()
+
+        assert cache.get("d" * 64).last_used == 1
+        assert cache.path("d" * 64).stat().st_mtime == 1
+        assert cache.index_path.stat().st_ino == before.st_ino
+
+    def test_file_removed_outside_cache(self, tmp_path):
+        cache = make_cache(tmp_path)
+        put_bytes(cache, tmp_path, "d" * 64, BODY)
+        cache.path("d" * 64).unlink()
+
+        assert cache.get("d" * 64) is None
+        assert cache.size == 0
+
+    def test_discard(self, tmp_path):
+        cache = make_cache(tmp_path)
+        put_bytes(cache, tmp_path, "e" * 64, BODY)
+        cache.discard("e" * 64)
+
+        assert cache.get("e" * 64) is None
+        assert not cache.path("e" * 64).exists()
+
+    def test_compress_requires_zstandard(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(cache_module, "zstandard", None)
+
+        with pytest.raises(ImportError, match="zstandard"):
+            make_cache(tmp_path, compress=True)
+
+    def test_compressed_round_trip(self, tmp_path):
+        pytest.importorskip("zstandard")
+        cache = make_cache(tmp_path, compress=True)
+        body = BODY * 1000
+        entry = put_bytes(cache, tmp_path, "f" * 64, body)
+
+        assert entry.compressed
+        assert entry.stored_size < entry.size
+        with cache.open("f" * 64) as f:
+            assert f.read() == body
+
+
+class TestFetch:
+    @pytest.mark.asyncio
+    async def test_downloads_once(self, tmp_path):
+        cache = make_cache(tmp_path)
+        key = cache_key("rec-1", "2024-01-01T00:00:00Z")
+        http_client, requests = counting_client()
+        async with http_client:
+            entries = await asyncio.gather(
+                cache.fetch(http_client, "https://files/1.json", key),
+                cache.fetch(http_client, "https://files/1.json", key),
+            )
+            await cache.fetch(http_client, "https://files/1.json", key)
+
+        assert len(requests) == 1
+        assert entries[0].size == len(BODY)
+        with cache.open(key) as f:
+            assert f.read() == BODY
+        assert cache._fetching == {}
+
+    @pytest.mark.asyncio
+    async def test_caches_sharing_a_directory(self, tmp_path):
+        # As two processes would: separate locks, one directory
+        first, second = make_cache(tmp_path), make_cache(tmp_path)
+        key = cache_key("rec-1", "v1")
+        http_client, requests = counting_client()
+        async with http_client:
+            await asyncio.gather(
+                first.fetch(http_client, "https://files/1.json", key),
+                second.fetch(http_client, "https://files/1.json", key),
+            )
+
+        with first.open(key) as f:
+            assert f.read() == BODY
+        assert not list((tmp_path / "cache" / "downloads").iterdir())
+
+    @pytest.mark.asyncio
+    async def test_new_version_downloads_again(self, tmp_path):
+        cache = make_cache(tmp_path)
+        http_client, requests = counting_client()
+        async with http_client:
+            await cache.fetch(
+                http_client, "https://files/1.json", cache_key("rec-1", "v1")
+            )
+            await cache.fetch(
+                http_client, "https://files/1.json", cache_key("rec-1", "v2")
+            )
+
+        assert len(requests) == 2
+
+
+class TestRevalidate:
+    def server(self):
+        state = {"etag": '"v1"', "body": BODY, "requests": []}
+
+        def handler(request):
+            state["requests"].append(request)
+            headers = {"ETag": state["etag"]}
+            if request.headers.get("if-none-match") == state["etag"]:
+                return httpx.Response(304, headers=headers)
+            return httpx.Response(200, content=state["body"], headers=headers)
+
+        return httpx.AsyncClient(transport=httpx.MockTransport(handler)), state
+
+    @pytest.mark.asyncio
+    async def test_not_modified_is_a_hit(self, tmp_path):
+        cache = make_cache(tmp_path)
+        key = cache_key("sp-1", kind="heatmap")
+        http_client, state = self.server()
+        async with http_client:
+            first = await cache.fetch(http_client, "https://files/h.png", key, True)
+            second = await cache.fetch(http_client, "https://files/h.png", key, True)
+
+        assert first.etag == '"v1"'
+        assert second.etag == '"v1"'
+        assert "if-none-match" not in state["requests"][0].headers
+        assert state["requests"][1].headers["if-none-match"] == '"v1"'
+        assert cache.stats.downloads == 1
+        assert cache.stats.not_modified == 1
+
+    @pytest.mark.asyncio
+    async def test_changed_file_is_replaced(self, tmp_path):
+        cache = make_cache(tmp_path)
+        key = cache_key("sp-1", kind="heatmap")
+        http_client, state = self.server()
+        async with http_client:
+            await cache.fetch(http_client, "https://files/h.png", key, True)
+            state["etag"], state["body"] = '"v2"', b"changed"
+            entry = await cache.fetch(http_client, "https://files/h.png", key, True)
+
+        assert entry.etag == '"v2"'
+        assert cache.stats.downloads == 2
+        with cache.open(key) as f:
+            assert f.read() == b"changed"
+
+    @pytest.mark.asyncio
+    async def test_without_revalidate_skips_the_server(self, tmp_path):
+        cache = make_cache(tmp_path)
+        key = cache_key("sp-1", kind="heatmap")
+        http_client, state = self.server()
+        async with http_client:
+            await cache.fetch(http_client, "https://files/h.png", key)
+            await cache.fetch(http_client, "https://files/h.png", key)
+
+        assert len(state["requests"]) == 1
+        assert cache.stats.hits == 1
@@ -0,0 +1,178 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from playerdatapy.downloads import (
+    DownloadManager,
+    DownloadManifest,
+    DownloadStatus,
+    DownloadTask,
+)
+
+BODY = json.dumps([{"time": i} for i in range(10)]).encode()
+
+
+class FileHost:
+    """Serves ``BODY`` at any path, failing requests listed in ``failures``."""
+
+    def __init__(self, failures=None):
+        self.failures = failures or {}
+        self.requests: list[str] = []
+        self.active: dict[str, int] = {}
+        self.peak: dict[str, int] = {}
+        self.peak_total = 0
+
+    async def handler(self, request):
+        host, path = request.url.host, request.url.path
+        self.requests.append(path)
+        self.active[host] = self.active.get(host, 0) + 1
+        self.peak[host] = max(self.peak.get(host, 0), self.active[host])
+        self.peak_total = max(self.peak_total, sum(self.active.values()))
+        try:
+            await asyncio.sleep(0.01)
+            failures = self.failures.get(path)
+            if failures:
+                status = failures.pop(0)
+                if status is None:
+                    raise httpx.ConnectError("dropped")
+                return httpx.Response(status, headers={"Retry-After": "0"})
+            return httpx.Response(200, content=BODY)
+        finally:
+            self.active[host] -= 1
+
+    def client(self):
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+
+
+def tasks(tmp_path, hosts=("a",), count=4):
+    return [
+        DownloadTask(f"https://{host}/{i}.json", tmp_path / host / f"{i}.json")
+        for host in hosts
+        for i in range(count)
+    ]
+
+
+def manager(http_client, **kwargs):
+    return DownloadManager(http_client, retry_delay=0, **kwargs)
+
+
+class TestDownloadManager:
+    @pytest.mark.asyncio
+    async def test_bounds_concurrency(self, tmp_path):
+        host = FileHost()
+        async with host.client() as http_client:
+            report = await manager(http_client, max_concurrency=3, max_per_host=2).run(
+                tasks(tmp_path, hosts=("a", "b"), count=5)
+            )
+
+        assert report.stats.completed == 10
+        assert host.peak == {"a": 2, "b": 2}
+        assert host.peak_total == 3
+        assert (tmp_path / "b" / "4.json").read_bytes() == BODY
+
+    @pytest.mark.asyncio
+    async def test_retries_transient_errors(self, tmp_path):
+        host = FileHost({"/0.json": [503, None], "/1.json": [404]})
+        events = []
+
+        async def on_progress(event):
+            events.append((event.task.key, event.status, event.attempt))
+
+        async with host.client() as http_client:
+            report = await manager(http_client, count_records=True).run(
+                tasks(tmp_path, count=2), on_progress=on_progress
+            )
+
+        first, second = (str(task.path) for task in tasks(tmp_path, count=2))
+        assert report.results[first].records == 10
+        assert report.errors[second].response.status_code == 404
+        assert report.stats.retries == 2
+        assert report.stats.records == 10
+        assert [e for e in events if e[0] == first] == [
+            (first, DownloadStatus.STARTED, 1),
+            (first, DownloadStatus.RETRYING, 1),
+            (first, DownloadStatus.RETRYING, 2),
+            (first, DownloadStatus.COMPLETED, 3),
+        ]
+        assert (second, DownloadStatus.FAILED, 1) in events
+
+    @pytest.mark.asyncio
+    async def test_backs_off_without_holding_a_slot(self, tmp_path):
+        requests = []
+
+        def handler(request):
+            requests.append(request.url.path)
+            if requests == ["/0.json"]:
+                return httpx.Response(503)
+            return httpx.Response(200, content=BODY)
+
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(handler)
+        ) as http_client:
+            report = await DownloadManager(
+                http_client, max_concurrency=1, retry_delay=0.2
+            ).run(tasks(tmp_path, count=2))
+
+        assert report.stats.completed == 2
+        # The second download ran while the first waited to retry
+        assert requests == ["/0.json", "/1.json", "/0.json"]
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_attempts(self, tmp_path):
+        host = FileHost({"/0.json": [503, 503, 503]})
+        async with host.client() as http_client:
+            report = await manager(http_client, max_attempts=2).run(
+                tasks(tmp_path, count=1)
+            )
+
+        assert report.stats.failed == 1
+        assert host.requests == ["/0.json", "/0.json"]
+
+    @pytest.mark.asyncio
+    async def test_resumes_from_manifest(self, tmp_path):
+        host = FileHost({"/2.json": [404]})
+        manifest_path = tmp_path / "manifest.jsonl"
+        async with host.client() as http_client:
+            first = await manager(
+                http_client, manifest=DownloadManifest(manifest_path)
+            ).run(tasks(tmp_path))
+            assert first.stats.failed == 1
+
+            manifest = DownloadManifest(manifest_path)
+            assert [task.url for task in manifest.pending()] == ["https://a/2.json"]
+
+            host.requests.clear()
+            second = await manager(http_client, manifest=manifest).run(tasks(tmp_path))
+
+        assert host.requests == ["/2.json"]
+        assert second.stats.skipped == 3
+        assert second.stats.completed == 1
+        assert len(second.results) == 4
+
+    @pytest.mark.asyncio
+    async def test_redownloads_missing_files(self, tmp_path):
+        host = FileHost()
+        manifest_path = tmp_path / "manifest.jsonl"
+        async with host.client() as http_client:
+            await manager(http_client, manifest=DownloadManifest(manifest_path)).run(
+                tasks(tmp_path, count=1)
+            )
+            (tmp_path / "a" / "0.json").unlink()
+            report = await manager(
+                http_client, manifest=DownloadManifest(manifest_path)
+            ).run(tasks(tmp_path, count=1))
+
+        assert report.stats.completed == 1
+        assert len(host.requests) == 2
+
+
+class TestDownloadManifest:
+    def test_ignores_truncated_line(self, tmp_path):
+        path = tmp_path / "manifest.jsonl"
+        path.write_text(
+            '{"id": "1", "url": "https://a/1", "path": "1.json"}\n{"id": "1", "do'
+        )
+
+        assert [task.key for task in DownloadManifest(path).pending()] == ["1"]
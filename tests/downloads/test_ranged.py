@@ -0,0 +1,158 @@
+import re
+
+import httpx
+import pytest
+
+from playerdatapy.downloads import RangeError, download_ranges
+from playerdatapy.downloads.ranged import progress_path
+
+BODY = bytes(range(256)) * 40 + b"tail"
+
+
+class RangeServer:
+    """Serves ``body`` like a file host that honours ``Range`` and ``If-Range``."""
+
+    def __init__(self, body: bytes = BODY, etag: str = '"v1"', ranges: bool = True):
+        self.body = body
+        self.etag = etag
+        self.ranges = ranges
+        self.requests: list[httpx.Request] = []
+        self.fail_at: set[int] = set()
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        headers = {"ETag": self.etag}
+        match = re.fullmatch(r"bytes=(\d+)-(\d+)", request.headers.get("range", ""))
+        if_range = request.headers.get("if-range")
+        if not self.ranges or match is None or if_range not in (None, self.etag):
+            return httpx.Response(200, content=self.body, headers=headers)
+        start, end = int(match.group(1)), min(int(match.group(2)), len(self.body) - 1)
+        if start >= len(self.body):
+            headers["Content-Range"] = f"bytes */{len(self.body)}"
+            return httpx.Response(416, headers=headers)
+        if start in self.fail_at:
+            return httpx.Response(503)
+        headers["Content-Range"] = f"bytes {start}-{end}/{len(self.body)}"
+        return httpx.Response(206, content=self.body[start : end + 1], headers=headers)
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+
+    def ranges_fetched(self) -> list[str]:
+        return [
+            request.headers["range"]
+            for request in self.requests
+            if request.headers.get("range") != "bytes=0-0"
+        ]
+
+
+class TestDownloadRanges:
+    @pytest.mark.asyncio
+    async def test_downloads_in_ranges(self, tmp_path):
+        server = RangeServer()
+        async with server.client() as http_client:
+            result = await download_ranges(
+                http_client, "https://files/v.mp4", tmp_path / "v.mp4", chunk_size=1000
+            )
+
+        assert (tmp_path / "v.mp4").read_bytes() == BODY
+        assert result.size == len(BODY)
+        assert result.etag == '"v1"'
+        assert len(server.ranges_fetched()) == 11
+        assert "bytes=10000-10243" in server.ranges_fetched()
+        assert not (tmp_path / "v.mp4.part").exists()
+        assert not progress_path(tmp_path / "v.mp4").exists()
+
+    @pytest.mark.asyncio
+    async def test_resumes_after_failure(self, tmp_path):
+        server = RangeServer()
+        server.fail_at = {5000}
+        async with server.client() as http_client:
+            with pytest.raises(httpx.HTTPStatusError):
+                await download_ranges(
+                    http_client,
+                    "https://files/v.mp4",
+                    tmp_path / "v.mp4",
+                    chunk_size=1000,
+                    concurrency=1,
+                )
+            assert (tmp_path / "v.mp4.part").stat().st_size == len(BODY)
+
+            server.fail_at = set()
+            server.requests.clear()
+            await download_ranges(
+                http_client, "https://files/v.mp4", tmp_path / "v.mp4", chunk_size=1000
+            )
+
+        assert (tmp_path / "v.mp4").read_bytes() == BODY
+        assert sorted(server.ranges_fetched()) == [
+            "bytes=10000-10243",
+            "bytes=5000-5999",
+            "bytes=6000-6999",
+            "bytes=7000-7999",
+            "bytes=8000-8999",
+            "bytes=9000-9999",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_restarts_when_file_changed(self, tmp_path):
+        server = RangeServer()
+        server.fail_at = {3000}
+        async with server.client() as http_client:
+            with pytest.raises(httpx.HTTPStatusError):
+                await download_ranges(
+                    http_client,
+                    "https://files/v.mp4",
+                    tmp_path / "v.mp4",
+                    chunk_size=1000,
+                    concurrency=1,
+                )
+
+            server.fail_at = set()
+            server.body = BODY[::-1]
+            server.etag = '"v2"'
+            await download_ranges(
+                http_client, "https://files/v.mp4", tmp_path / "v.mp4", chunk_size=1000
+            )
+
+        assert (tmp_path / "v.mp4").read_bytes() == BODY[::-1]
+
+    @pytest.mark.asyncio
+    async def test_file_changed_during_download(self, tmp_path):
+        server = RangeServer()
+        original = server.handler
+
+        def handler(request):
+            response = original(request)
+            # Replaced on the server right after the first range was served
+            server.body, server.etag = BODY[::-1], '"v2"'
+            return response
+
+        server.handler = handler
+        async with server.client() as http_client:
+            with pytest.raises(RangeError):
+                await download_ranges(
+                    http_client, "https://files/v.mp4", tmp_path / "v.mp4", 1000
+                )
+
+    @pytest.mark.asyncio
+    async def test_falls_back_without_ranges(self, tmp_path):
+        server = RangeServer(ranges=False)
+        async with server.client() as http_client:
+            result = await download_ranges(
+                http_client, "https://files/v.mp4", tmp_path / "v.mp4", chunk_size=1000
+            )
+
+        assert (tmp_path / "v.mp4").read_bytes() == BODY
+        assert result.size == len(BODY)
+
+    @pytest.mark.asyncio
+    async def test_empty_file(self, tmp_path):
+        server = RangeServer(body=b"")
+        async with server.client() as http_client:
+            result = await download_ranges(
+                http_client, "https://files/v.mp4", tmp_path / "v.mp4"
+            )
+
+        assert (tmp_path / "v.mp4").read_bytes() == b""
+        assert result.size == 0
@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+from playerdatapy.downloads import RecordBatcher, RecordCounter
+
+
+def count(document: bytes, chunk_size: int) -> int:
+    counter = RecordCounter()
+    for start in range(0, len(document), chunk_size):
+        counter.feed(document[start : start + chunk_size])
+    counter.close()
+    return counter.records
+
+
+DOCUMENTS = [
+    (b"[]", 0),
+    (b" [ ] ", 0),
+    (b"[1]", 1),
+    (b"[1, 2.5, null]", 3),
+    (json.dumps([{"time": 1, "type": "GPS", "x": [1, 2]}] * 3).encode(), 3),
+    # Brackets, commas and escaped quotes inside strings aren't structure
+    (json.dumps([{"note": 'a, [b] {c} "d" \\'}, "e,f"]).encode(), 2),
+    (json.dumps({"meta": {"records": [1, 2]}, "records": [{"a": 1}] * 4}).encode(), 4),
+    (json.dumps({"other": [1, 2, 3]}).encode(), 0),
+    (json.dumps({"key": "records", "other": [1, 2, 3]}).encode(), 0),
+]
+
+
+class TestRecordCounter:
+    @pytest.mark.parametrize("document, expected", DOCUMENTS)
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 1 << 16])
+    def test_counts_records_across_chunk_boundaries(
+        self, document, expected, chunk_size
+    ):
+        assert count(document, chunk_size) == expected
+
+    @pytest.mark.parametrize(
+        "document",
+        [b"", b"[1, 2", b'[{"a": "b}]', b"[1]]", b"[1}", b"[1] [2]"],
+    )
+    def test_rejects_malformed_documents(self, document):
+        with pytest.raises(ValueError):
+            count(document, 2)
+
+
+class TestRecordBatcher:
+    @pytest.mark.parametrize("chunk_size", [1, 5, 1 << 16])
+    @pytest.mark.parametrize("wrap", [lambda r: r, lambda r: {"records": r}])
+    def test_batches_whole_records(self, chunk_size, wrap):
+        records = [{"i": i, "note": "a,]}"} for i in range(10)]
+        document = json.dumps(wrap(records)).encode()
+
+        batcher = RecordBatcher(4)
+        batches = []
+        for start in range(0, len(document), chunk_size):
+            batches += batcher.feed(document[start : start + chunk_size])
+        batches += batcher.close()
+
+        assert [json.loads(batch) for batch in batches] == [
+            records[0:4],
+            records[4:8],
+            records[8:10],
+        ]
+
+    def test_empty_array(self):
+        batcher = RecordBatcher(4)
+        assert batcher.feed(b"[ ]") == []
+        assert batcher.close() == []
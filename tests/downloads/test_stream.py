@@ -0,0 +1,96 @@
+import json
+
+import httpx
+import pytest
+
+from playerdatapy.downloads import conditional_headers, stream_to_file
+
+BODY = json.dumps([{"time": i, "type": "GPS"} for i in range(1000)]).encode()
+
+
+def client(body: bytes = BODY, status_code: int = 200, chunk_size: int = 100):
+    def handler(request):
+        chunks = [body[i : i + chunk_size] for i in range(0, len(body), chunk_size)]
+        return httpx.Response(status_code, stream=httpx.ByteStream(b"".join(chunks)))
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+class TestStreamToFile:
+    @pytest.mark.asyncio
+    async def test_writes_body_unchanged(self, tmp_path):
+        async with client() as http_client:
+            result = await stream_to_file(
+                http_client, "https://files/1.json", tmp_path / "1.json"
+            )
+
+        assert (tmp_path / "1.json").read_bytes() == BODY
+        assert result.size == len(BODY)
+        assert result.records is None
+        assert not (tmp_path / "1.json.part").exists()
+
+    @pytest.mark.asyncio
+    async def test_counts_records(self, tmp_path):
+        async with client() as http_client:
+            result = await stream_to_file(
+                http_client, "https://files/1.json", tmp_path / "1.json", True
+            )
+
+        assert result.records == 1000
+
+    @pytest.mark.asyncio
+    async def test_truncated_body_is_not_kept(self, tmp_path):
+        async with client(BODY[:-10]) as http_client:
+            with pytest.raises(ValueError):
+                await stream_to_file(
+                    http_client, "https://files/1.json", tmp_path / "1.json", True
+                )
+
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_error_status(self, tmp_path):
+        async with client(b"missing", status_code=404) as http_client:
+            with pytest.raises(httpx.HTTPStatusError):
+                await stream_to_file(
+                    http_client, "https://files/1.json", tmp_path / "1.json"
+                )
+
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_not_modified(self, tmp_path):
+        def handler(request):
+            if request.headers.get("if-none-match") == '"v1"':
+                return httpx.Response(304, headers={"ETag": '"v1"'})
+            return httpx.Response(200, content=BODY, headers={"ETag": '"v1"'})
+
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(handler)
+        ) as http_client:
+            first = await stream_to_file(
+                http_client, "https://files/1.json", tmp_path / "1.json"
+            )
+            second = await stream_to_file(
+                http_client,
+                "https://files/1.json",
+                tmp_path / "1.json",
+                headers=conditional_headers(first.etag),
+            )
+
+        assert first.etag == '"v1"'
+        assert not first.not_modified
+        assert second.not_modified
+        assert second.size == 0
+        assert (tmp_path / "1.json").read_bytes() == BODY
+
+
+class TestConditionalHeaders:
+    def test_prefers_etag(self):
+        assert conditional_headers('"v1"', "Mon, 01 Jan 2024 00:00:00 GMT") == {
+            "If-None-Match": '"v1"'
+        }
+        assert conditional_headers(None, "Mon, 01 Jan 2024 00:00:00 GMT") == {
+            "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"
+        }
+        assert conditional_headers() == {}
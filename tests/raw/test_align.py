@@ -0,0 +1,85 @@
+import polars as pl
+import pytest
+
+from playerdatapy.raw import Interpolation, SampleType, align, sample_schema
+
+
+def samples(sample_type, times, **columns):
+    schema = sample_schema(sample_type)
+    data = {"time": times, **columns}
+    return pl.DataFrame(
+        {name: data.get(name, [0] * len(times)) for name in schema},
+        schema=schema,
+    )
+
+
+GPS = samples(
+    SampleType.GPS, [0, 100, 200, 300], speed=[0.0, 1, 2, 3], satellites=[5, 6, 7, 8]
+)
+# 100 Hz, x counting up by one a sample
+ACCELERATION = samples(
+    SampleType.ACCELERATION, list(range(0, 300, 10)), x=[float(i) for i in range(30)]
+)
+HEARTBEAT = samples(SampleType.HEARTBEAT, [50, 850], rtor_ms=[800.0, 820.0])
+FRAMES = {
+    SampleType.GPS: GPS,
+    SampleType.ACCELERATION: ACCELERATION,
+    SampleType.HEARTBEAT: HEARTBEAT,
+}
+
+
+def column(frame, name):
+    return frame[name].to_list()
+
+
+class TestAlign:
+    def test_one_row_per_tick(self):
+        aligned = align(FRAMES).collect()
+
+        assert aligned.height == 9
+        assert aligned["time"].dt.epoch("ms").to_list() == list(range(0, 900, 100))
+        assert aligned.columns[:5] == [
+            "time",
+            "gps_latitude",
+            "gps_longitude",
+            "gps_speed",
+            "gps_satellites",
+        ]
+        assert aligned.schema["gps_satellites"] == pl.UInt8
+        assert aligned.schema["heartbeat_rtor_ms"] == pl.Float32
+
+    def test_linear(self):
+        aligned = align(FRAMES, tolerance="500ms").collect()
+
+        assert column(aligned, "gps_speed")[:4] == [0.0, 1.0, 2.0, 3.0]
+        # Ten samples a tick averaged, at their mean time, then interpolated
+        assert column(aligned, "acceleration_x")[:4] == [4.5, 10.0, 20.0, 24.5]
+        assert column(aligned, "heartbeat_rtor_ms")[4] == pytest.approx(808.75)
+        # Nothing within the tolerance
+        assert column(aligned, "acceleration_x")[8] is None
+
+    @pytest.mark.parametrize(
+        "interpolation, expected",
+        [
+            (Interpolation.PREVIOUS, [None, 4.5, 14.5, 24.5]),
+            (Interpolation.NEAREST, [4.5, 14.5, 24.5, 24.5]),
+        ],
+    )
+    def test_previous_and_nearest(self, interpolation, expected):
+        aligned = align(FRAMES, interpolation=interpolation).collect()
+
+        assert column(aligned, "acceleration_x")[:4] == expected
+
+    def test_aligns_groups_separately(self):
+        later = GPS.with_columns(pl.col("time") + pl.duration(seconds=10))
+        frame = pl.concat(
+            [
+                GPS.with_columns(participation_id=pl.lit("sp-1")),
+                later.with_columns(participation_id=pl.lit("sp-2")),
+            ]
+        )
+        aligned = align({SampleType.GPS: frame.lazy()}, by="participation_id")
+
+        frames = aligned.collect().partition_by("participation_id", as_dict=True)
+        assert frames[("sp-1",)].height == frames[("sp-2",)].height == 4
+        assert column(frames[("sp-2",)], "gps_speed") == [0.0, 1.0, 2.0, 3.0]
@@ -0,0 +1,168 @@
+import asyncio
+import json
+
+import httpx
+import polars as pl
+import pytest
+
+from playerdatapy.enums import RawDataExportFormatEnum, RawDataExportTypeEnum
+from playerdatapy.gqlauth import AuthenticationType
+from playerdatapy.playerdata_api import PlayerDataAPI
+from playerdatapy.raw import OutputFormat, ParsePool, SampleType
+
+SAMPLES = [
+    {"time": 1000, "type": "GPS", "latitude": 51.5, "longitude": -0.1},
+    {"time": 1000, "type": "HEARTBEAT", "rtor_ms": 800},
+]
+
+
+def make_api(tmp_path):
+    return PlayerDataAPI(
+        client_id="test_client",
+        token_file=tmp_path / "token.json",
+        authentication_type=AuthenticationType.CLIENT_CREDENTIALS_FLOW,
+    )
+
+
+def files_client(requests):
+    def handler(request):
+        requests.append(request)
+        if request.url.path.endswith(".csv"):
+            return httpx.Response(200, content=b"time,latitude\n1000,51.5\n")
+        return httpx.Response(200, content=json.dumps(SAMPLES).encode())
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def fake_wait_for(delays, statuses=None):
+    statuses = statuses or {}
+
+    async def wait_for(job, timeout=None):
+        id = job.poll()._variables["sessionParticipationId"]["value"]
+        await asyncio.sleep(delays.get(id, 0))
+        status = statuses.get(id, "READY")
+        url = f"https://storage.example/{id}.json" if status == "READY" else None
+        return {"status": status, "downloadUrl": url, "errors": []}
+
+    return wait_for
+
+
+class TestExportRaw:
+    @pytest.mark.asyncio
+    async def test_yields_exports_as_they_finish(self, tmp_path):
+        api = make_api(tmp_path)
+        api.wait_for = fake_wait_for({"slow": 0.05, "fast": 0})
+        requests = []
+        async with files_client(requests) as http_client:
+            exports = [
+                export
+                async for export in api.export_raw(
+                    ["slow", "fast"],
+                    directory=tmp_path / "out",
+                    http_client=http_client,
+                )
+            ]
+
+        assert [export.session_participation_id for export in exports] == [
+            "fast",
+            "slow",
+        ]
+        fast = exports[0]
+        assert fast.error is None
+        assert fast.path == tmp_path / "out" / "fast.json"
+        assert set(fast.files) == {SampleType.GPS, SampleType.HEARTBEAT}
+        gps = pl.read_parquet(fast.files[SampleType.GPS])
+        assert gps["latitude"].to_list() == [51.5]
+        # Storage URLs don't get the API token
+        assert all("authorization" not in request.headers for request in requests)
+
+    @pytest.mark.asyncio
+    async def test_unavailable_and_failed_exports(self, tmp_path):
+        api = make_api(tmp_path)
+        api.wait_for = fake_wait_for({}, {"none": "UNAVAILABLE"})
+
+        def handler(request):
+            return httpx.Response(404)
+
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(handler)
+        ) as http_client:
+            exports = {
+                export.session_participation_id: export
+                async for export in api.export_raw(
+                    ["none", "missing"], directory=tmp_path, http_client=http_client
+                )
+            }
+
+        assert exports["none"].status == "UNAVAILABLE"
+        assert exports["none"].error is None
+        assert exports["none"].path is None
+        assert isinstance(exports["missing"].error, httpx.HTTPStatusError)
+
+    @pytest.mark.asyncio
+    async def test_csv_export_to_ipc(self, tmp_path):
+        api = make_api(tmp_path)
+
+        async def wait_for(job, timeout=None):
+            return {"status": "READY", "downloadUrl": "https://storage.example/1.csv"}
+
+        api.wait_for = wait_for
+        async with files_client([]) as http_client:
+            exports = [
+                export
+                async for export in api.export_raw(
+                    ["sp-1"],
+                    data_type=RawDataExportTypeEnum.GPS,
+                    format=RawDataExportFormatEnum.CSV,
+                    directory=tmp_path,
+                    output=OutputFormat.IPC,
+                    http_client=http_client,
+                )
+            ]
+
+        assert exports[0].table == tmp_path / "sp-1" / "gps.ipc"
+        assert pl.read_ipc(exports[0].table)["latitude"].to_list() == [51.5]
+
+    @pytest.mark.asyncio
+    async def test_converts_in_pool(self, tmp_path):
+        api = make_api(tmp_path)
+        api.wait_for = fake_wait_for({})
+        with ParsePool(max_workers=1) as pool:
+            async with files_client([]) as http_client:
+                exports = [
+                    export
+                    async for export in api.export_raw(
+                        ["sp-1", "sp-2"],
+                        directory=tmp_path,
+                        http_client=http_client,
+                        pool=pool,
+                    )
+                ]
+
+        assert all(export.error is None for export in exports)
+        assert pl.read_parquet(exports[0].files[SampleType.HEARTBEAT]).height == 1
+
+    @pytest.mark.asyncio
+    async def test_caps_exports_polled_at_once(self, tmp_path):
+        api = make_api(tmp_path)
+        polling = []
+        peak = 0
+
+        async def wait_for(job, timeout=None):
+            nonlocal peak
+            polling.append(job)
+            peak = max(peak, len(polling))
+            await asyncio.sleep(0.01)
+            polling.remove(job)
+            return {"status": "UNAVAILABLE"}
+
+        api.wait_for = wait_for
+        exports = [
+            export
+            async for export in api.export_raw(
+                [f"sp-{i}" for i in range(10)], directory=tmp_path, max_polling=3
+            )
+        ]
+
+        assert len(exports) == 10
+        assert peak == 3
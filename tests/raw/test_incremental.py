@@ -0,0 +1,82 @@
+import io
+import json
+
+import polars as pl
+import pytest
+
+from playerdatapy.raw import (
+    SampleType,
+    aiter_raw_batches,
+    iter_raw_batches,
+    parse_raw,
+)
+
+SAMPLES = [
+    sample
+    for i in range(25)
+    for sample in (
+        {"time": 1000 * i, "type": "GPS", "latitude": 51.0, "speed": float(i)},
+        {"time": 1000 * i + 10, "type": "ACCELERATION", "x": 0.1, "y": i, "z": 9.8},
+        {"time": 1000 * i + 20, "type": "ACCELERATION", "x": 0.2, "y": i, "z": 9.8},
+    )
+]
+DOCUMENT = json.dumps(SAMPLES).encode()
+
+
+def combined(batches):
+    frames = {}
+    for sample_type, batch in batches:
+        frames.setdefault(sample_type, []).append(batch)
+    return {sample_type: pl.concat(parts) for sample_type, parts in frames.items()}
+
+
+class TestIterRawBatches:
+    @pytest.mark.parametrize(
+        "source",
+        [
+            lambda tmp_path: io.BytesIO(DOCUMENT),
+            lambda tmp_path: [DOCUMENT[i : i + 7] for i in range(0, len(DOCUMENT), 7)],
+            lambda tmp_path: write(tmp_path),
+        ],
+        ids=["file", "chunks", "path"],
+    )
+    def test_fixed_size_batches(self, source, tmp_path):
+        batches = list(iter_raw_batches(source(tmp_path), batch_size=10, chunk_size=64))
+
+        sizes = {}
+        for sample_type, batch in batches:
+            sizes.setdefault(sample_type, []).append(batch.height)
+        assert sizes == {
+            SampleType.GPS: [10, 10, 5],
+            SampleType.ACCELERATION: [10, 10, 10, 10, 10],
+        }
+
+    def test_matches_parse_raw(self):
+        whole = parse_raw(DOCUMENT)
+        frames = combined(iter_raw_batches([DOCUMENT], batch_size=7))
+
+        assert frames[SampleType.GPS].equals(whole[SampleType.GPS])
+        assert frames[SampleType.ACCELERATION].equals(whole[SampleType.ACCELERATION])
+
+    def test_truncated_file(self):
+        with pytest.raises(ValueError):
+            list(iter_raw_batches([DOCUMENT[:-5]], batch_size=10))
+
+    @pytest.mark.asyncio
+    async def test_async_chunks(self):
+        async def chunks():
+            for i in range(0, len(DOCUMENT), 100):
+                yield DOCUMENT[i : i + 100]
+
+        batches = [item async for item in aiter_raw_batches(chunks(), batch_size=10)]
+
+        assert combined(batches)[SampleType.GPS].equals(
+            parse_raw(DOCUMENT)[SampleType.GPS]
+        )
+        assert max(batch.height for _, batch in batches) == 10
+
+
+def write(tmp_path):
+    path = tmp_path / "samples.json"
+    path.write_bytes(DOCUMENT)
+    return path
@@ -0,0 +1,123 @@
+import json
+from datetime import date, datetime, timezone
+
+import polars as pl
+
+from playerdatapy.raw import RawLake, SampleType, parse_raw, scan
+
+# 23:59:59.500 and 00:00:00.500 UTC, either side of midnight
+BEFORE_MIDNIGHT = 1_700_006_399_500
+AFTER_MIDNIGHT = 1_700_006_400_500
+
+SAMPLES = [
+    {"time": AFTER_MIDNIGHT, "type": "GPS", "latitude": 51.75, "longitude": -0.1},
+    {"time": BEFORE_MIDNIGHT, "type": "GPS", "latitude": 51.5, "longitude": -0.1},
+    {"time": BEFORE_MIDNIGHT, "type": "HEARTBEAT", "rtor_ms": 800},
+]
+
+
+def datafile(tmp_path):
+    path = tmp_path / "participation.json"
+    path.write_text(json.dumps(SAMPLES))
+    return path
+
+
+class TestRawLake:
+    def test_partitions_by_club_date_participation_and_type(self, tmp_path):
+        lake = RawLake(tmp_path / "lake")
+        written = lake.write("club-1", "sp-1", parse_raw(datafile(tmp_path)))
+
+        assert len(written) == 3
+        assert lake.partition("club-1", date(2023, 11, 15), "sp-1", SampleType.GPS) == (
+            tmp_path
+            / "lake/club_id=club-1/date=2023-11-15/participation_id=sp-1/type=GPS"
+        )
+        gps = (
+            lake.scan("club-1", types=[SampleType.GPS])
+            .select("date", "latitude")
+            .sort("latitude")
+            .collect()
+        )
+        assert gps["date"].cast(str).to_list() == ["2023-11-14", "2023-11-15"]
+        assert gps["latitude"].to_list() == [51.5, 51.75]
+
+    def test_rows_sorted_with_statistics(self, tmp_path):
+        lake = RawLake(tmp_path, row_group_size=2)
+        frame = pl.DataFrame(
+            {"time": [3, 1, 2], "rtor_ms": [3, 1, 2]},
+            schema={"time": pl.Datetime("ms", "UTC"), "rtor_ms": pl.Float32},
+        )
+        (path,) = lake.append("club-1", "sp-1", SampleType.HEARTBEAT, frame)
+
+        assert pl.read_parquet(path)["rtor_ms"].to_list() == [1.0, 2.0, 3.0]
+        assert not list(path.parent.glob(".*.tmp"))
+
+    def test_rewriting_replaces_participation(self, tmp_path):
+        lake = RawLake(tmp_path / "lake")
+        lake.write_datafile("club-1", "sp-1", datafile(tmp_path), batch_size=1)
+        lake.write_datafile("club-1", "sp-1", datafile(tmp_path))
+        lake.write_datafile("club-1", "sp-2", datafile(tmp_path))
+
+        counts = (
+            lake.scan("club-1", types=[SampleType.GPS])
+            .group_by("participation_id")
+            .len()
+            .collect()
+        )
+        assert dict(counts.iter_rows()) == {"sp-1": 2, "sp-2": 2}
+
+        lake.remove("club-1", "sp-1")
+        assert lake.scan("club-1", types=[SampleType.HEARTBEAT]).select(
+            "participation_id"
+        ).unique().collect().item() == ("sp-2")
+
+
+class TestScan:
+    def lake(self, tmp_path):
+        lake = RawLake(tmp_path / "lake")
+        for participation_id in ("sp-1", "sp-2"):
+            lake.write_datafile("club-1", participation_id, datafile(tmp_path))
+        lake.write_datafile("club-2", "sp-3", datafile(tmp_path))
+        return lake
+
+    def test_scans_types_together(self, tmp_path):
+        lake = self.lake(tmp_path)
+        frame = scan("club-1", root=lake.root).collect()
+
+        assert frame.height == 6
+        assert set(frame["type"]) == {"GPS", "HEARTBEAT"}
+        assert frame.schema["rtor_ms"] == pl.Float32
+        assert frame.filter(pl.col("type") == "GPS")["rtor_ms"].null_count() == 4
+
+    def test_filters_time_participation_and_type(self, tmp_path):
+        lake = self.lake(tmp_path)
+        frame = lake.scan(
+            "club-1",
+            start=datetime(2023, 11, 15),
+            end=date(2023, 11, 16),
+            types=[SampleType.GPS],
+            participation_ids=["sp-2"],
+        )
+
+        assert frame.select("participation_id", "latitude").collect(
+            engine="streaming"
+        ).rows() == [("sp-2", 51.75)]
+
+    def test_end_is_exclusive(self, tmp_path):
+        lake = self.lake(tmp_path)
+        end = datetime.fromtimestamp(AFTER_MIDNIGHT / 1000, timezone.utc)
+
+        assert lake.scan("club-1", end=end).collect().height == 4
+
+    def test_nothing_to_scan(self, tmp_path):
+        frame = scan("club-9", types=[SampleType.HEARTBEAT], root=tmp_path).collect()
+
+        assert frame.is_empty()
+        assert frame.columns == [
+            "time",
+            "rtor_ms",
+            "club_id",
+            "date",
+            "participation_id",
+            "type",
+        ]
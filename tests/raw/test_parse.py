@@ -0,0 +1,98 @@
+import json
+from datetime import datetime, timezone
+
+import polars as pl
+import pytest
+
+from playerdatapy.raw import (
+    OutputFormat,
+    SampleType,
+    parse_raw,
+    sample_schema,
+    write_raw,
+)
+
+SAMPLES = [
+    {
+        "time": 2000,
+        "type": "GPS",
+        "latitude": 51.5,
+        "longitude": -0.1,
+        "speed": 3.5,
+        "satellites": 9,
+    },
+    {
+        "time": 1000,
+        "type": "GPS",
+        "latitude": 51.4,
+        "longitude": -0.2,
+        "speed": 3,
+        "satellites": 8,
+    },
+    {"time": 1500, "type": "ACCELERATION", "x": 0.1, "y": 0.2, "z": 9.8},
+    {"time": 1500, "type": "DEVICE_ORIENTATION", "x": 0, "y": 0, "z": 0, "w": 1},
+    {"time": 1200, "type": "HEARTBEAT", "rtor_ms": 812},
+    {"time": 1300, "type": "UNKNOWN", "value": 1},
+]
+
+
+def at(ms):
+    return datetime.fromtimestamp(ms / 1000, timezone.utc)
+
+
+class TestParseRaw:
+    @pytest.mark.parametrize(
+        "source",
+        [
+            lambda tmp_path: SAMPLES,
+            lambda tmp_path: json.dumps(SAMPLES).encode(),
+            lambda tmp_path: write_json(tmp_path),
+        ],
+        ids=["list", "bytes", "path"],
+    )
+    def test_sources(self, source, tmp_path):
+        frames = parse_raw(source(tmp_path))
+
+        assert set(frames) == set(SampleType)
+        for sample_type, frame in frames.items():
+            assert frame.schema == pl.Schema(sample_schema(sample_type))
+
+        gps = frames[SampleType.GPS]
+        assert gps["time"].to_list() == [at(1000), at(2000)]
+        assert gps["satellites"].to_list() == [8, 9]
+        assert frames[SampleType.HEARTBEAT]["rtor_ms"].to_list() == [812.0]
+        assert frames[SampleType.DEVICE_ORIENTATION]["w"].to_list() == [1.0]
+
+    def test_missing_types_are_empty_typed_frames(self):
+        frames = parse_raw([{"time": 1, "type": "GPS", "latitude": 1.0}])
+
+        acceleration = frames[SampleType.ACCELERATION]
+        assert acceleration.is_empty()
+        assert acceleration.columns == ["time", "x", "y", "z"]
+
+    def test_empty_file(self):
+        frames = parse_raw(b"[]")
+        assert all(frame.is_empty() for frame in frames.values())
+
+
+class TestWriteRaw:
+    @pytest.mark.parametrize(
+        "format, read",
+        [(OutputFormat.PARQUET, pl.read_parquet), (OutputFormat.IPC, pl.read_ipc)],
+    )
+    def test_round_trip(self, tmp_path, format, read):
+        frames = parse_raw(SAMPLES)
+        frames[SampleType.HEARTBEAT] = frames[SampleType.HEARTBEAT].clear()
+
+        written = write_raw(frames, tmp_path / "out", format)
+
+        # Empty frames aren't written
+        assert set(written) == set(SampleType) - {SampleType.HEARTBEAT}
+        assert written[SampleType.GPS] == tmp_path / "out" / f"gps.{format.value}"
+        assert read(written[SampleType.GPS]).equals(frames[SampleType.GPS])
+
+
+def write_json(tmp_path):
+    path = tmp_path / "samples.json"
+    path.write_text(json.dumps(SAMPLES))
+    return path
@@ -0,0 +1,52 @@
+import json
+
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from playerdatapy.raw import (
+    ParsePool,
+    SampleType,
+    from_ipc,
+    parse_raw,
+    parse_to_ipc,
+)
+
+SAMPLES = [
+    {"time": 2000, "type": "GPS", "latitude": 51.5, "longitude": -0.1},
+    {"time": 1000, "type": "GPS", "latitude": 51.25, "longitude": -0.1},
+    {"time": 1000, "type": "HEARTBEAT", "rtor_ms": 800},
+]
+
+
+@pytest.fixture(scope="module")
+def pool():
+    with ParsePool(max_workers=2) as pool:
+        yield pool
+
+
+class TestIpc:
+    def test_round_trip(self):
+        data = json.dumps(SAMPLES).encode()
+        frames = from_ipc(parse_to_ipc(data))
+
+        assert set(frames) == set(SampleType)
+        for sample_type, frame in parse_raw(data).items():
+            assert_frame_equal(frames[sample_type], frame)
+
+
+class TestParsePool:
+    @pytest.mark.asyncio
+    async def test_parses_in_workers(self, pool, tmp_path):
+        path = tmp_path / "participation.json"
+        path.write_text(json.dumps(SAMPLES))
+
+        frames = await pool.parse(path)
+
+        assert frames[SampleType.GPS]["latitude"].to_list() == [51.25, 51.5]
+        assert frames[SampleType.ACCELERATION].is_empty()
+
+    @pytest.mark.asyncio
+    async def test_errors_raised_to_caller(self, pool):
+        with pytest.raises(pl.exceptions.ComputeError):
+            await pool.parse(b"[{")
@@ -0,0 +1,231 @@
+import asyncio
+import json
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+
+from playerdatapy import backfill as backfill_module
+from playerdatapy.backfill import (
+    Backfill,
+    BackfillCheckpoint,
+    BackfillStats,
+    ParticipationStatus,
+)
+from playerdatapy.cli import build_parser, main
+from playerdatapy.downloads import DownloadManager
+from playerdatapy.gqlauth import AuthenticationType
+from playerdatapy.playerdata_api import PlayerDataAPI
+from playerdatapy.raw import RawLake, SampleType
+
+START = datetime(2025, 7, 1, tzinfo=timezone.utc)
+END = datetime(2026, 6, 1, tzinfo=timezone.utc)
+
+SESSIONS = [{"id": f"s{i}", "startTime": "2025-08-01T10:00:00Z"} for i in range(3)]
+PARTICIPATIONS = {
+    "s0": ["p0", "p1", "p2"],
+    "s1": ["p3"],
+    "s2": [],
+}
+
+
+def participation(participation_id):
+    return {
+        "id": participation_id,
+        "datafiles": [{"url": f"https://storage.example/{participation_id}.json"}],
+    }
+
+
+def make_api(tmp_path, queries, delays=None):
+    api = PlayerDataAPI(
+        client_id="test_client",
+        token_file=tmp_path / "token.json",
+        authentication_type=AuthenticationType.CLIENT_CREDENTIALS_FLOW,
+    )
+
+    async def run_queries(operation_name, field):
+        queries.append(operation_name)
+        if operation_name == "backfillSessions":
+            offset = field._variables["offset"]["value"]
+            return {"sessions": SESSIONS[offset : offset + 2]}
+        session_id = field._variables["id"]["value"]
+        offset = field._subfields[0]._variables["offset"]["value"]
+        await asyncio.sleep((delays or {}).get((session_id, offset), 0))
+        page = PARTICIPATIONS[session_id][offset : offset + 2]
+        return {"session": {"sessionParticipations": [participation(p) for p in page]}}
+
+    api.run_queries = run_queries
+    return api
+
+
+class Storage:
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.requests = []
+
+    def handler(self, request):
+        participation_id = request.url.path.strip("/").removesuffix(".json")
+        self.requests.append(participation_id)
+        if participation_id in self.failing:
+            return httpx.Response(404)
+        samples = [
+            {"time": 1754042400000, "type": "GPS", "latitude": 51.5, "longitude": 0.0}
+        ]
+        return httpx.Response(200, content=json.dumps(samples).encode())
+
+    def client(self):
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+
+
+@pytest.fixture(autouse=True)
+def small_pages(monkeypatch):
+    monkeypatch.setattr(backfill_module, "_PAGE_SIZE", 2)
+
+
+async def run(tmp_path, storage, queries=None, on_progress=None, delays=None):
+    lake = RawLake(tmp_path / "lake")
+    with BackfillCheckpoint(tmp_path / "checkpoint.sqlite") as checkpoint:
+        async with storage.client() as http_client:
+            stats = await Backfill(
+                make_api(tmp_path, queries if queries is not None else [], delays),
+                "club-1",
+                START,
+                END,
+                checkpoint,
+                lake=lake,
+                max_downloads=2,
+                http_client=http_client,
+            ).run(on_progress)
+        return stats, checkpoint.counts(), lake
+
+
+class TestBackfill:
+    @pytest.mark.asyncio
+    async def test_writes_every_participation(self, tmp_path):
+        storage = Storage()
+        events = []
+
+        async def on_progress(event):
+            events.append((event.participation_id, event.status))
+
+        stats, counts, lake = await run(tmp_path, storage, on_progress=on_progress)
+
+        assert stats.sessions == 3
+        assert stats.written == stats.files == 4
+        assert counts[ParticipationStatus.DONE] == 4
+        assert sorted(events) == [(f"p{i}", ParticipationStatus.DONE) for i in range(4)]
+        frame = lake.scan("club-1", types=[SampleType.GPS]).collect()
+        assert sorted(frame["participation_id"]) == ["p0", "p1", "p2", "p3"]
+        # Downloads are removed once written
+        assert not list((lake.root / ".downloads").glob("*/*"))
+
+    @pytest.mark.asyncio
+    async def test_resumes_where_it_stopped(self, tmp_path):
+        stats, counts, _ = await run(tmp_path, Storage(failing={"p1"}))
+        assert stats.failed == 1
+        assert counts[ParticipationStatus.FAILED] == 1
+
+        storage = Storage()
+        queries = []
+        stats, counts, lake = await run(tmp_path, storage, queries)
+
+        assert storage.requests == ["p1"]
+        assert stats.skipped == 2
+        assert stats.written == 1
+        assert counts == {
+            ParticipationStatus.PENDING: 0,
+            ParticipationStatus.DONE: 4,
+            ParticipationStatus.FAILED: 0,
+        }
+        # Only the session with the failure is listed again
+        assert queries.count("backfillParticipations") == 2
+
+        storage = Storage()
+        stats, _, _ = await run(tmp_path, storage)
+        assert storage.requests == []
+        assert stats.participations == 0
+
+    @pytest.mark.asyncio
+    async def test_retries_failure_listed_after_the_rest_are_done(self, tmp_path):
+        # s0's second page, with the failing p2, is listed after p0 and p1 are
+        # written, so s0 mustn't be marked done with them.
+        stats, counts, _ = await run(
+            tmp_path, Storage(failing={"p2"}), delays={("s0", 2): 0.2}
+        )
+        assert stats.failed == 1
+        assert counts[ParticipationStatus.FAILED] == 1
+
+        storage = Storage()
+        stats, counts, _ = await run(tmp_path, storage)
+
+        assert storage.requests == ["p2"]
+        assert stats.written == 1
+        assert counts[ParticipationStatus.DONE] == 4
+
+    @pytest.mark.asyncio
+    async def test_downloads_datafiles_together(self, tmp_path):
+        storage = Storage()
+        runs = []
+        with BackfillCheckpoint(tmp_path / "checkpoint.sqlite") as checkpoint:
+            async with storage.client() as http_client:
+                backfill = Backfill(
+                    make_api(tmp_path, []),
+                    "club-1",
+                    START,
+                    END,
+                    checkpoint,
+                    lake=RawLake(tmp_path / "lake"),
+                    max_per_host=1,
+                    http_client=http_client,
+                )
+                manager = DownloadManager(http_client, max_per_host=1)
+                original_run = manager.run
+
+                async def run_tasks(tasks):
+                    runs.append([task.url for task in tasks])
+                    return await original_run(tasks)
+
+                manager.run = run_tasks
+                participation = {
+                    "id": "p0",
+                    "datafiles": [
+                        {"url": "https://storage.example/p0.json"},
+                        {"url": "https://storage.example/p1.json"},
+                    ],
+                }
+                files = await backfill._download_and_write(
+                    participation,
+                    lambda client: manager,
+                    http_client,
+                    asyncio.Semaphore(1),
+                    BackfillStats(),
+                )
+
+        assert runs == [
+            ["https://storage.example/p0.json", "https://storage.example/p1.json"]
+        ]
+        assert files == 2
+
+
+class TestCli:
+    def test_parses_backfill(self):
+        args = build_parser().parse_args(
+            ["--client-id", "id", "backfill", "club-1", "--start", "2025-07-01"]
+            + ["--end", "2026-06-01T00:00:00+01:00", "--processes", "0"]
+            + ["--downloads-per-host", "2"]
+        )
+
+        assert args.club_id == "club-1"
+        assert args.start == START
+        assert args.end.utcoffset().total_seconds() == 3600
+        assert args.processes == 0
+        assert args.downloads_per_host == 2
+
+    def test_requires_client_id(self, monkeypatch, capsys):
+        monkeypatch.delenv("CLIENT_ID", raising=False)
+
+        assert (
+            main(["backfill", "club-1", "--start", "2025-07-01", "--end", "2026-06-01"])
+            == 2
+        )
+        assert "client ID" in capsys.readouterr().out
@@ -0,0 +1,182 @@
+import asyncio
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from playerdatapy.client_pool import ClientPool
+from playerdatapy.rate_limit import MemoryBackend
+
+
+class FakeApi:
+    """Mock transport standing in for the token endpoint and GraphQL API."""
+
+    def __init__(self, delay: float = 0):
+        self.delay = delay
+        self.calls: list[tuple[str, float]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/oauth/token":
+            client_id = dict(
+                pair.split("=") for pair in request.content.decode().split("&")
+            )["client_id"]
+            return httpx.Response(
+                200,
+                json={"access_token": client_id, "token_type": "Bearer"},
+            )
+
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        tenant = request.headers["Authorization"].removeprefix("Bearer ")
+        self.calls.append((tenant, time.monotonic()))
+        return httpx.Response(200, json={"data": {"tenant": tenant}})
+
+
+class FailingBackend(MemoryBackend):
+    """Fails the next ``failures`` per-IP slots, like an unreadable file."""
+
+    failures = 0
+
+    async def acquire(self, key: str, limit: int, period: float) -> float:
+        if key == "ip" and self.failures:
+            self.failures -= 1
+            raise OSError("rate limit file unreadable")
+        return await super().acquire(key, limit, period)
+
+
+async def query(api):
+    return api.client.get_data(await api.client.execute("query { tenant }"))
+
+
+class TestClientPool:
+    @pytest.fixture(autouse=True)
+    def quiet(self):
+        with patch("builtins.print"):
+            yield
+
+    def add_clients(self, pool, tmp_path, *names):
+        return [
+            pool.add_client(name, client_id=name, token_file=tmp_path / f"{name}.json")
+            for name in names
+        ]
+
+    @pytest.mark.asyncio
+    async def test_tenants_share_transport_with_own_tokens(self, tmp_path):
+        fake_api = FakeApi()
+        async with ClientPool(transport=httpx.MockTransport(fake_api)) as pool:
+            club_a, club_b = self.add_clients(pool, tmp_path, "club-a", "club-b")
+
+            assert pool["club-a"] is club_a
+            assert await query(club_a) == {"tenant": "club-a"}
+            assert await query(club_b) == {"tenant": "club-b"}
+
+            # Closing one tenant's client leaves the shared pool usable
+            await club_a.http_client.aclose()
+            assert await query(club_b) == {"tenant": "club-b"}
+
+    def test_duplicate_name_rejected(self, tmp_path):
+        pool = ClientPool(transport=httpx.MockTransport(FakeApi()))
+        self.add_clients(pool, tmp_path, "club-a")
+        with pytest.raises(ValueError):
+            self.add_clients(pool, tmp_path, "club-a")
+
+    @pytest.mark.asyncio
+    async def test_per_token_limit_is_per_tenant(self, tmp_path):
+        fake_api = FakeApi()
+        pool = ClientPool(
+            transport=httpx.MockTransport(fake_api), per_token_limit=3, period=0.3
+        )
+        club_a, club_b = self.add_clients(pool, tmp_path, "club-a", "club-b")
+        for api in (club_a, club_b):
+            await api.warm_up(connections=0)
+
+        start = time.monotonic()
+        await asyncio.gather(*(query(club_a) for _ in range(6)), query(club_b))
+
+        a_times = sorted(
+            t - start for tenant, t in fake_api.calls if tenant == "club-a"
+        )
+        b_times = [t - start for tenant, t in fake_api.calls if tenant == "club-b"]
+        # club-a's fourth request waits for its own window; club-b is not held up
+        assert a_times[3] >= 0.25
+        assert b_times[0] < 0.1
+        await pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_max_in_flight(self, tmp_path):
+        fake_api = FakeApi(delay=0.05)
+        pool = ClientPool(transport=httpx.MockTransport(fake_api), max_in_flight=2)
+        (club_a,) = self.add_clients(pool, tmp_path, "club-a")
+
+        await asyncio.gather(*(query(club_a) for _ in range(6)))
+
+        assert fake_api.max_in_flight == 2
+        await pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_fair_share_of_ip_budget(self, tmp_path):
+        fake_api = FakeApi()
+        pool = ClientPool(
+            transport=httpx.MockTransport(fake_api), per_ip_limit=2, period=0.1
+        )
+        big, small = self.add_clients(pool, tmp_path, "big-club", "small-club")
+        for api in (big, small):
+            await api.warm_up(connections=0)
+
+        big_backlog = [asyncio.create_task(query(big)) for _ in range(20)]
+        await asyncio.sleep(0)
+        await asyncio.gather(*(query(small) for _ in range(3)))
+
+        # small-club's requests were interleaved with the backlog, not queued behind it
+        order = [tenant for tenant, _ in fake_api.calls]
+        assert order.count("big-club") < 10
+        await asyncio.gather(*big_backlog)
+        await pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_backend_errors_reach_callers(self, tmp_path):
+        backend = FailingBackend()
+        pool = ClientPool(transport=httpx.MockTransport(FakeApi()), backend=backend)
+        (club_a,) = self.add_clients(pool, tmp_path, "club-a")
+        await club_a.warm_up(connections=0)
+        backend.failures = 1
+
+        async with asyncio.timeout(1):
+            results = await asyncio.gather(
+                *(query(club_a) for _ in range(3)), return_exceptions=True
+            )
+
+        assert [type(r) for r in results].count(OSError) == 1
+        assert results.count({"tenant": "club-a"}) == 2
+        await pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_callers_take_no_ip_slot(self, tmp_path):
+        fake_api = FakeApi(delay=0.05)
+        pool = ClientPool(
+            transport=httpx.MockTransport(fake_api),
+            max_in_flight=1,
+            per_ip_limit=3,
+            period=10,
+        )
+        (club_a,) = self.add_clients(pool, tmp_path, "club-a")
+        # Takes the first IP slot
+        await club_a.warm_up(connections=0)
+
+        first = asyncio.create_task(query(club_a))
+        cancelled = asyncio.create_task(query(club_a))
+        await asyncio.sleep(0.01)
+        cancelled.cancel()
+        await first
+
+        # The cancelled caller's IP slot is still free for this one
+        async with asyncio.timeout(1):
+            assert await query(club_a) == {"tenant": "club-a"}
+        await pool.aclose()
@@ -1,18 +1,26 @@
+import asyncio
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import httpx
 import pytest
 from oauthlib.oauth2 import TokenExpiredError  # type: ignore[import-untyped]
 
+from playerdatapy.auth.client_credentials_flow import ClientCredentialsFlow
 from playerdatapy.auth.token_storage import default_token_path
 from playerdatapy.constants import API_BASE_URL
-from playerdatapy.gqlauth import GraphqlAuth, AuthenticationType
+from playerdatapy.gqlauth import BearerTokenAuth, GraphqlAuth, AuthenticationType
 
 
 class TestGraphqlAuth:
     """Tests for GraphqlAuth class."""
 
-    @patch("playerdatapy.gqlauth.OAuth2Session")
+    @patch("requests_oauthlib.OAuth2Session")
     @patch("playerdatapy.gqlauth.ClientCredentialsFlow")
     def test_init_client_credentials_flow(self, mock_flow_class, mock_session_class):
         """Test GraphqlAuth initialization with CLIENT_CREDENTIALS_FLOW."""
@@ -41,7 +49,7 @@ class TestGraphqlAuth:
             "test_client", "test_secret", default_token_path(), API_BASE_URL
         )
 
-    @patch("playerdatapy.gqlauth.OAuth2Session")
+    @patch("requests_oauthlib.OAuth2Session")
     @patch("playerdatapy.gqlauth.AuthorisationCodeFlow")
     def test_init_authorisation_code_flow(self, mock_flow_class, mock_session_class):
         """Test GraphqlAuth initialization with AUTHORISATION_CODE_FLOW."""
@@ -72,7 +80,7 @@ class TestGraphqlAuth:
             "test_client", 9999, "test_secret", Path(".test_token"), API_BASE_URL
         )
 
-    @patch("playerdatapy.gqlauth.OAuth2Session")
+    @patch("requests_oauthlib.OAuth2Session")
     @patch("playerdatapy.gqlauth.AuthorisationCodeFlowPCKE")
     def test_init_authorisation_code_flow_pcke(
         self, mock_flow_class, mock_session_class
@@ -100,7 +108,7 @@ class TestGraphqlAuth:
             "test_client", 8888, Path(".test_token"), API_BASE_URL
         )
 
-    @patch("playerdatapy.gqlauth.OAuth2Session")
+    @patch("requests_oauthlib.OAuth2Session")
     @patch("playerdatapy.gqlauth.ClientCredentialsFlow")
     def test_init_with_base_url(self, mock_flow_class, mock_session_class):
         """Test base_url overrides the default and reaches the flow and refresh URL."""
@@ -118,6 +126,7 @@ class TestGraphqlAuth:
             type=AuthenticationType.CLIENT_CREDENTIALS_FLOW,
             base_url="https://preview.playerdata.co.uk",
         )
+        auth.authenticated_session
 
         assert auth.api_base_url == "https://preview.playerdata.co.uk"
         mock_flow_class.assert_called_once_with(
@@ -133,7 +142,7 @@ class TestGraphqlAuth:
             token_updater=mock_authenticator.save_token,
         )
 
-    @patch("playerdatapy.gqlauth.OAuth2Session")
+    @patch("requests_oauthlib.OAuth2Session")
     @patch("playerdatapy.gqlauth.ClientCredentialsFlow")
     def test_get_authenticated_session_with_valid_token(
         self, mock_flow_class, mock_session_class
@@ -147,11 +156,12 @@ class TestGraphqlAuth:
         mock_session.token = {"access_token": "test_token"}
         mock_session_class.return_value = mock_session
 
-        GraphqlAuth(
+        auth = GraphqlAuth(
             client_id="test_client",
             client_secret="test_secret",
             type=AuthenticationType.CLIENT_CREDENTIALS_FLOW,
         )
+        auth.authenticated_session
 
         mock_authenticator.get_token.assert_called_once()
         mock_session_class.assert_called_once_with(
@@ -161,7 +171,7 @@ class TestGraphqlAuth:
             token_updater=mock_authenticator.save_token,
         )
 
-    @patch("playerdatapy.gqlauth.OAuth2Session")
+    @patch("requests_oauthlib.OAuth2Session")
     @patch("playerdatapy.gqlauth.ClientCredentialsFlow")
     def test_get_authenticated_session_with_expired_token(
         self, mock_flow_class, mock_session_class
@@ -169,6 +179,7 @@ class TestGraphqlAuth:
         """Test _get_authenticated_session with expired token triggers re-authentication."""
         mock_authenticator = MagicMock()
         mock_authenticator.get_token.side_effect = [
+            TokenExpiredError("Token expired"),
             TokenExpiredError("Token expired"),
             {"access_token": "new_token"},
         ]
@@ -178,20 +189,78 @@ class TestGraphqlAuth:
         mock_session.token = {"access_token": "new_token"}
         mock_session_class.return_value = mock_session
 
-        GraphqlAuth(
+        auth = GraphqlAuth(
             client_id="test_client",
             client_secret="test_secret",
             redirect_uri="http://localhost:8888",
             type=AuthenticationType.CLIENT_CREDENTIALS_FLOW,
         )
+        auth.authenticated_session
 
-        # Should call get_token twice: once initially (expired), then after authenticate
-        assert mock_authenticator.get_token.call_count == 2
+        # Expired initially, still expired under the lock, then valid after authenticate
+        assert mock_authenticator.get_token.call_count == 3
+        mock_authenticator.lock.assert_called_once()
         mock_authenticator.authenticate.assert_called_once_with("http://localhost:8888")
 
+    @patch("requests_oauthlib.OAuth2Session")
+    @patch("playerdatapy.gqlauth.ClientCredentialsFlow")
+    def test_get_authenticated_session_token_refreshed_while_waiting_for_lock(
+        self, mock_flow_class, mock_session_class
+    ):
+        """Test a token saved by another process while we waited is reused."""
+        mock_authenticator = MagicMock()
+        mock_authenticator.get_token.side_effect = [
+            TokenExpiredError("Token expired"),
+            {"access_token": "other_process_token"},
+        ]
+        mock_flow_class.return_value = mock_authenticator
+
+        auth = GraphqlAuth(
+            client_id="test_client",
+            client_secret="test_secret",
+            type=AuthenticationType.CLIENT_CREDENTIALS_FLOW,
+        )
+        auth.authenticated_session
+
+        mock_authenticator.authenticate.assert_not_called()
+        mock_session_class.assert_called_once_with(
+            "test_client",
+            token={"access_token": "other_process_token"},
+            auto_refresh_url="https://app.playerdata.co.uk/oauth/token",
+            token_updater=mock_authenticator.save_token,
+        )
+
+    def test_concurrent_clients_authenticate_once(self, tmp_path):
+        """Test clients sharing a token file fetch a new token exactly once."""
+        fetches = []
+
+        def fake_authenticate(flow, save_token=True):
+            fetches.append(flow)
+            time.sleep(0.1)
+            token = {"access_token": "shared_token", "expires_at": time.time() + 3600}
+            flow.save_token(token)
+            return token
+
+        def connect_and_get_token(_):
+            auth = GraphqlAuth(
+                client_id="test_client",
+                client_secret="test_secret",
+                token_file=tmp_path / "token.json",
+                type=AuthenticationType.CLIENT_CREDENTIALS_FLOW,
+            )
+            return auth._get_authentication_token()
+
+        with patch.object(ClientCredentialsFlow, "authenticate", fake_authenticate):
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                tokens = list(pool.map(connect_and_get_token, range(8)))
+
+        assert len(fetches) == 1
+        assert set(tokens) == {"shared_token"}
+
     def test_get_authentication_token(self):
         """Test _get_authentication_token returns access token."""
         auth = GraphqlAuth.__new__(GraphqlAuth)
+        auth.authentication_type = AuthenticationType.AUTHORISATION_CODE_FLOW
         mock_session = MagicMock()
         mock_session.token = {"access_token": "test_access_token"}
         auth.authenticated_session = mock_session
@@ -202,9 +271,119 @@ class TestGraphqlAuth:
     def test_get_authentication_token_missing_access_token(self):
         """Test _get_authentication_token raises error when access_token is missing."""
         auth = GraphqlAuth.__new__(GraphqlAuth)
+        auth.authentication_type = AuthenticationType.AUTHORISATION_CODE_FLOW
         mock_session = MagicMock()
         mock_session.token = {"token_type": "Bearer"}
         auth.authenticated_session = mock_session
 
         with pytest.raises(KeyError):
             auth._get_authentication_token()
+
+    @patch("requests_oauthlib.OAuth2Session")
+    @patch("playerdatapy.gqlauth.ClientCredentialsFlow")
+    def test_init_does_not_authenticate(self, mock_flow_class, mock_session_class):
+        """Test constructing GraphqlAuth defers all token work to first use."""
+        mock_authenticator = MagicMock()
+        mock_authenticator.get_token.return_value = {"access_token": "test_token"}
+        mock_flow_class.return_value = mock_authenticator
+
+        auth = GraphqlAuth(
+            client_id="test_client",
+            client_secret="test_secret",
+            type=AuthenticationType.CLIENT_CREDENTIALS_FLOW,
+        )
+
+        mock_authenticator.get_token.assert_not_called()
+        mock_authenticator.authenticate.assert_not_called()
+        mock_session_class.assert_not_called()
+
+        auth._get_authentication_token()
+        auth._get_authentication_token()
+
+        mock_authenticator.get_token.assert_called_once()
+        # Client credentials are kept as the token, without a session
+        mock_session_class.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_bearer_token_auth_authenticates_on_first_request(self):
+        """Test BearerTokenAuth fetches the token lazily and sends it per request."""
+        auth = GraphqlAuth.__new__(GraphqlAuth)
+        auth.authentication_type = AuthenticationType.AUTHORISATION_CODE_FLOW
+        auth._authenticated_session = None
+        auth._session_lock = threading.Lock()
+        mock_session = MagicMock()
+        mock_session.token = {"access_token": "lazy_token"}
+        auth._get_authenticated_session = MagicMock(return_value=mock_session)
+
+        seen_headers = []
+
+        def handler(request):
+            seen_headers.append(request.headers["Authorization"])
+            return httpx.Response(200, json={"data": {}})
+
+        async with httpx.AsyncClient(
+            auth=BearerTokenAuth(auth), transport=httpx.MockTransport(handler)
+        ) as client:
+            auth._get_authenticated_session.assert_not_called()
+            await client.post("https://example.com/api/graphql")
+            await client.post("https://example.com/api/graphql")
+
+        assert seen_headers == ["Bearer lazy_token", "Bearer lazy_token"]
+        auth._get_authenticated_session.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_client_credentials_fetched_over_shared_client(self, tmp_path):
+        """Test client credentials are fetched async on the GraphQL client's pool."""
+        token_requests = []
+
+        def handler(request):
+            if request.url.path == "/oauth/token":
+                token_requests.append(request)
+                return httpx.Response(
+                    200,
+                    json={
+                        "access_token": f"token_{len(token_requests)}",
+                        "token_type": "Bearer",
+                        "expires_in": 7200,
+                    },
+                )
+            return httpx.Response(200, json={"auth": request.headers["Authorization"]})
+
+        auth = GraphqlAuth(
+            client_id="test_client",
+            client_secret="test_secret",
+            token_file=tmp_path / "token.json",
+            type=AuthenticationType.CLIENT_CREDENTIALS_FLOW,
+        )
+        http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        http_client.auth = BearerTokenAuth(auth, http_client=http_client)
+
+        with patch("builtins.print"):
+            async with http_client:
+                responses = await asyncio.gather(
+                    *(
+                        http_client.post("https://app.playerdata.co.uk/api/graphql")
+                        for _ in range(5)
+                    )
+                )
+                assert {r.json()["auth"] for r in responses} == {"Bearer token_1"}
+                assert len(token_requests) == 1
+
+                # Once the token is about to expire a new one is fetched
+                token = auth.token
+                token["expires_at"] = time.time() + 1
+                auth.authenticator.save_token(token)
+                response = await http_client.post(
+                    "https://app.playerdata.co.uk/api/graphql"
+                )
+
+        assert response.json()["auth"] == "Bearer token_2"
+        assert len(token_requests) == 2
+
+    def test_import_does_not_load_requests(self):
+        """Test requests is only imported once an authorisation code flow needs it."""
+        code = "import sys, playerdatapy; print('requests' in sys.modules)"
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        assert result.stdout.strip() == "False"
@@ -0,0 +1,184 @@
+import asyncio
+import socket
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from graphql import OperationType
+
+from playerdatapy.exceptions import GraphQLClientError
+from playerdatapy.gqlauth import AuthenticationType
+from playerdatapy.gqlclient import Client
+from playerdatapy.jobs import Job, poll_until_done, wait_with_subscription
+from playerdatapy.playerdata_api import PlayerDataAPI
+from playerdatapy.subscriptions import SubscriptionManager
+from tests.test_subscriptions import running_server, wait_until
+
+
+def bulk_action(status):
+    return {"bulkAction": {"id": "1", "status": status}}
+
+
+def fake_client(*responses, ws_url=""):
+    client = Client(url="", ws_url=ws_url)
+    client.execute_custom_operation = AsyncMock(side_effect=list(responses))
+    return client
+
+
+class TestPolling:
+    @pytest.mark.asyncio
+    async def test_backs_off_while_status_is_unchanged(self):
+        client = fake_client(
+            bulk_action("Pending"),
+            bulk_action("Pending"),
+            bulk_action("Pending"),
+            bulk_action("Processing"),
+            bulk_action("Processing"),
+            bulk_action("Succeeded"),
+        )
+        with patch("playerdatapy.jobs.asyncio.sleep", AsyncMock()) as sleep:
+            record = await poll_until_done(
+                client, Job.bulk_action("1"), poll_interval=1, max_poll_interval=3
+            )
+
+        assert record == {"id": "1", "status": "Succeeded"}
+        # Doubling up to the cap, then back to the start when the status moves on
+        assert [call.args[0] for call in sleep.await_args_list] == [1, 2, 3, 1, 2]
+
+    @pytest.mark.asyncio
+    async def test_raw_data_export_polls_the_mutation(self):
+        client = fake_client(
+            {"requestRawDataExport": {"status": "PROCESSING", "downloadUrl": None}},
+            {"requestRawDataExport": {"status": "READY", "downloadUrl": "https://x"}},
+        )
+        with patch("playerdatapy.jobs.asyncio.sleep", AsyncMock()):
+            record = await poll_until_done(client, Job.raw_data_export("sp-1"))
+
+        assert record["downloadUrl"] == "https://x"
+        field = client.execute_custom_operation.await_args.args[0]
+        kwargs = client.execute_custom_operation.await_args.kwargs
+        assert field._field_name == "requestRawDataExport"
+        assert kwargs["operation_type"] == OperationType.MUTATION
+
+    @pytest.mark.asyncio
+    async def test_missing_dataset(self):
+        client = fake_client({"datasets": []})
+        with pytest.raises(GraphQLClientError, match="dataset not found"):
+            await poll_until_done(client, Job.dataset("1"))
+
+
+class TestSubscription:
+    @pytest.mark.asyncio
+    async def test_finishes_on_subscription_update(self):
+        async with running_server() as server:
+            client = fake_client(bulk_action("Processing"), ws_url=server.url)
+            async with SubscriptionManager(client) as manager:
+                waiting = asyncio.create_task(
+                    wait_with_subscription(client, manager, Job.bulk_action("1"))
+                )
+                await wait_until(lambda: len(server.subscribed) == 1)
+                assert "bulkActionEvent" in server.subscribed[0]["payload"]["query"]
+
+                event = {"bulkActionEvent": bulk_action("Succeeded")}
+                await server.send(server.subscribed[0]["id"], payload={"data": event})
+
+                assert await waiting == {"id": "1", "status": "Succeeded"}
+                # Only the initial check was polled
+                assert client.execute_custom_operation.await_count == 1
+                await wait_until(lambda: len(server.completed) == 1)
+
+    @pytest.mark.asyncio
+    async def test_job_finished_before_subscribing(self):
+        async with running_server() as server:
+            client = fake_client(bulk_action("Failed"), ws_url=server.url)
+            async with SubscriptionManager(client) as manager:
+                record = await wait_with_subscription(
+                    client, manager, Job.bulk_action("1")
+                )
+
+            assert record["status"] == "Failed"
+
+    @pytest.mark.asyncio
+    async def test_polls_when_updates_stop(self):
+        async with running_server() as server:
+            client = fake_client(
+                bulk_action("Processing"), bulk_action("Succeeded"), ws_url=server.url
+            )
+            async with SubscriptionManager(client) as manager:
+                record = await wait_with_subscription(
+                    client, manager, Job.bulk_action("1"), max_poll_interval=0.05
+                )
+
+            assert record["status"] == "Succeeded"
+            assert client.execute_custom_operation.await_count == 2
+
+
+class TestWaitFor:
+    def api(self, tmp_path, base_url):
+        return PlayerDataAPI(
+            client_id="test_client",
+            token_file=tmp_path / "token.json",
+            authentication_type=AuthenticationType.CLIENT_CREDENTIALS_FLOW,
+            base_url=base_url,
+        )
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_polling_without_websocket(self, tmp_path):
+        with socket.socket() as unused:
+            unused.bind(("127.0.0.1", 0))
+            port = unused.getsockname()[1]
+        api = self.api(tmp_path, f"http://127.0.0.1:{port}")
+        api.client.execute_custom_operation = AsyncMock(
+            side_effect=[bulk_action("Processing"), bulk_action("Succeeded")]
+        )
+
+        with patch.object(
+            api, "_aget_authentication_token", AsyncMock(return_value="abc")
+        ):
+            record = await api.wait_for(
+                Job.bulk_action("1"), timeout=5, poll_interval=0.01
+            )
+
+        assert record["status"] == "Succeeded"
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_polling_when_upgrade_is_rejected(self, tmp_path):
+        async def reject(reader, writer):
+            await reader.readuntil(b"\r\n\r\n")
+            writer.write(
+                b"HTTP/1.1 403 Forbidden\r\nContent-Length: 0\r\n"
+                b"Connection: close\r\n\r\n"
+            )
+            await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(reject, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        api = self.api(tmp_path, f"http://127.0.0.1:{port}")
+        api.client.execute_custom_operation = AsyncMock(
+            side_effect=[bulk_action("Processing"), bulk_action("Succeeded")]
+        )
+
+        async with server:
+            with patch.object(
+                api, "_aget_authentication_token", AsyncMock(return_value="abc")
+            ):
+                record = await api.wait_for(
+                    Job.bulk_action("1"), timeout=5, poll_interval=0.01
+                )
+
+        assert record["status"] == "Succeeded"
+
+    @pytest.mark.asyncio
+    async def test_timeout(self, tmp_path):
+        api = self.api(tmp_path, "http://127.0.0.1:1")
+        api.client.execute_custom_operation = AsyncMock(
+            return_value=bulk_action("Processing")
+        )
+
+        with pytest.raises(TimeoutError):
+            await api.wait_for(
+                Job.bulk_action("1"),
+                timeout=0.05,
+                use_subscription=False,
+                poll_interval=0.01,
+            )
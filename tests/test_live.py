@@ -0,0 +1,155 @@
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock
+
+import polars as pl
+import pytest
+
+from playerdatapy.gqlclient import Client
+from playerdatapy.live import LiveSquad
+from playerdatapy.subscriptions import SubscriptionManager
+from tests.test_subscriptions import running_server, wait_until
+
+
+def update(updated_at=None, **metrics):
+    data = [
+        {"key": key, "localValue": {"floatValue": value}}
+        for key, value in metrics.items()
+    ]
+    return {
+        "athleteSessionMetricsUpdatedEvent": {
+            "configuredMetrics": {"data": data, "metadata": {"updatedAt": updated_at}}
+        }
+    }
+
+
+class TestLiveSquad:
+    def test_applies_updates_incrementally(self):
+        squad = LiveSquad(["a", "b", "c"])
+        squad.apply("a", update(distance=100.0, top_speed=7.5))
+        squad.apply("b", update("2026-10-19T12:00:00Z", distance=80.0))
+        # Later updates only overwrite the metrics they carry
+        squad.apply("a", update(distance=150.0))
+
+        snapshot = squad.snapshot()
+        assert snapshot.to_dicts() == [
+            {
+                "session_participation_id": "a",
+                "updated_at": None,
+                "distance": 150.0,
+                "top_speed": 7.5,
+            },
+            {
+                "session_participation_id": "b",
+                "updated_at": datetime(2026, 10, 19, 12, tzinfo=timezone.utc),
+                "distance": 80.0,
+                "top_speed": None,
+            },
+            {
+                "session_participation_id": "c",
+                "updated_at": None,
+                "distance": None,
+                "top_speed": None,
+            },
+        ]
+        assert squad.metrics == ["distance", "top_speed"]
+
+    def test_ignores_unknown_participations(self):
+        squad = LiveSquad(["a"])
+        assert not squad.apply("z", update(distance=1.0))
+        assert squad.version == 0
+
+    def test_int_and_non_numeric_values(self):
+        squad = LiveSquad(["a"])
+        squad.apply(
+            "a",
+            {
+                "athleteSessionMetricsUpdatedEvent": {
+                    "configuredMetrics": {
+                        "data": [
+                            {"key": "sprints", "localValue": {"intValue": 4}},
+                            {"key": "zones", "localValue": {}},
+                        ]
+                    }
+                }
+            },
+        )
+        assert squad.snapshot().row(0, named=True)["sprints"] == 4.0
+        assert squad.snapshot().row(0, named=True)["zones"] is None
+
+    def test_snapshot_is_reused_until_next_update(self):
+        squad = LiveSquad(["a"])
+        squad.apply("a", update(distance=1.0))
+        first = squad.snapshot()
+
+        assert squad.snapshot() is first
+        squad.apply("a", update(distance=2.0))
+        assert squad.snapshot() is not first
+        assert first["distance"].to_list() == [1.0]
+
+    def test_aggregate(self):
+        squad = LiveSquad(["a", "b", "c"])
+        squad.apply("a", update(distance=100.0, top_speed=7.0))
+        squad.apply("b", update(distance=50.0))
+
+        assert squad.aggregate().to_dicts() == [
+            {
+                "metric": "distance",
+                "mean": 75.0,
+                "min": 50.0,
+                "max": 100.0,
+                "sum": 150.0,
+                "count": 2,
+            },
+            {
+                "metric": "top_speed",
+                "mean": 7.0,
+                "min": 7.0,
+                "max": 7.0,
+                "sum": 7.0,
+                "count": 1,
+            },
+        ]
+        assert squad.aggregate(pl.col("distance").sum()).item() == 150.0
+
+    @pytest.mark.asyncio
+    async def test_for_session_pages_through_participations(self):
+        api = AsyncMock()
+        pages = [[{"id": str(i)} for i in range(30)], [{"id": "30"}]]
+        api.run_queries.side_effect = [
+            {"session": {"sessionParticipations": page}} for page in pages
+        ]
+
+        squad = await LiveSquad.for_session(api, "session-1", ["distance"])
+
+        assert squad.participation_ids == [str(i) for i in range(31)]
+        assert squad.metric_keys == ["distance"]
+        assert api.run_queries.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_run_applies_subscription_updates(self):
+        async with running_server() as server:
+            client = Client(url="", ws_url=server.url)
+            squad = LiveSquad(["a", "b"], metric_keys=["distance"])
+            updated = []
+            async with SubscriptionManager(client) as manager:
+                task = asyncio.create_task(
+                    squad.run(manager, on_update=lambda _, pid: updated.append(pid))
+                )
+                await wait_until(lambda: len(server.subscribed) == 2)
+
+                ids = {
+                    m["payload"]["variables"]["sessionParticipationId_0"]: m["id"]
+                    for m in server.subscribed
+                }
+                assert server.subscribed[0]["payload"]["variables"][
+                    "requestedKeys_0"
+                ] == ["distance"]
+                await server.send(ids["b"], payload={"data": update(distance=3.0)})
+                await wait_until(lambda: updated == ["b"])
+
+                assert squad.snapshot()["distance"].to_list() == [None, 3.0]
+                task.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await task
+                await wait_until(lambda: len(server.completed) == 2)
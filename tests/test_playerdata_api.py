@@ -4,7 +4,7 @@ import pytest
 
 from playerdatapy.auth.token_storage import default_token_path
 from playerdatapy.playerdata_api import PlayerDataAPI
-from playerdatapy.gqlauth import AuthenticationType
+from playerdatapy.gqlauth import AuthenticationType, BearerTokenAuth
 from playerdatapy.base_operation import GraphQLField
 
 
@@ -12,7 +12,7 @@ class TestPlayerdataAPI:
     """Tests for PlayerDataAPI class."""
 
     @patch("playerdatapy.playerdata_api.Client")
-    @patch("playerdatapy.gqlauth.OAuth2Session")
+    @patch("requests_oauthlib.OAuth2Session")
     @patch("playerdatapy.gqlauth.ClientCredentialsFlow")
     def test_init(self, mock_flow_class, mock_session_class, mock_client_class):
         """Test PlayerDataAPI initialization."""
@@ -37,16 +37,21 @@ class TestPlayerdataAPI:
             authentication_type=AuthenticationType.CLIENT_CREDENTIALS_FLOW,
         )
 
-        # Verify Client was initialized with correct URL and headers
+        # Verify Client was initialized with the correct URL and a lazily authed client
         mock_client_class.assert_called_once_with(
             url="https://app.playerdata.co.uk/api/graphql",
-            headers={"Authorization": "Bearer test_token"},
+            ws_url="wss://app.playerdata.co.uk/api/graphql",
+            http_client=interface.http_client,
         )
-
+        assert isinstance(interface.http_client.auth, BearerTokenAuth)
         assert interface.client == mock_client_instance
 
+        # No authentication happens until the first request
+        mock_authenticator.get_token.assert_not_called()
+        mock_session_class.assert_not_called()
+
     @patch("playerdatapy.playerdata_api.Client")
-    @patch("playerdatapy.gqlauth.OAuth2Session")
+    @patch("requests_oauthlib.OAuth2Session")
     @patch("playerdatapy.gqlauth.AuthorisationCodeFlow")
     def test_init_defaults(
         self, mock_flow_class, mock_session_class, mock_client_class
@@ -77,7 +82,7 @@ class TestPlayerdataAPI:
         assert interface.client == mock_client_instance
 
     @patch("playerdatapy.playerdata_api.Client")
-    @patch("playerdatapy.gqlauth.OAuth2Session")
+    @patch("requests_oauthlib.OAuth2Session")
     @patch("playerdatapy.gqlauth.ClientCredentialsFlow")
     def test_init_with_base_url(
         self, mock_flow_class, mock_session_class, mock_client_class
@@ -104,12 +109,13 @@ class TestPlayerdataAPI:
         assert interface.api_base_url == "https://preview.playerdata.co.uk"
         mock_client_class.assert_called_once_with(
             url="https://preview.playerdata.co.uk/api/graphql",
-            headers={"Authorization": "Bearer test_token"},
+            ws_url="wss://preview.playerdata.co.uk/api/graphql",
+            http_client=interface.http_client,
         )
 
     @pytest.mark.asyncio
     @patch("playerdatapy.playerdata_api.Client")
-    @patch("playerdatapy.gqlauth.OAuth2Session")
+    @patch("requests_oauthlib.OAuth2Session")
     @patch("playerdatapy.gqlauth.ClientCredentialsFlow")
     async def test_run_queries(
         self, mock_flow_class, mock_session_class, mock_client_class
@@ -148,7 +154,7 @@ class TestPlayerdataAPI:
 
     @pytest.mark.asyncio
     @patch("playerdatapy.playerdata_api.Client")
-    @patch("playerdatapy.gqlauth.OAuth2Session")
+    @patch("requests_oauthlib.OAuth2Session")
     @patch("playerdatapy.gqlauth.AuthorisationCodeFlow")
     async def test_run_queries_single_query(
         self, mock_flow_class, mock_session_class, mock_client_class
@@ -181,7 +187,7 @@ class TestPlayerdataAPI:
 
     @pytest.mark.asyncio
     @patch("playerdatapy.playerdata_api.Client")
-    @patch("playerdatapy.gqlauth.OAuth2Session")
+    @patch("requests_oauthlib.OAuth2Session")
     @patch("playerdatapy.gqlauth.AuthorisationCodeFlow")
     async def test_run_queries_empty(
         self, mock_flow_class, mock_session_class, mock_client_class
@@ -211,7 +217,7 @@ class TestPlayerdataAPI:
 
     @pytest.mark.asyncio
     @patch("playerdatapy.playerdata_api.Client")
-    @patch("playerdatapy.gqlauth.OAuth2Session")
+    @patch("requests_oauthlib.OAuth2Session")
     @patch("playerdatapy.gqlauth.ClientCredentialsFlow")
     async def test_run_mutations(
         self, mock_flow_class, mock_session_class, mock_client_class
@@ -251,7 +257,7 @@ class TestPlayerdataAPI:
 
     @pytest.mark.asyncio
     @patch("playerdatapy.playerdata_api.Client")
-    @patch("playerdatapy.gqlauth.OAuth2Session")
+    @patch("requests_oauthlib.OAuth2Session")
     @patch("playerdatapy.gqlauth.AuthorisationCodeFlow")
     async def test_run_mutations_single_mutation(
         self, mock_flow_class, mock_session_class, mock_client_class
@@ -284,7 +290,7 @@ class TestPlayerdataAPI:
 
     @pytest.mark.asyncio
     @patch("playerdatapy.playerdata_api.Client")
-    @patch("playerdatapy.gqlauth.OAuth2Session")
+    @patch("requests_oauthlib.OAuth2Session")
     @patch("playerdatapy.gqlauth.AuthorisationCodeFlow")
     async def test_run_mutations_empty(
         self, mock_flow_class, mock_session_class, mock_client_class
@@ -313,3 +319,32 @@ class TestPlayerdataAPI:
             operation_name="EmptyMutation"
         )
         assert result == {"data": {"result": "success"}}
+
+    @pytest.mark.asyncio
+    @patch("requests_oauthlib.OAuth2Session")
+    @patch("playerdatapy.gqlauth.ClientCredentialsFlow")
+    async def test_warm_up(self, mock_flow_class, mock_session_class):
+        """Test warm_up fetches the token and opens connections concurrently."""
+        mock_authenticator = MagicMock()
+        mock_authenticator.get_token.return_value = {"access_token": "test_token"}
+        mock_flow_class.return_value = mock_authenticator
+
+        mock_session = MagicMock()
+        mock_session.token = {"access_token": "test_token"}
+        mock_session_class.return_value = mock_session
+
+        interface = PlayerDataAPI(
+            client_id="test_client",
+            client_secret="test_secret",
+            authentication_type=AuthenticationType.CLIENT_CREDENTIALS_FLOW,
+        )
+        interface.http_client = MagicMock()
+        interface.http_client.request = AsyncMock()
+
+        await interface.warm_up(connections=3)
+
+        mock_authenticator.get_token.assert_called_once()
+        assert interface.http_client.request.await_count == 3
+        interface.http_client.request.assert_awaited_with(
+            "HEAD", "https://app.playerdata.co.uk/api/graphql", auth=None
+        )
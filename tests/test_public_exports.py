@@ -1,3 +1,6 @@
+import subprocess
+import sys
+
 import playerdatapy
 
 
@@ -17,3 +20,48 @@ class TestPublicExports:
 
         assert PlayerDataAPI is canonical
         assert "PlayerDataAPI" in playerdatapy.__all__
+
+    def test_client_pool_import(self):
+        from playerdatapy import ClientPool
+        from playerdatapy.client_pool import ClientPool as canonical
+
+        assert ClientPool is canonical
+        assert "ClientPool" in playerdatapy.__all__
+
+    def test_subscription_manager_import(self):
+        from playerdatapy import SubscriptionManager
+        from playerdatapy.subscriptions import SubscriptionManager as canonical
+
+        assert SubscriptionManager is canonical
+        assert "SubscriptionManager" in playerdatapy.__all__
+
+    def test_live_squad_import(self):
+        from playerdatapy import LiveSquad
+        from playerdatapy.live import LiveSquad as canonical
+
+        assert LiveSquad is canonical
+        assert "LiveSquad" in playerdatapy.__all__
+
+    def test_live_squad_imported_on_first_use(self):
+        code = "import sys, playerdatapy; print('polars' in sys.modules)"
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        assert result.stdout.strip() == "False"
+
+    def test_job_import(self):
+        from playerdatapy import Job
+        from playerdatapy.jobs import Job as canonical
+
+        assert Job is canonical
+        assert "Job" in playerdatapy.__all__
+
+    def test_signed_url_cache_import(self):
+        from playerdatapy import SignedUrlCache, SignedUrlSource
+        from playerdatapy.signed_urls import SignedUrlCache as canonical
+        from playerdatapy.signed_urls import SignedUrlSource as canonical_source
+
+        assert SignedUrlCache is canonical
+        assert SignedUrlSource is canonical_source
+        assert "SignedUrlCache" in playerdatapy.__all__
+        assert "SignedUrlSource" in playerdatapy.__all__
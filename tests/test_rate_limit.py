@@ -0,0 +1,109 @@
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from playerdatapy.rate_limit import FileBackend, MemoryBackend, RateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FixedWindowBackend:
+    """Redis-style stand-in: INCR a per-window counter and compare to the limit."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.counters: dict[str, int] = {}
+
+    async def acquire(self, key: str, limit: int, period: float) -> float:
+        window = int(self.clock() // period)
+        counter = f"{key}:{window}"
+        self.counters[counter] = self.counters.get(counter, 0) + 1
+        if self.counters[counter] <= limit:
+            return 0
+        return (window + 1) * period - self.clock()
+
+
+def take_slots(path: str, count: int) -> list[float]:
+    """Worker process: take ``count`` slots from a shared file backend."""
+    limiter = RateLimiter(3, period=0.5, key="ip", backend=FileBackend(path))
+
+    async def run():
+        granted = []
+        for _ in range(count):
+            await limiter.acquire()
+            granted.append(time.time())
+        return granted
+
+    return asyncio.run(run())
+
+
+class TestRateLimiter:
+    @pytest.mark.asyncio
+    async def test_rolling_window(self):
+        clock = FakeClock()
+        limiter = RateLimiter(2, period=5, backend=MemoryBackend(clock))
+
+        assert await limiter.try_acquire() == 0
+        clock.now = 1
+        assert await limiter.try_acquire() == 0
+        assert await limiter.try_acquire() == pytest.approx(4)
+
+        clock.now = 5
+        assert await limiter.try_acquire() == 0
+        assert await limiter.try_acquire() == pytest.approx(1)
+
+    @pytest.mark.asyncio
+    async def test_limiters_share_budget_by_key(self):
+        backend = MemoryBackend(FakeClock())
+        first = RateLimiter(2, key="token:a", backend=backend)
+        second = RateLimiter(2, key="token:a", backend=backend)
+        other = RateLimiter(2, key="token:b", backend=backend)
+
+        assert await first.try_acquire() == 0
+        assert await second.try_acquire() == 0
+        assert await first.try_acquire() > 0
+        assert await other.try_acquire() == 0
+
+    @pytest.mark.asyncio
+    async def test_pluggable_backend(self):
+        clock = FakeClock()
+        limiter = RateLimiter(2, period=5, backend=FixedWindowBackend(clock))
+
+        assert await limiter.try_acquire() == 0
+        assert await limiter.try_acquire() == 0
+        assert await limiter.try_acquire() == pytest.approx(5)
+        clock.now = 5
+        assert await limiter.try_acquire() == 0
+
+    @pytest.mark.asyncio
+    async def test_file_backend_shared_between_instances(self, tmp_path):
+        clock = FakeClock()
+        path = tmp_path / "limits.json"
+        first = RateLimiter(2, period=5, backend=FileBackend(path, clock=clock))
+        second = RateLimiter(2, period=5, backend=FileBackend(path, clock=clock))
+
+        assert await first.try_acquire() == 0
+        assert await second.try_acquire() == 0
+        assert await first.try_acquire() == pytest.approx(5)
+
+        path.write_text("{corrupt")
+        assert await second.try_acquire() == 0
+
+    def test_file_backend_shared_between_processes(self, tmp_path):
+        path = str(tmp_path / "limits.json")
+        with ProcessPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(take_slots, [path] * 4, [3] * 4))
+
+        granted = sorted(t for worker in results for t in worker)
+        assert len(granted) == 12
+        # No rolling 0.5 s window across all processes holds more than 3 slots
+        for i in range(len(granted) - 3):
+            assert granted[i + 3] - granted[i] >= 0.5 - 0.01
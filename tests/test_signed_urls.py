@@ -0,0 +1,180 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+
+import pytest
+from graphql import OperationType
+
+from playerdatapy.exceptions import (
+    GraphQLClientError,
+    GraphQLClientGraphQLMultiError,
+)
+from playerdatapy.gqlclient import Client
+from playerdatapy.signed_urls import SignedUrl, SignedUrlCache, SignedUrlSource
+
+NOW = datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+
+
+class FakeServer:
+    """Answers signed URL queries, issuing URLs valid for ``lifetime``."""
+
+    def __init__(self, lifetime: timedelta = timedelta(hours=1)):
+        self.lifetime = lifetime
+        self.queries: list[list[str]] = []
+        self.client = Client(url="")
+        self.client.execute_custom_operation = AsyncMock(side_effect=self.respond)
+
+    async def respond(self, *fields, operation_type, operation_name):
+        assert operation_type == OperationType.QUERY
+        ids = [field._variables["videoRecordingId"]["value"] for field in fields]
+        self.queries.append(ids)
+        await asyncio.sleep(0)
+        expires_at = (NOW + self.lifetime).isoformat().replace("+00:00", "Z")
+        data = {
+            field._alias: None
+            if id in ("missing", "forbidden")
+            else {
+                "signedUrl": f"https://files/{id}?{len(self.queries)}",
+                "expiresAt": expires_at,
+            }
+            for field, id in zip(fields, ids)
+        }
+        errors = [
+            {"message": "Forbidden", "path": [field._alias]}
+            for field, id in zip(fields, ids)
+            if id == "forbidden"
+        ]
+        if errors:
+            raise GraphQLClientGraphQLMultiError.from_errors_dicts(errors, data)
+        return data
+
+
+def make_cache(server, now=lambda: NOW, **kwargs):
+    return SignedUrlCache(server.client, clock=now, **kwargs)
+
+
+DOWNLOAD = SignedUrlSource.video_recording_download()
+
+
+class TestSignedUrlCache:
+    @pytest.mark.asyncio
+    async def test_fetches_many_in_one_query(self):
+        server = FakeServer()
+        urls = await make_cache(server).get_many(DOWNLOAD, ["a", "b", "c"])
+
+        assert server.queries == [["a", "b", "c"]]
+        assert urls["b"] == SignedUrl(
+            url="https://files/b?1", expires_at=NOW + timedelta(hours=1)
+        )
+
+    @pytest.mark.asyncio
+    async def test_concurrent_gets_share_a_query(self):
+        server = FakeServer()
+        cache = make_cache(server)
+        results = await asyncio.gather(
+            cache.get(DOWNLOAD, "a"), cache.get(DOWNLOAD, "b"), cache.get(DOWNLOAD, "a")
+        )
+
+        assert server.queries == [["a", "b"]]
+        assert results[0] == results[2]
+
+    @pytest.mark.asyncio
+    async def test_batches_are_bounded(self):
+        server = FakeServer()
+        await make_cache(server, batch_size=2).get_many(DOWNLOAD, ["a", "b", "c"])
+
+        assert server.queries == [["a", "b"], ["c"]]
+
+    @pytest.mark.asyncio
+    async def test_reuses_until_shortly_before_expiry(self):
+        server = FakeServer()
+        now = NOW
+        cache = make_cache(server, now=lambda: now, refresh_before=timedelta(minutes=5))
+        first = await cache.get(DOWNLOAD, "a")
+
+        now = NOW + timedelta(minutes=54)
+        assert await cache.get(DOWNLOAD, "a") == first
+        assert len(server.queries) == 1
+
+        now = NOW + timedelta(minutes=56)
+        assert (await cache.get(DOWNLOAD, "a")).url == "https://files/a?2"
+
+    @pytest.mark.asyncio
+    async def test_missing_urls_are_left_out(self):
+        server = FakeServer()
+        cache = make_cache(server)
+
+        assert list(await cache.get_many(DOWNLOAD, ["a", "missing"])) == ["a"]
+        assert await cache.get(DOWNLOAD, "missing") is None
+        assert len(server.queries) == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidate(self):
+        server = FakeServer()
+        cache = make_cache(server)
+        await cache.get(DOWNLOAD, "a")
+        cache.invalidate(DOWNLOAD, "a")
+
+        assert (await cache.get(DOWNLOAD, "a")).url == "https://files/a?2"
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_every_caller(self):
+        server = FakeServer()
+        server.client.execute_custom_operation.side_effect = GraphQLClientError()
+        cache = make_cache(server)
+
+        with pytest.raises(GraphQLClientError):
+            await cache.get_many(DOWNLOAD, ["a", "b"])
+
+    @pytest.mark.asyncio
+    async def test_errored_urls_are_left_out(self):
+        server = FakeServer()
+        cache = make_cache(server)
+
+        urls = await cache.get_many(DOWNLOAD, ["a", "forbidden", "b"])
+
+        assert list(urls) == ["a", "b"]
+        assert await cache.get(DOWNLOAD, "a") == urls["a"]
+        assert len(server.queries) == 1
+
+    @pytest.mark.asyncio
+    async def test_read_errors_reach_every_caller(self):
+        server = FakeServer()
+        source = SignedUrlSource(
+            name="broken", field=DOWNLOAD.field, read=lambda data: 1 / 0
+        )
+        cache = make_cache(server)
+
+        async with asyncio.timeout(1):
+            with pytest.raises(ZeroDivisionError):
+                await cache.get_many(source, ["a", "b"])
+        assert not cache._fetching
+
+
+class TestSignedUrlSource:
+    def test_aliases_one_field_per_id(self):
+        query, variables = Client(url="").build_custom_operation(
+            *(DOWNLOAD.field(id).alias(f"url{i}") for i, id in enumerate("ab")),
+            operation_type=OperationType.QUERY,
+            operation_name="SignedUrls",
+        )
+
+        assert "url0: videoRecordingDownloadUrl" in query
+        assert "url1: videoRecordingDownloadUrl" in query
+        assert sorted(variables.values()) == ["a", "b"]
+
+    def test_video_recording_view_picks_variant(self):
+        expires_at = "2024-01-01T13:00:00Z"
+        variants = [
+            {"signedUrl": "https://720", "expiresAt": expires_at, "height": 720},
+            {"signedUrl": "https://1080", "expiresAt": expires_at, "height": 1080},
+        ]
+        variants[0]["resolution"], variants[1]["resolution"] = "720p", "1080p"
+
+        assert SignedUrlSource.video_recording_view().read(variants).url == (
+            "https://1080"
+        )
+        assert SignedUrlSource.video_recording_view("720p").read(variants).url == (
+            "https://720"
+        )
+        assert SignedUrlSource.video_recording_view("4k").read(variants) is None
@@ -0,0 +1,447 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from graphql import OperationType
+from websockets.asyncio.server import serve
+
+from playerdatapy.custom_fields import (
+    ConfiguredMetricsFields,
+    GenericMetricFields,
+    MatchEventFields,
+)
+from playerdatapy.custom_subscriptions import (
+    AthleteSessionMetricsUpdatedSubscriptionPayloadFields,
+    MatchEventCreatedSubscriptionPayloadFields,
+    Subscription,
+)
+from playerdatapy.exceptions import GraphQLClientError, GraphQLClientGraphQLMultiError
+from playerdatapy.gqlauth import AuthenticationType
+from playerdatapy.gqlclient import Client
+from playerdatapy.playerdata_api import PlayerDataAPI
+from playerdatapy.subscriptions import (
+    OverflowPolicy,
+    SubscriptionManager,
+    SubscriptionStream,
+)
+
+
+class FakeGraphQLServer:
+    """Minimal graphql-transport-ws server recording what clients send.
+
+    Can be told to drop connections, refuse new ones, or ignore pings, to stand in
+    for a flaky network.
+    """
+
+    def __init__(self):
+        self.refuse = False
+        self.answer_pings = True
+        self.pings = 0
+        self.connections = 0
+        self.headers = []
+        self.subscribed: list[dict] = []
+        self.completed: list[str] = []
+        self.websocket = None
+
+    async def handler(self, websocket):
+        self.connections += 1
+        self.headers.append(websocket.request.headers)
+        self.websocket = websocket
+        if self.refuse:
+            await websocket.close()
+            return
+        async for raw in websocket:
+            message = json.loads(raw)
+            if message["type"] == "connection_init":
+                await websocket.send(json.dumps({"type": "connection_ack"}))
+            elif message["type"] == "subscribe":
+                self.subscribed.append(message)
+            elif message["type"] == "complete":
+                self.completed.append(message["id"])
+            elif message["type"] == "ping":
+                self.pings += 1
+                if self.answer_pings:
+                    await websocket.send(json.dumps({"type": "pong"}))
+
+    def drop(self):
+        """Cut the current connection without a closing handshake."""
+        self.websocket.transport.abort()
+
+    async def send(self, id: str, type: str = "next", payload=None):
+        message = {"id": id, "type": type}
+        if payload is not None:
+            message["payload"] = payload
+        await self.websocket.send(json.dumps(message))
+
+
+@asynccontextmanager
+async def running_server():
+    server = FakeGraphQLServer()
+    async with serve(server.handler, "127.0.0.1", 0) as ws_server:
+        port = ws_server.sockets[0].getsockname()[1]
+        server.url = f"ws://127.0.0.1:{port}"
+        yield server
+
+
+async def wait_until(predicate, timeout: float = 2.0):
+    async with asyncio.timeout(timeout):
+        while not predicate():
+            await asyncio.sleep(0.01)
+
+
+class TestSubscriptionManager:
+    @pytest.mark.asyncio
+    async def test_subscriptions_share_one_connection(self):
+        async with running_server() as server:
+            client = Client(url="", ws_url=server.url)
+            async with SubscriptionManager(client) as manager:
+                streams = [
+                    await manager.subscribe(
+                        "subscription($id: ID!) { event(id: $id) { id } }",
+                        variables={"id": str(i)},
+                    )
+                    for i in range(3)
+                ]
+                await wait_until(lambda: len(server.subscribed) == 3)
+
+                assert server.connections == 1
+                assert [m["payload"]["variables"] for m in server.subscribed] == [
+                    {"id": "0"},
+                    {"id": "1"},
+                    {"id": "2"},
+                ]
+                assert len({m["id"] for m in server.subscribed}) == 3
+
+                # Messages are routed to their own stream, whatever the order
+                for stream in reversed(streams):
+                    await server.send(stream.id, payload={"data": {"n": stream.id}})
+                await server.send(streams[0].id, payload={"data": {"n": "again"}})
+
+                assert await anext(streams[0]) == {"n": streams[0].id}
+                assert await anext(streams[0]) == {"n": "again"}
+                assert await anext(streams[1]) == {"n": streams[1].id}
+                assert await anext(streams[2]) == {"n": streams[2].id}
+
+    @pytest.mark.asyncio
+    async def test_error_and_complete_end_one_stream(self):
+        async with running_server() as server:
+            client = Client(url="", ws_url=server.url)
+            async with SubscriptionManager(client) as manager:
+                failing, completing, live = [
+                    await manager.subscribe("subscription { event { id } }")
+                    for _ in range(3)
+                ]
+                await wait_until(lambda: len(server.subscribed) == 3)
+
+                await server.send(failing.id, "error", [{"message": "Not allowed"}])
+                await server.send(completing.id, payload={"data": {"n": 1}})
+                await server.send(completing.id, "complete")
+                await server.send(live.id, payload={"data": {"n": 2}})
+
+                with pytest.raises(GraphQLClientGraphQLMultiError, match="Not allowed"):
+                    await anext(failing)
+                assert [data async for data in completing] == [{"n": 1}]
+                assert await anext(live) == {"n": 2}
+                assert manager.active == [live]
+
+    @pytest.mark.asyncio
+    async def test_closing_a_stream_completes_it_on_the_server(self):
+        async with running_server() as server:
+            client = Client(url="", ws_url=server.url)
+            async with SubscriptionManager(client) as manager:
+                stream = await manager.subscribe("subscription { event { id } }")
+                await stream.aclose()
+                await wait_until(lambda: server.completed == [stream.id])
+
+                assert stream.finished
+                assert [data async for data in stream] == []
+
+            # Closing the manager ends the connection
+            await wait_until(lambda: server.websocket.state.name == "CLOSED")
+
+    @pytest.mark.asyncio
+    async def test_playerdata_api_connects_with_token(self, tmp_path):
+        async with running_server() as server:
+            api = PlayerDataAPI(
+                client_id="test_client",
+                token_file=tmp_path / "token.json",
+                authentication_type=AuthenticationType.CLIENT_CREDENTIALS_FLOW,
+                base_url=server.url.replace("ws://", "http://"),
+            )
+            assert api.client.ws_url == f"{server.url}/api/graphql"
+
+            with patch.object(
+                api, "_aget_authentication_token", AsyncMock(return_value="abc")
+            ):
+                async with api.subscriptions() as manager:
+                    await manager.subscribe("subscription { event { id } }")
+
+            assert server.headers[0]["Authorization"] == "Bearer abc"
+
+
+class TestReconnect:
+    @pytest.mark.asyncio
+    async def test_resubscribes_after_drop(self):
+        async with running_server() as server:
+            client = Client(url="", ws_url=server.url)
+            async with SubscriptionManager(client, reconnect_delay=0.01) as manager:
+                first, second = [
+                    await manager.subscribe("subscription { event { id } }")
+                    for _ in range(2)
+                ]
+                await wait_until(lambda: len(server.subscribed) == 2)
+
+                server.drop()
+                await wait_until(lambda: len(server.subscribed) == 4)
+
+                # The same operations are resubscribed on the new connection
+                assert server.connections == 2
+                assert [m["id"] for m in server.subscribed[2:]] == [
+                    first.id,
+                    second.id,
+                ]
+                await server.send(second.id, payload={"data": {"n": 1}})
+                assert await anext(second) == {"n": 1}
+                assert not first.finished
+                assert manager.metrics.reconnects == 1
+                assert manager.metrics.connected
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_attempts(self):
+        async with running_server() as server:
+            client = Client(url="", ws_url=server.url)
+            async with SubscriptionManager(
+                client, reconnect_delay=0.01, max_reconnect_attempts=2
+            ) as manager:
+                stream = await manager.subscribe("subscription { event { id } }")
+                await wait_until(lambda: len(server.subscribed) == 1)
+
+                server.refuse = True
+                server.drop()
+
+                with pytest.raises(GraphQLClientError, match="closed before ack"):
+                    async with asyncio.timeout(2):
+                        await anext(stream)
+                # The original connection plus two reconnection attempts
+                assert server.connections == 3
+                assert not manager.metrics.connected
+
+    @pytest.mark.asyncio
+    async def test_no_reconnect_on_fatal_close(self):
+        async with running_server() as server:
+            client = Client(url="", ws_url=server.url)
+            async with SubscriptionManager(client, reconnect_delay=0.01) as manager:
+                stream = await manager.subscribe("subscription { event { id } }")
+                await wait_until(lambda: len(server.subscribed) == 1)
+
+                await server.websocket.close(4403, "Forbidden")
+
+                with pytest.raises(GraphQLClientError, match="4403 Forbidden"):
+                    await anext(stream)
+                assert server.connections == 1
+
+    @pytest.mark.asyncio
+    async def test_keepalive_measures_latency(self):
+        async with running_server() as server:
+            client = Client(url="", ws_url=server.url)
+            async with SubscriptionManager(client, ping_interval=0.02) as manager:
+                await manager.subscribe("subscription { event { id } }")
+                await wait_until(lambda: manager.metrics.latency is not None)
+
+                assert 0 <= manager.metrics.latency < 1
+                assert manager.metrics.ping_timeouts == 0
+
+    @pytest.mark.asyncio
+    async def test_reconnects_when_pings_go_unanswered(self):
+        async with running_server() as server:
+            server.answer_pings = False
+            client = Client(url="", ws_url=server.url)
+            async with SubscriptionManager(
+                client, ping_interval=0.02, ping_timeout=0.05, reconnect_delay=0.01
+            ) as manager:
+                await manager.subscribe("subscription { event { id } }")
+                await wait_until(lambda: manager.metrics.reconnects == 1)
+
+                assert manager.metrics.ping_timeouts == 1
+                assert server.connections == 2
+
+
+def participation(data):
+    return data["event"]["participationId"]
+
+
+def event(participation_id, n):
+    return {"event": {"participationId": participation_id, "n": n}}
+
+
+class TestOverflowPolicy:
+    def stream(self, **kwargs):
+        return SubscriptionStream(None, "subscription { event { id } }", **kwargs)
+
+    async def drain(self, stream):
+        stream._finish()
+        return [data async for data in stream]
+
+    def test_conflate_requires_key(self):
+        with pytest.raises(ValueError):
+            self.stream(overflow=OverflowPolicy.CONFLATE)
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest(self):
+        stream = self.stream(max_queue=3, overflow=OverflowPolicy.DROP_OLDEST)
+        for n in range(5):
+            await stream._put({"n": n})
+
+        assert stream.pending == 3
+        assert stream.dropped == 2
+        assert await self.drain(stream) == [{"n": 2}, {"n": 3}, {"n": 4}]
+
+    @pytest.mark.asyncio
+    async def test_conflate_keeps_newest_per_key(self):
+        stream = self.stream(
+            max_queue=2, overflow=OverflowPolicy.CONFLATE, conflate_key=participation
+        )
+        for data in [event("a", 1), event("b", 1), event("a", 2), event("c", 1)]:
+            await stream._put(data)
+
+        # "a" was superseded in place, then evicted to make room for "c"
+        assert stream.dropped == 2
+        assert await self.drain(stream) == [event("b", 1), event("c", 1)]
+
+    @pytest.mark.asyncio
+    async def test_block_waits_for_consumer(self):
+        stream = self.stream(max_queue=1)
+        await stream._put({"n": 0})
+        blocked = asyncio.create_task(stream._put({"n": 1}))
+        await asyncio.sleep(0.01)
+        assert not blocked.done()
+
+        assert await anext(stream) == {"n": 0}
+        await blocked
+        assert stream.dropped == 0
+        assert await self.drain(stream) == [{"n": 1}]
+
+    @pytest.mark.asyncio
+    async def test_conflated_stream_over_connection(self):
+        async with running_server() as server:
+            client = Client(url="", ws_url=server.url)
+            async with SubscriptionManager(client) as manager:
+                stream = await manager.subscribe(
+                    "subscription { event { participationId n } }",
+                    overflow=OverflowPolicy.CONFLATE,
+                    conflate_key=participation,
+                )
+                await wait_until(lambda: len(server.subscribed) == 1)
+                for n in range(3):
+                    for participation_id in ("a", "b"):
+                        await server.send(
+                            stream.id, payload={"data": event(participation_id, n)}
+                        )
+                await wait_until(lambda: manager.metrics.messages == 6)
+
+                assert manager.metrics.dropped == 4
+                assert await anext(stream) == event("a", 2)
+                assert await anext(stream) == event("b", 2)
+
+    @pytest.mark.asyncio
+    async def test_blocked_consumer_is_not_mistaken_for_dead_connection(self):
+        async with running_server() as server:
+            client = Client(url="", ws_url=server.url)
+            async with SubscriptionManager(
+                client, ping_interval=0.02, ping_timeout=0.05
+            ) as manager:
+                stream = await manager.subscribe(
+                    "subscription { event { id } }", max_queue=1
+                )
+                await wait_until(lambda: len(server.subscribed) == 1)
+                for n in range(3):
+                    await server.send(stream.id, payload={"data": {"n": n}})
+                await asyncio.sleep(0.2)
+
+                assert manager.metrics.ping_timeouts == 0
+                assert manager.metrics.connected
+                assert [await anext(stream) for _ in range(3)] == [
+                    {"n": 0},
+                    {"n": 1},
+                    {"n": 2},
+                ]
+
+
+def metrics_updated(participation_id):
+    return Subscription.athlete_session_metrics_updated_event(
+        session_participation_id=participation_id, requested_keys=["distance"]
+    ).fields(
+        AthleteSessionMetricsUpdatedSubscriptionPayloadFields.configured_metrics().fields(
+            ConfiguredMetricsFields.data().fields(GenericMetricFields.category)
+        )
+    )
+
+
+class TestGeneratedSubscriptions:
+    def test_builds_subscription_operation(self):
+        client = Client(url="")
+        query, variables = client.build_custom_operation(
+            metrics_updated("sp-1"),
+            operation_type=OperationType.SUBSCRIPTION,
+            operation_name="metricsUpdated",
+        )
+
+        assert query.startswith(
+            "subscription metricsUpdated($requestedKeys_0: [String!], "
+            "$sessionParticipationId_0: ID!)"
+        )
+        assert "athleteSessionMetricsUpdatedEvent(" in query
+        assert "requestedKeys: $requestedKeys_0" in query
+        assert "sessionParticipationId: $sessionParticipationId_0" in query
+        assert "configuredMetrics {\n      data {\n        category" in query
+        assert variables == {
+            "requestedKeys_0": ["distance"],
+            "sessionParticipationId_0": "sp-1",
+        }
+
+    @pytest.mark.asyncio
+    async def test_client_subscribe(self):
+        async with running_server() as server:
+            client = Client(url="", ws_url=server.url)
+            events = client.subscribe(
+                Subscription.match_event_created_event(
+                    session_participation_id="sp-1"
+                ).fields(
+                    MatchEventCreatedSubscriptionPayloadFields.match_event().fields(
+                        MatchEventFields.id
+                    )
+                ),
+                operation_name="matchEvents",
+            )
+            first = asyncio.create_task(anext(events))
+            await wait_until(lambda: len(server.subscribed) == 1)
+
+            payload = server.subscribed[0]["payload"]
+            assert payload["operationName"] == "matchEvents"
+            assert payload["variables"] == {"sessionParticipationId_0": "sp-1"}
+            assert "matchEventCreatedEvent" in payload["query"]
+
+            data = {"matchEventCreatedEvent": {"matchEvent": {"id": "1"}}}
+            await server.send(server.subscribed[0]["id"], payload={"data": data})
+            assert await first == data
+            await events.aclose()
+
+    @pytest.mark.asyncio
+    async def test_manager_subscribe_fields(self):
+        async with running_server() as server:
+            client = Client(url="", ws_url=server.url)
+            async with SubscriptionManager(client) as manager:
+                stream = await manager.subscribe_fields(
+                    metrics_updated("sp-1"),
+                    operation_name="metricsUpdated",
+                    max_queue=10,
+                )
+                await wait_until(lambda: len(server.subscribed) == 1)
+
+                payload = server.subscribed[0]["payload"]
+                assert payload["operationName"] == "metricsUpdated"
+                assert payload["query"].startswith("subscription metricsUpdated")
+                assert payload["variables"]["sessionParticipationId_0"] == "sp-1"
+                assert stream.max_queue == 10